@@ -5,10 +5,25 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from config import settings
+from infrastructure.db.db_config import Base
+# Registrar todos los modelos en Base.metadata (autogenerate compara contra ellos)
+from infrastructure.db.models import analytics_models, image_import_model, image_model, job_model, pending_user_model, user_model
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# La URL sale de la misma configuración que la app (entorno / .env), no de alembic.ini.
+# configparser interpreta los %, así que se escapan
+config.set_main_option(
+    "sqlalchemy.url",
+    (
+        f"postgresql+psycopg2://{settings.postgres_user}:{settings.postgres_password}"
+        f"@{settings.postgres_host}:{settings.postgres_port}/{settings.postgres_db}"
+    ).replace("%", "%%"),
+)
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 if config.config_file_name is not None:
@@ -18,7 +33,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
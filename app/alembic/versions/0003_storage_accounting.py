@@ -0,0 +1,60 @@
+"""Contadores de almacenamiento por usuario e images.size_bytes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE images ADD COLUMN IF NOT EXISTS size_bytes BIGINT NOT NULL DEFAULT 0")
+    op.execute(
+        """
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS live_images_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS live_images_bytes BIGINT NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS trashed_images_count INTEGER NOT NULL DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS trashed_images_bytes BIGINT NOT NULL DEFAULT 0
+        """
+    )
+    # Rellenar los contadores con lo que ya hay en images (a partir de aquí los mantiene ImageRepositoryImpl).
+    # Las imágenes subidas antes de existir size_bytes cuentan con 0 bytes: su tamaño no se guardó
+    op.execute(
+        """
+        UPDATE users AS u SET
+            live_images_count = s.live_count,
+            live_images_bytes = s.live_bytes,
+            trashed_images_count = s.trashed_count,
+            trashed_images_bytes = s.trashed_bytes
+        FROM (
+            SELECT
+                user_id,
+                count(*) FILTER (WHERE NOT is_deleted) AS live_count,
+                coalesce(sum(size_bytes) FILTER (WHERE NOT is_deleted), 0) AS live_bytes,
+                count(*) FILTER (WHERE is_deleted) AS trashed_count,
+                coalesce(sum(size_bytes) FILTER (WHERE is_deleted), 0) AS trashed_bytes
+            FROM images
+            GROUP BY user_id
+        ) AS s
+        WHERE s.user_id = u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("live_images_count", "live_images_bytes", "trashed_images_count", "trashed_images_bytes"):
+        op.drop_column("users", column)
+    op.drop_column("images", "size_bytes")
@@ -0,0 +1,37 @@
+"""Metadatos de imagen extraídos al subir
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        ALTER TABLE images
+            ADD COLUMN IF NOT EXISTS width INTEGER,
+            ADD COLUMN IF NOT EXISTS height INTEGER,
+            ADD COLUMN IF NOT EXISTS format VARCHAR(16),
+            ADD COLUMN IF NOT EXISTS content_type VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS taken_at TIMESTAMP WITHOUT TIME ZONE
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in ("width", "height", "format", "content_type", "taken_at"):
+        op.drop_column("images", column)
@@ -0,0 +1,28 @@
+"""images.caption e images.hashtags
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE images ADD COLUMN IF NOT EXISTS caption TEXT, ADD COLUMN IF NOT EXISTS hashtags TEXT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("images", "hashtags")
+    op.drop_column("images", "caption")
@@ -0,0 +1,27 @@
+"""Índice de pending_users.expires_at para la limpieza de registros caducados
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, Sequence[str], None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE INDEX IF NOT EXISTS ix_pending_users_expires_at ON pending_users (expires_at)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pending_users_expires_at", table_name="pending_users")
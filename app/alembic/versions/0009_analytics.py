@@ -0,0 +1,79 @@
+"""Tablas de resumen de las estadísticas de admin e índice de images.created_at
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, Sequence[str], None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE INDEX IF NOT EXISTS ix_images_created_at ON images (created_at)")
+    if not _has_table("analytics_watermarks"):
+        op.create_table(
+            "analytics_watermarks",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("processed_until", sa.DateTime(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+        )
+    if not _has_table("analytics_daily_uploads"):
+        op.create_table(
+            "analytics_daily_uploads",
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("uploads", sa.Integer(), nullable=False),
+            sa.Column("uploaded_bytes", sa.BigInteger(), nullable=False),
+            sa.Column("active_users", sa.Integer(), nullable=False),
+        )
+    if not _has_table("analytics_daily_active_users"):
+        op.create_table(
+            "analytics_daily_active_users",
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        )
+    if not _has_table("analytics_storage_snapshots"):
+        op.create_table(
+            "analytics_storage_snapshots",
+            sa.Column("day", sa.Date(), primary_key=True),
+            sa.Column("live_images", sa.BigInteger(), nullable=False),
+            sa.Column("live_bytes", sa.BigInteger(), nullable=False),
+            sa.Column("trashed_images", sa.BigInteger(), nullable=False),
+            sa.Column("trashed_bytes", sa.BigInteger(), nullable=False),
+        )
+    if not _has_table("analytics_top_storage_users"):
+        op.create_table(
+            "analytics_top_storage_users",
+            sa.Column("rank", sa.Integer(), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column("username", sa.String(50), nullable=False),
+            sa.Column("live_bytes", sa.BigInteger(), nullable=False),
+            sa.Column("trashed_bytes", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in (
+        "analytics_top_storage_users",
+        "analytics_storage_snapshots",
+        "analytics_daily_active_users",
+        "analytics_daily_uploads",
+        "analytics_watermarks",
+    ):
+        op.drop_table(table)
+    op.drop_index("ix_images_created_at", table_name="images")
@@ -0,0 +1,42 @@
+"""Búsqueda por trigramas: images.original_name, columna generada search_text e índice GIN
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, Sequence[str], None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.execute("ALTER TABLE images ADD COLUMN IF NOT EXISTS original_name VARCHAR(255)")
+    # Añadir una columna generada reescribe la tabla (la calcula para todas las filas existentes)
+    op.execute(
+        """
+        ALTER TABLE images ADD COLUMN IF NOT EXISTS search_text TEXT GENERATED ALWAYS AS (
+            lower(coalesce(original_name, '') || ' ' || coalesce(caption, '') || ' ' || coalesce(hashtags, ''))
+        ) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_images_user_search_trgm ON images USING gin (user_id, search_text gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_images_user_search_trgm", table_name="images")
+    op.drop_column("images", "search_text")
+    op.drop_column("images", "original_name")
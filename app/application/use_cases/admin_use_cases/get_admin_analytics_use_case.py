@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+from typing import List
+from fastapi import HTTPException
+
+from domain.entities.analytics import AnalyticsOverview, DailyUploadStats, StorageSnapshot, TopStorageUser
+from domain.repositories.analytics_repository import AnalyticsRepository
+
+MAX_DAYS = 366
+MAX_TOP_USERS = 100
+
+
+class GetAdminAnalyticsUseCase:
+    """Estadísticas para el panel de administración, leídas de las tablas de resumen"""
+
+    def __init__(self, analytics_repository: AnalyticsRepository):
+        self.analytics_repository = analytics_repository
+
+    def uploads_per_day(self, days: int) -> List[DailyUploadStats]:
+        return self.analytics_repository.get_daily_uploads(self._since(days))
+
+    def active_users(self, days: int) -> int:
+        return self.analytics_repository.count_active_users(self._since(days))
+
+    def storage(self, days: int) -> List[StorageSnapshot]:
+        return self.analytics_repository.get_storage_snapshots(self._since(days))
+
+    def top_users(self, limit: int) -> List[TopStorageUser]:
+        if not 1 <= limit <= MAX_TOP_USERS:
+            raise HTTPException(status_code=400, detail=f"limit debe estar entre 1 y {MAX_TOP_USERS}")
+        return self.analytics_repository.get_top_storage_users(limit)
+
+    def overview(self) -> AnalyticsOverview:
+        return self.analytics_repository.get_overview()
+
+    @staticmethod
+    def _since(days: int):
+        if not 1 <= days <= MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"days debe estar entre 1 y {MAX_DAYS}")
+        # Incluye el día de hoy: days=1 es sólo hoy
+        return datetime.utcnow().date() - timedelta(days=days - 1)
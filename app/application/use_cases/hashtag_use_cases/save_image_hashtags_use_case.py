@@ -0,0 +1,37 @@
+from typing import List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+
+from domain.repositories.image_repository import ImageRepository
+from infrastructure.hashtags.engine import HashtagEngine, extract_hashtags
+
+MAX_HASHTAGS = 30
+
+
+class SaveImageHashtagsUseCase:
+    """Guarda el caption y los hashtags elegidos para una imagen y actualiza con ellos el índice de sugerencias"""
+
+    def __init__(self, image_repository: ImageRepository, engine: HashtagEngine):
+        self.image_repository = image_repository
+        self.engine = engine
+
+    def execute(self, user_id: UUID, image_id: UUID, caption: Optional[str], hashtags: List[str]) -> Tuple[Optional[str], List[str]]:
+        image = self.image_repository.get_by_id(image_id)
+        if not image or image.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Imagen no encontrada")
+
+        # Normalizar: "#Playa", "playa" y "#playa" son el mismo hashtag; sin repetidos y en el orden dado
+        tags = list(dict.fromkeys(
+            tag for raw in hashtags for tag in extract_hashtags(raw if raw.startswith("#") else f"#{raw}")
+        ))
+        if len(tags) > MAX_HASHTAGS:
+            raise HTTPException(status_code=400, detail=f"Máximo {MAX_HASHTAGS} hashtags por imagen")
+
+        caption = caption.strip() if caption else None
+        joined = " ".join(tags) or None
+        self.image_repository.update_caption(image_id, caption, joined)
+
+        # Actualización incremental del índice (sin reconstruirlo): se quita lo que aportaba la versión
+        # anterior de esta imagen, así que repetir el mismo PUT no cuenta sus hashtags otra vez
+        self.engine.replace_document((image.caption, image.hashtags), (caption, joined))
+        return caption, tags
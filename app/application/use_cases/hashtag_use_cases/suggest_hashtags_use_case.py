@@ -0,0 +1,50 @@
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from datetime import datetime
+from fastapi import HTTPException
+
+from domain.entities.hashtag_suggestion import HashtagSuggestion
+from domain.repositories.image_repository import ImageRepository
+from infrastructure.hashtags.engine import HashtagEngine
+from config import settings
+
+# (caption, image_id, platform, limit)
+SuggestionRequest = Tuple[str, Optional[UUID], Optional[str], Optional[int]]
+
+
+class SuggestHashtagsUseCase:
+    """Sugiere hashtags para uno o varios captions; si se indica una imagen propia, usa también sus metadatos"""
+
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        engine: HashtagEngine,
+        batch_max_items: int = settings.hashtag_batch_max_items,
+    ):
+        self.image_repository = image_repository
+        self.engine = engine
+        self.batch_max_items = batch_max_items
+
+    def execute(self, user_id: UUID, caption: str, image_id: Optional[UUID] = None,
+                platform: Optional[str] = None, limit: Optional[int] = None) -> List[HashtagSuggestion]:
+        return self.execute_batch(user_id, [(caption, image_id, platform, limit)])[0]
+
+    def execute_batch(self, user_id: UUID, items: List[SuggestionRequest]) -> List[List[HashtagSuggestion]]:
+        if not items:
+            return []
+        if len(items) > self.batch_max_items:
+            raise HTTPException(status_code=400, detail=f"Máximo {self.batch_max_items} elementos por petición")
+
+        # Cada imagen se consulta una sola vez aunque aparezca en varios elementos del lote
+        taken_at: Dict[UUID, Optional[datetime]] = {}
+        for _, image_id, _, _ in items:
+            if image_id is not None and image_id not in taken_at:
+                image = self.image_repository.get_by_id(image_id)
+                if not image or image.user_id != user_id:
+                    raise HTTPException(status_code=404, detail="Imagen no encontrada")
+                taken_at[image_id] = image.taken_at
+
+        return self.engine.suggest_batch([
+            (caption, platform, limit, taken_at.get(image_id) if image_id else None)
+            for caption, image_id, platform, limit in items
+        ])
@@ -0,0 +1,139 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Set
+from uuid import UUID
+
+from domain.repositories.image_repository import ImageRepository
+from domain.repositories.object_storage import ObjectStorage
+from infrastructure.archive.zip_stream import PRECOMPRESSED_FORMATS, ZipEntry, stream_zip
+from config import settings
+
+ERRORS_FILE_NAME = "errores_exportacion.txt"
+ROWS_PER_PAGE = 200  # filas que se leen en cada sesión corta
+
+
+class ExportImagesZipUseCase:
+    """
+    Exporta las imágenes activas de un usuario como un ZIP que se genera según se envía.
+
+    Los objetos pequeños se descargan de MinIO por adelantado en paralelo (hasta export_prefetch_bytes en
+    memoria a la vez) mientras se escribe la entrada actual; los grandes, o de tamaño desconocido, se leen
+    en streaming cuando les toca. Así la memoria por exportación no depende del número ni del tamaño de las imágenes.
+
+    La descarga puede durar lo que tarde el cliente, así que no se retiene una conexión del pool: open_repository
+    abre una sesión corta para leer los ids y otra para cada página de filas, y se cierra antes de enviar bytes.
+    """
+
+    def __init__(
+        self,
+        open_repository: Callable[[], ContextManager[ImageRepository]],
+        storage: ObjectStorage,
+        workers: int = settings.export_prefetch_workers,
+        prefetch_bytes: int = settings.export_prefetch_bytes,
+    ):
+        self.open_repository = open_repository
+        self.storage = storage
+        self.workers = workers
+        self.prefetch_bytes = prefetch_bytes
+
+    def execute(self, user_id: UUID) -> Iterator[bytes]:
+        return stream_zip(self._entries(user_id))
+
+    def _entries(self, user_id: UUID) -> Iterator[ZipEntry]:
+        rows = self._rows(user_id)
+        used_names: Set[str] = set()
+        errors: List[str] = []
+        pending = deque()  # (fila, future o None, bytes reservados), en el orden en que se escriben
+        reserved_bytes = 0
+        held = None  # fila que no cabía en el presupuesto; se descarga cuando se libere memoria
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="zip-export")
+        try:
+            while True:
+                # Rellenar la ventana de descargas adelantadas sin pasarse del presupuesto de memoria
+                while len(pending) < self.workers * 2:
+                    if held is not None:
+                        row, held = held, None
+                    else:
+                        row = next(rows, None)
+                    if row is None:
+                        break
+                    size = row["size_bytes"] or 0
+                    if 0 < size <= self.prefetch_bytes:
+                        if pending and reserved_bytes + size > self.prefetch_bytes:
+                            held = row
+                            break
+                        pending.append((row, pool.submit(self._fetch, row["url"]), size))
+                        reserved_bytes += size
+                    else:
+                        pending.append((row, None, 0))  # grande o tamaño desconocido: streaming en su turno
+                if not pending:
+                    break
+
+                row, future, reserved = pending.popleft()
+                try:
+                    if future is not None:
+                        data = future.result()
+                        chunks, size = [data], len(data)
+                    else:
+                        chunks, size = self._open_stream(row["url"]), row["size_bytes"] or None
+                except Exception as e:
+                    errors.append(f"{row['original_name'] or row['file_name']}: {e}")
+                    reserved_bytes -= reserved
+                    continue
+
+                yield ZipEntry(
+                    name=self._entry_name(row, used_names),
+                    chunks=chunks,
+                    modified_at=row["taken_at"] or row["created_at"],
+                    size=size,
+                    compress=(row["format"] or "").upper() not in PRECOMPRESSED_FORMATS,
+                )
+                reserved_bytes -= reserved
+        finally:
+            # Si el cliente corta la descarga no se siguen bajando objetos que ya nadie va a leer
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if errors:
+            # Mejor un ZIP con una nota de lo que faltó que cortar la descarga a mitad
+            report = ("No se pudieron exportar estas imágenes:\n" + "\n".join(errors) + "\n").encode()
+            yield ZipEntry(name=ERRORS_FILE_NAME, chunks=[report], size=len(report))
+
+    def _rows(self, user_id: UUID) -> Iterator[Dict[str, Any]]:
+        with self.open_repository() as repository:
+            image_ids = repository.list_ids_by_user_id(user_id, deleted=False)
+        for start in range(0, len(image_ids), ROWS_PER_PAGE):
+            # Las imágenes borradas mientras tanto ya no vienen en la página y se omiten
+            with self.open_repository() as repository:
+                page = repository.list_rows_by_ids(image_ids[start:start + ROWS_PER_PAGE], deleted=False)
+            yield from page
+
+    def _fetch(self, key: str) -> bytes:
+        with self.storage.open(key) as body:
+            return body.read()
+
+    def _open_stream(self, key: str) -> Iterator[bytes]:
+        # El objeto se abre ya (si no existe, el error salta antes de empezar la entrada del ZIP)
+        body = self.storage.open(key)
+
+        def chunks():
+            try:
+                while chunk := body.read(settings.image_proxy_chunk_size):
+                    yield chunk
+            finally:
+                body.close()
+
+        return chunks()
+
+    @staticmethod
+    def _entry_name(row: Dict[str, Any], used: Set[str]) -> str:
+        """Nombre original del archivo (sin rutas), desambiguado si se repite: foto.jpg, foto (2).jpg..."""
+        name = os.path.basename((row["original_name"] or row["file_name"]).replace("\\", "/")) or row["file_name"]
+        stem, ext = os.path.splitext(name)
+        candidate, n = name, 1
+        while candidate.lower() in used:
+            n += 1
+            candidate = f"{stem} ({n}){ext}"
+        used.add(candidate.lower())
+        return candidate
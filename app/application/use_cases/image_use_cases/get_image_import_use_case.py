@@ -0,0 +1,19 @@
+import uuid
+from fastapi import HTTPException
+
+from domain.entities.image_import import ImageImport
+from domain.repositories.image_import_repository import ImageImportRepository
+
+
+class GetImageImportUseCase:
+    """Devuelve el estado de una importación desde ZIP del usuario"""
+
+    def __init__(self, import_repository: ImageImportRepository):
+        self.import_repository = import_repository
+
+    def execute(self, import_id: uuid.UUID, user_id: uuid.UUID) -> ImageImport:
+        image_import = self.import_repository.get_by_id(import_id)
+        # 404 también si es de otro usuario: no revelamos qué IDs existen
+        if not image_import or image_import.user_id != user_id:
+            raise HTTPException(status_code=404, detail="Importación no encontrada")
+        return image_import
@@ -1,31 +1,51 @@
-from infrastructure.s3.s3_client import s3_client
-from config import settings
+from domain.repositories.object_storage import ObjectStorage
 from fastapi import HTTPException
-import os
+from threading import Lock
+from typing import Dict, Tuple
+import time
+
+# Caché en proceso de URLs firmadas: key -> (url, instante de caducidad en time.time()).
+# Reutilizar la misma URL mientras siga siendo válida permite que el navegador cachee la redirección
+# y la propia imagen (la URL no cambia en cada render)
+_url_cache: Dict[str, Tuple[str, float]] = {}
+_url_cache_lock = Lock()
+URL_CACHE_MAX_ENTRIES = 10_000
+# Una URL cacheada sólo se reutiliza si le queda al menos este margen de vida (segundos)
+MIN_REMAINING_SECONDS = 60
+
 
 class GetSignedImageUrlUseCase:
     """Genera una URL firmada temporal para una imagen privada"""
 
+    def __init__(self, storage: ObjectStorage):
+        self.storage = storage
+
     def execute(self, file_name: str, expires_in: int = 3600) -> str:
         try:
-            # Generar la URL firmada usando endpoint que tenga boto3 (MinIO/S3)
-            url = s3_client.generate_presigned_url(
-                'get_object',
-                Params={'Bucket': settings.minio_bucket, 'Key': file_name},
-                ExpiresIn=expires_in
-            )
-            
-            # Reemplazar el host interno (minio:9000) por el host público (localhost:9000) para acceso desde el navegador
-            # Si estamos en MinIO (local o servidor) sustituimos el host interno por el público
-            # Si la URL generada contiene amazonaws.com → estamos en AWS, la devolvemos tal cual.
-            # Si no contiene amazonaws.com → estamos en MinIO y sustituimos el host interno por el público (MINIO_PUBLIC_HOST).
-            if settings.minio_endpoint and "amazonaws.com" not in url:
-                public_host = os.getenv("MINIO_PUBLIC_HOST", "http://localhost:9000")
-                internal_host = settings.minio_endpoint.replace("http://", "").replace("https://", "")
-
-                return url.replace(internal_host, public_host.replace("http://", "").replace("https://", ""))
-
-            # Si es AWS S3 no hacemos nada, ya es accesible públicamente
-            return url
+            # El adaptador devuelve ya la URL con el host accesible desde el navegador
+            return self.storage.presign(file_name, expires_in)
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error generando URL firmada: {e}")
+
+    def execute_cached(self, file_name: str, expires_in: int = 3600) -> Tuple[str, int]:
+        """
+        Devuelve (url, segundos de vida restantes), reutilizando una URL firmada anterior si aún es válida.
+        Los segundos restantes sirven para el Cache-Control de la redirección.
+        """
+        now = time.time()
+        with _url_cache_lock:
+            cached = _url_cache.get(file_name)
+        if cached and cached[1] - now >= MIN_REMAINING_SECONDS:
+            return cached[0], int(cached[1] - now)
+
+        url = self.execute(file_name, expires_in)
+        expires_at = now + expires_in
+        with _url_cache_lock:
+            if len(_url_cache) >= URL_CACHE_MAX_ENTRIES:
+                # Quitamos primero las caducadas; si no basta, vaciamos (la caché se vuelve a llenar sola)
+                for key in [k for k, (_, exp) in _url_cache.items() if exp - now < MIN_REMAINING_SECONDS]:
+                    del _url_cache[key]
+                if len(_url_cache) >= URL_CACHE_MAX_ENTRIES:
+                    _url_cache.clear()
+            _url_cache[file_name] = (url, expires_at)
+        return url, expires_in
@@ -0,0 +1,16 @@
+from uuid import UUID
+from domain.entities.storage_usage import StorageUsage
+from domain.repositories.image_repository import ImageRepository
+from config import settings
+
+class GetStorageUsageUseCase:
+    """Devuelve el uso de almacenamiento de un usuario y su cuota"""
+
+    def __init__(self, image_repository: ImageRepository, quota_bytes: int = settings.user_storage_quota_bytes):
+        self.image_repository = image_repository
+        self.quota_bytes = quota_bytes
+
+    def execute(self, user_id: UUID) -> StorageUsage:
+        usage = self.image_repository.get_storage_usage(user_id)
+        usage.quota_bytes = self.quota_bytes or None
+        return usage
@@ -0,0 +1,235 @@
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from domain.entities.image_entity import Image
+from domain.entities.image_import import IMPORT_DONE, IMPORT_FAILED, IMPORT_RUNNING, ImageImport
+from domain.repositories.image_import_repository import ImageImportRepository
+from domain.repositories.image_repository import ImageRepository
+from domain.repositories.job_repository import JobRepository
+from domain.repositories.object_storage import ObjectStorage
+from infrastructure.images.metadata_extractor import extract_image_metadata
+from infrastructure.jobs.job_queue import new_job
+from infrastructure.jobs.job_types import GENERATE_PLACEHOLDER
+from config import settings
+
+# Una entrada que se descomprime más de esto respecto a su tamaño en el ZIP es sospechosa (zip bomb)
+MAX_COMPRESSION_RATIO = 100
+MAX_REPORTED_ERRORS = 200
+READ_CHUNK = 1024 * 1024
+
+
+class ImportImagesZipUseCase:
+    """
+    Importa las imágenes de un ZIP ya subido a MinIO:
+    - valida cada entrada (tamaño, ratio de compresión, que sea una imagen) leyéndola en streaming,
+    - sube las válidas a MinIO en paralelo (con un máximo de entradas en memoria a la vez),
+    - inserta las filas por lotes con COPY y encola sus placeholders,
+    - guarda el avance tras cada lote, que sirve de punto de control si el trabajo se reintenta.
+    """
+
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        import_repository: ImageImportRepository,
+        job_repository: JobRepository,
+        storage: ObjectStorage,
+        workers: int = settings.import_upload_workers,
+        batch_size: int = settings.import_batch_size,
+        quota_bytes: int = settings.user_storage_quota_bytes,
+        on_progress: Optional[Callable[[ImageImport], None]] = None,
+    ):
+        self.image_repository = image_repository
+        self.import_repository = import_repository
+        self.job_repository = job_repository
+        self.storage = storage
+        self.workers = workers
+        self.batch_size = batch_size
+        self.quota_bytes = quota_bytes  # 0 = sin límite
+        self.on_progress = on_progress  # se llama tras guardar cada avance (p. ej. para avisar por /events)
+
+    def execute(self, import_id: uuid.UUID) -> None:
+        image_import = self.import_repository.get_by_id(import_id)
+        if not image_import or image_import.status == IMPORT_DONE:
+            return
+        try:
+            self._run(image_import)
+        except Exception as e:
+            # Queda como fallida con el motivo; si la cola lo reintenta, continúa desde el último lote guardado
+            image_import.errors.append(f"Error en la importación: {e}")
+            self._save(image_import, IMPORT_FAILED)
+            raise
+        self.storage.delete_many([image_import.archive_key])
+
+    def _run(self, image_import: ImageImport) -> None:
+        with self._open_archive(image_import.archive_key) as archive_file:
+            with zipfile.ZipFile(archive_file) as archive:
+                entries = [info for info in archive.infolist() if self._is_candidate(info)]
+                if len(entries) > settings.import_max_entries:
+                    image_import.errors.append(
+                        f"El ZIP tiene {len(entries)} imágenes; sólo se importan las {settings.import_max_entries} primeras"
+                    )
+                    entries = entries[: settings.import_max_entries]
+                image_import.total_entries = len(entries)
+                self._save(image_import, IMPORT_RUNNING)
+
+                remaining_quota = self._remaining_quota(image_import.user_id)
+                with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="zip-import") as pool:
+                    for start in range(image_import.processed_entries, len(entries), self.batch_size):
+                        batch = entries[start : start + self.batch_size]
+                        images, remaining_quota = self._import_batch(pool, archive, image_import, start, batch, remaining_quota)
+
+                        # Al reanudar tras un fallo, las filas de un lote que sí llegó a guardarse ya existen
+                        existing = set(self.image_repository.existing_ids([image.id for image in images]))
+                        new_images = [image for image in images if image.id not in existing]
+                        self.image_repository.bulk_save(new_images)
+                        self.job_repository.enqueue_many([
+                            new_job(
+                                GENERATE_PLACEHOLDER,
+                                {"image_id": str(image.id), "file_name": image.file_name, "user_id": str(image.user_id)},
+                            )
+                            for image in new_images
+                        ])
+
+                        image_import.imported += len(new_images)
+                        image_import.processed_entries = start + len(batch)
+                        self._save(image_import, IMPORT_RUNNING)
+
+        self._save(image_import, IMPORT_DONE)
+
+    def _import_batch(
+        self, pool, archive: zipfile.ZipFile, image_import: ImageImport, start: int,
+        batch: List[zipfile.ZipInfo], remaining_quota: Optional[int],
+    ) -> Tuple[List[Image], Optional[int]]:
+        images: List[Image] = []
+        in_flight = deque()
+
+        def collect(item):
+            image, name, future = item
+            try:
+                future.result()
+                images.append(image)
+            except Exception as e:
+                self._error(image_import, name, f"error subiendo a MinIO: {e}")
+
+        for offset, info in enumerate(batch):
+            try:
+                spool, metadata, size = self._read_entry(archive, info)
+            except Exception as e:
+                self._error(image_import, info.filename, str(e))
+                continue
+            if remaining_quota is not None:
+                if size > remaining_quota:
+                    spool.close()
+                    self._error(image_import, info.filename, "cuota de almacenamiento superada")
+                    continue
+                remaining_quota -= size
+
+            # ID determinista por importación y entrada: un reintento sobrescribe el mismo objeto y detecta la fila ya guardada
+            image_id = uuid.uuid5(image_import.id, f"{start + offset}:{info.filename}")
+            original_name = os.path.basename(info.filename)[:255]
+            file_name = f"{image_id}{os.path.splitext(original_name)[1].lower()}"
+            image = Image(
+                id=image_id,
+                user_id=image_import.user_id,
+                file_name=file_name,
+                url=file_name,
+                created_at=datetime.utcnow(),
+                size_bytes=size,
+                width=metadata.width,
+                height=metadata.height,
+                format=metadata.format,
+                content_type=metadata.content_type,
+                taken_at=metadata.taken_at,
+                original_name=original_name,
+            )
+            in_flight.append((image, info.filename, pool.submit(self._upload, spool, file_name, metadata.content_type)))
+            # Como mucho 2 entradas por hilo esperando: acota la memoria de los temporales
+            if len(in_flight) >= self.workers * 2:
+                collect(in_flight.popleft())
+
+        while in_flight:
+            collect(in_flight.popleft())
+        return images, remaining_quota
+
+    def _read_entry(self, archive: zipfile.ZipFile, info: zipfile.ZipInfo):
+        """Descomprime una entrada a un temporal (en memoria hasta import_spool_bytes) validándola por el camino"""
+        max_bytes = settings.import_max_entry_bytes
+        if info.file_size > max_bytes:
+            raise ValueError("la imagen supera el tamaño máximo")
+        if info.compress_size and info.file_size > READ_CHUNK and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+            raise ValueError("ratio de compresión sospechoso")
+
+        spool = tempfile.SpooledTemporaryFile(max_size=settings.import_spool_bytes)
+        try:
+            size = 0
+            with archive.open(info) as source:  # zipfile comprueba el CRC al terminar de leer
+                while chunk := source.read(READ_CHUNK):
+                    size += len(chunk)
+                    # El tamaño declarado en el ZIP puede mentir: se vuelve a comprobar con lo leído
+                    if size > max_bytes:
+                        raise ValueError("la imagen supera el tamaño máximo")
+                    spool.write(chunk)
+            spool.seek(0)
+            metadata = extract_image_metadata(spool)
+            if not metadata.format:
+                raise ValueError("no es una imagen reconocible")
+            return spool, metadata, size
+        except Exception:
+            spool.close()
+            raise
+
+    def _open_archive(self, key: str):
+        # El directorio central del ZIP está al final y hace falta acceso aleatorio: en almacenamiento local
+        # se abre el archivo tal cual; si no, se descarga a un temporal del worker
+        path = self.storage.local_path(key)
+        if path:
+            return open(path, "rb")
+        archive_file = tempfile.TemporaryFile()
+        with self.storage.open(key) as body:
+            shutil.copyfileobj(body, archive_file, READ_CHUNK)
+        archive_file.seek(0)
+        return archive_file
+
+    def _upload(self, spool, file_name: str, content_type: Optional[str]) -> None:
+        try:
+            self.storage.put(file_name, spool, content_type)
+        finally:
+            spool.close()
+
+    @staticmethod
+    def _is_candidate(info: zipfile.ZipInfo) -> bool:
+        # Se ignoran carpetas, metadatos de macOS y ficheros ocultos
+        name = os.path.basename(info.filename)
+        return not info.is_dir() and not info.filename.startswith("__MACOSX/") and bool(name) and not name.startswith(".")
+
+    def _remaining_quota(self, user_id: uuid.UUID) -> Optional[int]:
+        if not self.quota_bytes:
+            return None
+        return max(0, self.quota_bytes - self.image_repository.get_storage_usage(user_id).total_bytes)
+
+    @staticmethod
+    def _error(image_import: ImageImport, name: str, reason: str) -> None:
+        image_import.failed += 1
+        if len(image_import.errors) < MAX_REPORTED_ERRORS:
+            image_import.errors.append(f"{name}: {reason}")
+
+    def _save(self, image_import: ImageImport, status: str) -> None:
+        image_import.status = status
+        self.import_repository.update_progress(
+            image_import.id,
+            status,
+            image_import.total_entries,
+            image_import.processed_entries,
+            image_import.imported,
+            image_import.failed,
+            image_import.errors,
+        )
+        if self.on_progress:
+            self.on_progress(image_import)
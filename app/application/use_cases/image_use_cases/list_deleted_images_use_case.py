@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, Iterator, List
 from uuid import UUID
 from domain.entities.image_entity import Image
 from domain.repositories.image_repository import ImageRepository
@@ -11,3 +11,11 @@ class ListDeletedImagesUseCase:
 
     def execute(self, user_id: UUID) -> List[Image]:
         return self.image_repository.find_deleted_by_user_id(user_id)
+
+    def execute_rows(self, user_id: UUID) -> List[Dict[str, Any]]:
+        """Variante rápida para la API: filas planas listas para serializar"""
+        return self.image_repository.list_rows_by_user_id(user_id, deleted=True)
+
+    def execute_stream(self, user_id: UUID) -> Iterator[Dict[str, Any]]:
+        """Variante en streaming: las filas se leen por lotes según se envían"""
+        return self.image_repository.iter_rows_by_user_id(user_id, deleted=True)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, Iterator, List
 from uuid import UUID
 from domain.repositories.image_repository import ImageRepository
 from domain.entities.image_entity import Image
@@ -11,3 +11,11 @@ class ListUserImagesUseCase:
 
     def execute(self, user_id: UUID) -> List[Image]:
         return self.image_repo.list_by_user_id(user_id)
+
+    def execute_rows(self, user_id: UUID) -> List[Dict[str, Any]]:
+        """Variante rápida para la API: filas planas listas para serializar"""
+        return self.image_repo.list_rows_by_user_id(user_id, deleted=False)
+
+    def execute_stream(self, user_id: UUID) -> Iterator[Dict[str, Any]]:
+        """Variante en streaming: las filas se leen por lotes según se envían"""
+        return self.image_repo.iter_rows_by_user_id(user_id, deleted=False)
@@ -9,11 +9,11 @@ class RestoreImageUseCase:
         self.image_repository = image_repository
 
     def execute(self, image_id: UUID):
+        # Primero la UPDATE condicional; sólo si no cambió nada se lee la fila para dar el error adecuado
+        if self.image_repository.restore(image_id):
+            return
+
         image = self.image_repository.get_by_id(image_id)
         if not image:
             raise HTTPException(status_code=404, detail="Imagen no encontrada")
-
-        if not image.is_deleted:
-            raise HTTPException(status_code=400, detail="La imagen ya está activa")
-
-        self.image_repository.restore(image_id)
+        raise HTTPException(status_code=400, detail="La imagen ya está activa")
@@ -0,0 +1,31 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from fastapi import HTTPException
+
+from domain.repositories.image_repository import ImageRepository
+from config import settings
+
+MIN_QUERY_LENGTH = 2
+MAX_QUERY_LENGTH = 100
+MAX_PAGE_SIZE = 100
+
+
+class SearchImagesUseCase:
+    """Búsqueda difusa en la biblioteca del usuario (nombre original, caption y hashtags)"""
+
+    def __init__(self, image_repo: ImageRepository, similarity_threshold: float = settings.search_similarity_threshold):
+        self.image_repo = image_repo
+        self.similarity_threshold = similarity_threshold
+
+    def execute_rows(
+        self, user_id: UUID, query: str, limit: int = 50, after: Optional[Tuple[float, UUID]] = None
+    ) -> List[Dict[str, Any]]:
+        query = " ".join(query.split())
+        if not MIN_QUERY_LENGTH <= len(query) <= MAX_QUERY_LENGTH:
+            raise HTTPException(
+                status_code=400,
+                detail=f"La búsqueda debe tener entre {MIN_QUERY_LENGTH} y {MAX_QUERY_LENGTH} caracteres",
+            )
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise HTTPException(status_code=400, detail=f"limit debe estar entre 1 y {MAX_PAGE_SIZE}")
+        return self.image_repo.search_rows(user_id, query, limit, after, self.similarity_threshold)
@@ -0,0 +1,47 @@
+import uuid
+import zipfile
+from fastapi import HTTPException
+
+from domain.entities.image_import import ImageImport
+from domain.repositories.image_import_repository import ImageImportRepository
+from domain.repositories.job_repository import JobRepository
+from domain.repositories.object_storage import ObjectStorage
+from infrastructure.jobs.job_queue import new_job
+from infrastructure.jobs.job_types import IMPORT_IMAGES_ZIP
+from config import settings
+
+
+class StartImageImportUseCase:
+    """Recibe un ZIP de imágenes, lo deja en MinIO y encola su importación (la hace el worker)"""
+
+    def __init__(
+        self,
+        import_repository: ImageImportRepository,
+        job_repository: JobRepository,
+        storage: ObjectStorage,
+        max_bytes: int = settings.import_max_bytes,
+    ):
+        self.import_repository = import_repository
+        self.job_repository = job_repository
+        self.storage = storage
+        self.max_bytes = max_bytes
+
+    def execute(self, user_id: uuid.UUID, file_obj, size: int) -> ImageImport:
+        if size > self.max_bytes:
+            raise HTTPException(status_code=413, detail="El archivo ZIP es demasiado grande")
+        if not zipfile.is_zipfile(file_obj):
+            raise HTTPException(status_code=400, detail="El archivo no es un ZIP válido")
+        file_obj.seek(0)
+
+        import_id = uuid.uuid4()
+        archive_key = f"imports/{user_id}/{import_id}.zip"
+        try:
+            self.storage.put(archive_key, file_obj, "application/zip")
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Error subiendo a S3/MinIO: {e}")
+
+        image_import = self.import_repository.create(
+            ImageImport(id=import_id, user_id=user_id, archive_key=archive_key)
+        )
+        self.job_repository.enqueue(new_job(IMPORT_IMAGES_ZIP, {"import_id": str(import_id), "user_id": str(user_id)}))
+        return image_import
@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterator, Optional
+
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+from infrastructure.resilience.dependencies import STORAGE, get_breaker
+from infrastructure.s3.s3_client import get_s3_client
+from config import settings
+
+
+@dataclass(slots=True)
+class StreamedObject:
+    """Resultado del proxy: código HTTP, cabeceras a reenviar y cuerpo en trozos (None si no hay cuerpo)"""
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[Iterator[bytes]] = None
+
+
+class StreamImageUseCase:
+    """Lee un objeto de MinIO/S3 y lo devuelve en trozos, respetando Range/If-Range y las cabeceras condicionales"""
+
+    def execute(
+        self,
+        file_name: str,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[str] = None,
+    ) -> StreamedObject:
+        params = {"Bucket": settings.minio_bucket, "Key": file_name}
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        elif if_modified_since:
+            since = self._parse_http_date(if_modified_since)
+            if since:
+                params["IfModifiedSince"] = since
+
+        if range_header:
+            params["Range"] = range_header
+            # If-Range: el rango sólo vale si el objeto sigue siendo el mismo. Lo delegamos en S3 como
+            # condición (IfMatch / IfUnmodifiedSince): si falla, pedimos el objeto entero (como dice la RFC 9110)
+            if if_range:
+                if if_range.startswith('W/'):
+                    # If-Range exige comparación fuerte: con un ETag débil nunca se sirve el rango
+                    params.pop("Range")
+                elif if_range.startswith('"'):
+                    params["IfMatch"] = if_range
+                else:
+                    since = self._parse_http_date(if_range)
+                    if since:
+                        params["IfUnmodifiedSince"] = since
+
+        try:
+            response = self._get_object(params)
+        except _PreconditionFailed:
+            # El objeto cambió desde que el cliente guardó su copia parcial → contenido completo
+            for key in ("Range", "IfMatch", "IfUnmodifiedSince"):
+                params.pop(key, None)
+            response = self._get_object(params)
+        except _NotModified as not_modified:
+            return StreamedObject(status_code=304, headers=not_modified.headers)
+
+        headers = self._object_headers(response)
+        status_code = 200
+        if response.get("ContentRange"):
+            headers["Content-Range"] = response["ContentRange"]
+            status_code = 206
+
+        return StreamedObject(
+            status_code=status_code,
+            headers=headers,
+            body=self._iter_body(response["Body"]),
+        )
+
+    def _get_object(self, params: dict) -> dict:
+        try:
+            return get_breaker(STORAGE).call(get_s3_client().get_object, **params)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            code = str(error.get("Code", ""))
+            status = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if code in ("PreconditionFailed",) or status == 412:
+                raise _PreconditionFailed()
+            if code in ("304", "NotModified") or status == 304:
+                raw_headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+                headers = {"Cache-Control": "private, no-cache"}
+                if raw_headers.get("etag"):
+                    headers["ETag"] = raw_headers["etag"]
+                raise _NotModified(headers)
+            if code in ("NoSuchKey", "404") or status == 404:
+                raise HTTPException(status_code=404, detail="Imagen no encontrada")
+            if code == "InvalidRange" or status == 416:
+                raise HTTPException(status_code=416, detail="Rango no válido")
+            raise HTTPException(status_code=502, detail=f"Error leyendo de S3/MinIO: {code or e}")
+
+    @staticmethod
+    def _object_headers(response: dict) -> Dict[str, str]:
+        headers = {
+            "Accept-Ranges": "bytes",
+            "Content-Type": response.get("ContentType") or "application/octet-stream",
+            "Cache-Control": "private, no-cache",
+        }
+        if response.get("ContentLength") is not None:
+            headers["Content-Length"] = str(response["ContentLength"])
+        if response.get("ETag"):
+            headers["ETag"] = response["ETag"]
+        if response.get("LastModified"):
+            headers["Last-Modified"] = format_datetime(response["LastModified"], usegmt=True)
+        return headers
+
+    @staticmethod
+    def _iter_body(body) -> Iterator[bytes]:
+        """
+        Lee el cuerpo de S3 trozo a trozo. StreamingResponse pide el siguiente trozo sólo cuando
+        el anterior se ha enviado al cliente, así que la memoria por petición queda en un trozo (backpressure)
+        """
+        try:
+            for chunk in body.iter_chunks(chunk_size=settings.image_proxy_chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
+    @staticmethod
+    def _parse_http_date(value: str):
+        try:
+            return parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+
+class _PreconditionFailed(Exception):
+    pass
+
+
+class _NotModified(Exception):
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__("Not modified")
+        self.headers = headers
@@ -1,19 +1,30 @@
 from domain.repositories.image_repository import ImageRepository
+from domain.repositories.object_storage import ObjectStorage
 from infrastructure.dto.image_dto import ImageCreateDTO
 from domain.entities.image_entity import Image
 from infrastructure.mappers.image_mapper import ImageMapper
 import uuid
 from datetime import datetime
-from infrastructure.s3.s3_client import s3_client
+from infrastructure.images.metadata_extractor import ImageTooLargeError, extract_image_metadata
 from config import settings
 from fastapi import HTTPException
+from typing import Callable, Optional
 
 
 class UploadImageUseCase:
     """Caso de uso para subir y registrar una imagen"""
 
-    def __init__(self, image_repository: ImageRepository):
+    def __init__(
+        self,
+        image_repository: ImageRepository,
+        storage: ObjectStorage,
+        quota_bytes: int = settings.user_storage_quota_bytes,
+        placeholder_scheduler: Optional[Callable[[uuid.UUID, str, uuid.UUID], None]] = None,
+    ):
         self.image_repository = image_repository
+        self.storage = storage
+        self.quota_bytes = quota_bytes  # 0 = sin límite
+        self.placeholder_scheduler = placeholder_scheduler  # encola el cálculo del placeholder tras guardar
 
     def execute(self, dto: ImageCreateDTO, file_obj) -> Image:
         # # Convertir el DTO en entidad de dominio
@@ -33,9 +44,32 @@ class UploadImageUseCase:
         :param dto: Datos de la imagen
         :param file_obj: Archivo (file.file de UploadFile)
         """
-        # Subir a MinIO/S3
+        # Tamaño del archivo (UploadFile ya lo trae; si no, lo medimos sin leerlo)
+        if not dto.size_bytes:
+            dto.size_bytes = self._measure(file_obj)
+
+        # Comprobar la cuota con los contadores del usuario (lectura por PK, sin SUM sobre images)
+        if self.quota_bytes:
+            usage = self.image_repository.get_storage_usage(dto.user_id)
+            if usage.total_bytes + dto.size_bytes > self.quota_bytes:
+                raise HTTPException(status_code=413, detail="Cuota de almacenamiento superada")
+
+        # Extraer dimensiones, formato, tipo MIME y fecha EXIF leyendo sólo la cabecera del archivo
+        try:
+            metadata = extract_image_metadata(file_obj, fallback_content_type=dto.content_type)
+        except ImageTooLargeError:
+            raise HTTPException(status_code=413, detail="La imagen tiene demasiados píxeles")
+        dto.width = metadata.width
+        dto.height = metadata.height
+        dto.format = metadata.format
+        dto.content_type = metadata.content_type
+        dto.taken_at = metadata.taken_at
+
+        # Subir a MinIO/S3 (con su Content-Type, para que MinIO lo devuelva al servir el objeto)
         try:
-            s3_client.upload_fileobj(file_obj, settings.minio_bucket, dto.file_name)
+            self.storage.put(dto.file_name, file_obj, dto.content_type)
+        except HTTPException:
+            raise  # p. ej. 503 si el almacenamiento está marcado como caído
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Error subiendo a S3/MinIO: {e}")
 
@@ -50,4 +84,18 @@ class UploadImageUseCase:
         image_entity.created_at = datetime.utcnow()
 
         # Guardar en la base de datos
-        return self.image_repository.save(image_entity)
\ No newline at end of file
+        saved = self.image_repository.save(image_entity)
+
+        # Placeholder en segundo plano (sólo si es una imagen que Pillow reconoce)
+        if self.placeholder_scheduler and saved.format:
+            self.placeholder_scheduler(saved.id, saved.file_name, saved.user_id)
+
+        return saved
+
+    @staticmethod
+    def _measure(file_obj) -> int:
+        position = file_obj.tell()
+        file_obj.seek(0, 2)  # final del archivo
+        size = file_obj.tell()
+        file_obj.seek(position)
+        return size
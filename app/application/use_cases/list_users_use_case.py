@@ -0,0 +1,18 @@
+from typing import Any, Dict, Iterator, List
+
+from domain.entities.user_entity import User
+from domain.repositories.user_repository import UserRepository
+
+
+class ListUsersUseCase:
+    """Caso de uso para que un admin liste todos los usuarios registrados"""
+
+    def __init__(self, user_repository: UserRepository):
+        self.user_repository = user_repository
+
+    def execute(self) -> List[User]:
+        return self.user_repository.list_all()
+
+    def execute_stream(self) -> Iterator[Dict[str, Any]]:
+        """Variante en streaming para exportaciones grandes (memoria constante)"""
+        return self.user_repository.iter_rows()
@@ -6,18 +6,12 @@ from domain.repositories.user_repository import UserRepository
 from infrastructure.dto.user_dto import LoginUserDto
 from fastapi import HTTPException
 
-import os
-from dotenv import load_dotenv
+from config import settings
 
-load_dotenv()  # Carga las variables de entorno desde .env
-
-SECRET_KEY = os.getenv("SECRET_KEY", "supersecret") # Clave secreta para firmar los tokens JWT
-ALGORITHM = os.getenv("ALGORITHM", "HS256")  # Algoritmo de encriptación
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")) # Tiempo de expiración del token en minutos
-
-print(f"Loaded SECRET_KEY: {SECRET_KEY}")
-print(f"Loaded ALGORITHM: {ALGORITHM}")
-print(f"Token expires in: {ACCESS_TOKEN_EXPIRE_MINUTES} minutes")
+# Configuración JWT centralizada en config.Settings
+SECRET_KEY = settings.secret_key # Clave secreta para firmar los tokens JWT
+ALGORITHM = settings.algorithm  # Algoritmo de encriptación
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes # Tiempo de expiración del token en minutos
 
 # Configuración del contexto de encriptación de contraseñas
 # Usamos bcrypt como el algoritmo de encriptación para las contraseñas
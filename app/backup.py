@@ -0,0 +1,219 @@
+"""
+Copias de seguridad de Postgres y MinIO (sustituye a postgres_backup.sh, que no copiaba las imágenes).
+
+Cada copia es una carpeta snapshots/<fecha>/ con:
+- db/: pg_dump en formato directorio, volcado y restaurado en paralelo (pg_dump/pg_restore -j),
+- manifest.json: clave, ETag, tamaño y SHA-256 de cada objeto del bucket.
+El contenido de los objetos se guarda una sola vez en objects/ (por SHA-256) y se comparte entre copias:
+cada copia sólo descarga los objetos nuevos o que han cambiado (comparando ETags con la anterior).
+
+La base de datos se vuelca antes de listar el bucket: como las imágenes se suben a MinIO antes de
+insertar su fila, todas las filas del volcado tienen su objeto en la copia (las que no, se anotan en
+el manifiesto como missing_objects). Las claves de las imágenes se leen en el mismo snapshot que usa
+pg_dump (pg_export_snapshot), así que son exactamente las filas del volcado.
+
+backup, restore y prune toman un lock (fichero .lock en la carpeta de copias) y no pueden solaparse:
+prune borraría los objetos que una copia en curso acaba de guardar y todavía no están en ningún manifiesto.
+
+Con STORAGE_BACKEND=local sólo se copia la base de datos (los archivos están en una carpeta normal).
+
+Uso (desde la carpeta app/, necesita pg_dump/pg_restore de la misma versión que el servidor):
+    python backup.py backup                     # copia completa (incremental en objetos)
+    python backup.py list                       # copias disponibles
+    python backup.py restore latest             # restaura BD y bucket de la última copia
+    python backup.py restore 20250802_192105 --skip-db --prune
+    python backup.py prune --keep 7             # conserva las 7 últimas y borra los objetos huérfanos
+"""
+import argparse
+import fcntl
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Set
+
+from config import settings
+from infrastructure.backup.object_snapshot import BlobStore, ObjectEntry, restore_bucket, snapshot_bucket
+from infrastructure.backup.postgres_dump import dump_database, exported_snapshot, restore_database
+
+PARTIAL_SUFFIX = ".partial"  # copia a medias (falló o se interrumpió): no se usa como base ni se restaura
+LOCK_FILE = ".lock"
+
+
+def _snapshots_dir(root: str) -> str:
+    return os.path.join(root, "snapshots")
+
+
+def _list_snapshots(root: str) -> List[str]:
+    folder = _snapshots_dir(root)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(
+        name for name in os.listdir(folder)
+        if not name.endswith(PARTIAL_SUFFIX) and os.path.exists(os.path.join(folder, name, "manifest.json"))
+    )
+
+
+def _load_manifest(root: str, name: str) -> Dict:
+    with open(os.path.join(_snapshots_dir(root), name, "manifest.json")) as f:
+        return json.load(f)
+
+
+def _entries(manifest: Dict) -> List[ObjectEntry]:
+    return [ObjectEntry(**item) for item in manifest["objects"]]
+
+
+@contextmanager
+def _exclusive(root: str) -> Iterator[None]:
+    """Lock de la carpeta de copias; el sistema lo suelta solo si el proceso muere"""
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            sys.exit(f"❌ Ya hay un backup, restore o prune en curso sobre {root}")
+        yield
+
+
+def _dump_with_file_names(target_dir: str, jobs: int) -> Set[str]:
+    """Vuelca la base de datos y devuelve las claves en MinIO de las imágenes que contiene el volcado"""
+    from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
+
+    with exported_snapshot() as (db, snapshot_id):
+        file_names = set(ImageRepositoryImpl(db).iter_file_names()) if settings.storage_backend == "s3" else set()
+        dump_database(target_dir, jobs=jobs, snapshot=snapshot_id)
+    return file_names
+
+
+def backup(args) -> None:
+    root = args.dir
+    name = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    partial = os.path.join(_snapshots_dir(root), name + PARTIAL_SUFFIX)
+    os.makedirs(partial)
+    store = BlobStore(os.path.join(root, "objects"))
+    started_at = datetime.utcnow()
+    t0 = time.perf_counter()
+
+    print(f"📦 Volcando la base de datos '{settings.postgres_db}' con {args.jobs} procesos...")
+    file_names = _dump_with_file_names(os.path.join(partial, "db"), args.jobs)
+    t1 = time.perf_counter()
+    print(f"✅ Base de datos volcada en {t1 - t0:.1f}s")
+
+    snapshots = _list_snapshots(root)
+    entries, errors, missing = [], [], []
+    if settings.storage_backend == "s3":
+        previous = {e.key: e for e in _entries(_load_manifest(root, snapshots[-1]))} if snapshots else {}
+        entries, errors = snapshot_bucket(store, previous, workers=args.workers)
+        # Filas del volcado cuyo objeto no está en la copia (p. ej. purgadas entre el volcado y el listado)
+        keys = {entry.key for entry in entries}
+        missing = sorted(name for name in file_names if name not in keys)
+        print(f"✅ Bucket copiado en {time.perf_counter() - t1:.1f}s: {len(entries)} objetos")
+    else:
+        print(f"⚠️ Almacenamiento local: copia sólo la base de datos; la carpeta {settings.local_storage_dir} se copia aparte")
+
+    manifest = {
+        "created_at": started_at.isoformat(),
+        "base": snapshots[-1] if snapshots else None,
+        "objects": [asdict(entry) for entry in entries],
+        "errors": errors,
+        "missing_objects": missing,
+    }
+    with open(os.path.join(partial, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+    # Sólo al terminar entera pasa a ser una copia válida
+    os.rename(partial, os.path.join(_snapshots_dir(root), name))
+
+    for error in errors[:20]:
+        print(f"❌ {error}")
+    if missing:
+        print(f"⚠️ {len(missing)} imágenes de la base de datos sin objeto en el bucket")
+    print(f"✅ Copia {name} creada en {time.perf_counter() - t0:.1f}s")
+    if errors:
+        sys.exit(1)
+
+
+def restore(args) -> None:
+    root = args.dir
+    snapshots = _list_snapshots(root)
+    name = snapshots[-1] if args.name == "latest" and snapshots else args.name
+    if name not in snapshots:
+        sys.exit(f"❌ La copia '{args.name}' no existe (disponibles: {', '.join(snapshots) or 'ninguna'})")
+    manifest = _load_manifest(root, name)
+    t0 = time.perf_counter()
+
+    if not args.skip_db:
+        print(f"♻️ Restaurando la base de datos desde {name} con {args.jobs} procesos...")
+        restore_database(os.path.join(_snapshots_dir(root), name, "db"), jobs=args.jobs)
+        print(f"✅ Base de datos restaurada en {time.perf_counter() - t0:.1f}s")
+
+    errors: List[str] = []
+    if not args.skip_objects and settings.storage_backend == "s3":
+        store = BlobStore(os.path.join(root, "objects"))
+        uploaded, errors = restore_bucket(store, _entries(manifest), prune=args.prune, workers=args.workers)
+        print(f"✅ {uploaded} objetos restaurados")
+        for error in errors[:20]:
+            print(f"❌ {error}")
+    print(f"✅ Restauración de {name} terminada en {time.perf_counter() - t0:.1f}s")
+    if errors:
+        sys.exit(1)
+
+
+def list_backups(args) -> None:
+    for name in _list_snapshots(args.dir):
+        manifest = _load_manifest(args.dir, name)
+        objects = manifest["objects"]
+        size_mb = sum(item["size"] for item in objects) / (1024 * 1024)
+        print(f"{name}  {len(objects)} objetos  {size_mb:.1f} MB  errores: {len(manifest['errors'])}")
+
+
+def prune(args) -> None:
+    root = args.dir
+    snapshots = _list_snapshots(root)
+    removed = snapshots[: max(0, len(snapshots) - args.keep)]
+    for name in removed:
+        shutil.rmtree(os.path.join(_snapshots_dir(root), name))
+    # Con el lock tomado no hay ninguna copia en curso: las .partial que queden son de copias que fallaron
+    folder = _snapshots_dir(root)
+    for name in os.listdir(folder) if os.path.isdir(folder) else []:
+        if name.endswith(PARTIAL_SUFFIX):
+            shutil.rmtree(os.path.join(folder, name))
+    referenced = {item["sha256"] for name in snapshots[len(removed):] for item in _load_manifest(root, name)["objects"]}
+    blobs = BlobStore(os.path.join(root, "objects")).collect_garbage(referenced)
+    print(f"🗑 {len(removed)} copias y {blobs} objetos sin usar eliminados")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Copias de seguridad de Postgres y MinIO")
+    parser.add_argument("--dir", default=settings.backup_dir, help="carpeta de las copias")
+    parser.add_argument("--jobs", type=int, default=settings.backup_db_jobs, help="procesos de pg_dump/pg_restore")
+    parser.add_argument("--workers", type=int, default=settings.backup_transfer_workers, help="transferencias simultáneas con MinIO")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("backup", help="crea una copia nueva").set_defaults(func=backup)
+    commands.add_parser("list", help="muestra las copias disponibles").set_defaults(func=list_backups)
+
+    restore_parser = commands.add_parser("restore", help="restaura una copia")
+    restore_parser.add_argument("name", help="nombre de la copia o 'latest'")
+    restore_parser.add_argument("--skip-db", action="store_true", help="no restaurar la base de datos")
+    restore_parser.add_argument("--skip-objects", action="store_true", help="no restaurar el bucket")
+    restore_parser.add_argument("--prune", action="store_true", help="borrar del bucket los objetos que no están en la copia")
+    restore_parser.set_defaults(func=restore)
+
+    prune_parser = commands.add_parser("prune", help="borra las copias antiguas")
+    prune_parser.add_argument("--keep", type=int, default=7, help="copias que se conservan")
+    prune_parser.set_defaults(func=prune)
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        args.func(args)
+        return
+    with _exclusive(args.dir):
+        args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
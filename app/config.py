@@ -1,5 +1,7 @@
 from pydantic_settings import BaseSettings
 
+# Toda la configuración se lee una sola vez aquí (entorno + .env). El resto de módulos importa `settings`
+# en lugar de llamar a load_dotenv()/os.getenv() por su cuenta
 class Settings(BaseSettings):
     # MinIO / S3
     minio_endpoint: str
@@ -7,6 +9,155 @@ class Settings(BaseSettings):
     minio_access_key: str
     minio_secret_key: str
     use_ssl: bool = False
+    minio_public_host: str = "http://localhost:9000"  # Host con el que el navegador accede a MinIO (URLs firmadas)
+    # Cliente S3: conexiones reutilizables por proceso (el valor por defecto de botocore, 10, se queda corto
+    # con el threadpool de FastAPI y los hilos de subida), plazos y política de reintentos
+    s3_max_pool_connections: int = 50
+    s3_connect_timeout: float = 5.0
+    s3_read_timeout: float = 60.0
+    s3_max_attempts: int = 3
+    s3_retry_mode: str = "standard"  # legacy | standard | adaptive
+
+    # Resiliencia de las dependencias externas (Postgres, almacenamiento, SMTP): fallos seguidos que abren
+    # el circuit breaker, segundos hasta la llamada de prueba y reintentos permitidos (fracción de las
+    # llamadas de los últimos 10s, con un mínimo por segundo)
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min_per_second: float = 0.5
+
+    # Dónde se guardan los archivos: s3 (MinIO/S3) | local (disco del servidor, para un solo nodo o pruebas sin S3)
+    storage_backend: str = "s3"
+    local_storage_dir: str = "uploads"
+    local_storage_public_url: str = "http://localhost:8000"  # URL de la API con la que el navegador descarga los archivos
+
+    # PostgreSQL
+    postgres_user: str = ""
+    postgres_password: str = ""
+    postgres_db: str = ""
+    postgres_host: str = "db"  # por defecto 'db' desde Docker
+    postgres_port: str = "5432"
+    # Crear las tablas con Base.metadata.create_all al arrancar (cómodo en desarrollo; en producción
+    # se puede desactivar con DB_CREATE_ALL=false para no hacer ese viaje a la BD en cada arranque)
+    db_create_all: bool = True
+    # Aplicar las migraciones de Alembic (alembic/versions) al arrancar serve.py. Son las que añaden las
+    # columnas nuevas a las tablas existentes; create_all sólo crea las tablas que faltan
+    db_migrate_on_start: bool = True
+    # Pool de conexiones por proceso (cada worker tiene el suyo: pool_size + max_overflow conexiones como máximo)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Plazos de Postgres: ninguna consulta ni espera de lock ocupa un hilo indefinidamente (0 = sin límite)
+    db_statement_timeout_ms: int = 30_000
+    db_lock_timeout_ms: int = 10_000
+    db_connect_timeout: int = 5
+    db_pool_timeout: int = 10  # segundos esperando una conexión libre del pool
+    # Diagnóstico de consultas: echo de SQLAlchemy (todas las sentencias, muy ruidoso), umbral del log de
+    # consultas lentas, repeticiones de una misma sentencia en una petición que se avisan como posible N+1
+    # y cabecera Server-Timing con el tiempo de BD de cada respuesta
+    db_echo: bool = False
+    db_slow_query_ms: int = 200
+    db_repeated_query_threshold: int = 5
+    db_server_timing: bool = False
+
+    # Servidor de producción (serve.py)
+    web_workers: int = 0  # 0 = calcularlo a partir de las CPUs y del presupuesto de conexiones
+    db_connection_budget: int = 90  # Conexiones de Postgres que puede usar este contenedor (max_connections menos margen)
+    web_max_requests: int = 5000  # Reciclar cada worker tras N peticiones (0 = nunca)
+    web_max_requests_jitter: int = 500  # Aleatoriedad para que no se reinicien todos a la vez
+    web_worker_max_memory_mb: int = 512  # Reciclar el worker si su RSS supera este valor (0 = sin límite)
+    web_graceful_timeout: int = 30  # Segundos para terminar las peticiones en curso al parar/reciclar
+    web_preload: bool = False  # Importar la app en el master antes de hacer fork (arranque más rápido, menos memoria)
+    scheduler_lock_file: str = "/tmp/hashtag-scheduler.lock"  # Lock que garantiza un único scheduler por contenedor
+
+    # JWT
+    secret_key: str = "supersecret"  # Clave secreta para firmar los tokens JWT
+    algorithm: str = "HS256"  # Algoritmo de encriptación
+    access_token_expire_minutes: int = 30  # Tiempo de expiración del token en minutos
+
+    # Perfilado de peticiones con pyinstrument (opcional): intervalo de muestreo en segundos, fracción de
+    # peticiones que se perfilan siempre (0 = sólo bajo demanda con X-Profile) y dónde se guardan esos perfiles
+    profile_interval: float = 0.001
+    profile_sample_rate: float = 0.0
+    profile_format: str = "html"  # html | speedscope
+    profile_dir: str = "profiles"
+    profile_max_files: int = 500
+
+    # SMTP
+    smtp_server: str = "smtp.gmail.com"
+    smtp_port: int = 587
+    smtp_user: str | None = None
+    smtp_password: str | None = None
+    smtp_timeout: float = 10.0
+
+    # Cuota de almacenamiento por usuario en bytes (imágenes activas + papelera). 0 = sin límite
+    user_storage_quota_bytes: int = 0
+
+    # Placeholders (LQIP) que el worker de la cola genera a la vez tras las subidas
+    placeholder_workers: int = 2
+
+    # Proxy de imágenes (/images/{id}/raw): tamaño de cada trozo leído de S3 y enviado al cliente
+    image_proxy_chunk_size: int = 64 * 1024
+
+    # Exportación ZIP (/images/export.zip): descargas adelantadas en paralelo y memoria máxima que ocupan
+    export_prefetch_workers: int = 4
+    export_prefetch_bytes: int = 32 * 1024 * 1024
+
+    # Importación masiva desde ZIP (la procesa worker.py): límites, subidas en paralelo a MinIO,
+    # filas por cada COPY y memoria máxima por entrada antes de pasar a disco
+    import_max_bytes: int = 2 * 1024 * 1024 * 1024
+    import_max_entries: int = 10_000
+    import_max_entry_bytes: int = 50 * 1024 * 1024
+    import_upload_workers: int = 8
+    import_batch_size: int = 200
+    import_spool_bytes: int = 8 * 1024 * 1024
+    import_job_concurrency: int = 2
+
+    # Eventos en tiempo real (/events, SSE): comentario de keep-alive para que proxies y navegador
+    # no cierren la conexión inactiva, máximo de conexiones abiertas por usuario en cada proceso y
+    # validez del ticket de /events/ticket (va en la URL, así que dura lo justo para abrir la conexión)
+    sse_heartbeat_seconds: int = 15
+    sse_max_connections_per_user: int = 5
+    sse_ticket_ttl_seconds: int = 60
+
+    # Copias de seguridad (backup.py): carpeta destino, procesos de pg_dump/pg_restore y descargas/subidas
+    # simultáneas de objetos de MinIO
+    backup_dir: str = "/backups"
+    backup_db_jobs: int = 4
+    backup_transfer_workers: int = 8
+
+    # Rate limiting de los endpoints de auth: "memory" (un solo nodo) o "redis" (compartido entre nodos)
+    rate_limit_backend: str = "memory"
+    redis_url: str = "redis://localhost:6379/0"
+    rate_limit_trust_forwarded: bool = False  # Usar X-Forwarded-For sólo si hay un proxy de confianza delante
+
+    # Registros pendientes de verificar: "database" (tabla pending_users + limpieza horaria),
+    # "memory" (un solo proceso, p. ej. uvicorn en desarrollo) o "redis" (compartido, caducidad por TTL)
+    pending_user_backend: str = "database"
+
+    # Cola de trabajos (worker.py): sondeo, backoff de reintentos y limpieza de trabajos terminados
+    job_poll_interval: float = 1.0
+    job_retry_base_seconds: int = 10
+    job_retry_max_seconds: int = 3600
+    job_retention_days: int = 7
+    email_job_concurrency: int = 4  # envíos SMTP a la vez entre todos los workers
+
+    # Estadísticas de administración: cada cuánto se actualizan las tablas de resumen, margen para
+    # inserciones aún sin confirmar y tamaño del ranking de almacenamiento
+    analytics_refresh_minutes: int = 10
+    analytics_refresh_lag_seconds: int = 120
+    analytics_top_users: int = 100
+
+    # Búsqueda de imágenes (pg_trgm): similitud mínima (0-1) para que un resultado aparezca
+    search_similarity_threshold: float = 0.3
+
+    # Generador de hashtags: tamaño de la caché de sugerencias y modelo local de embeddings opcional
+    # (nombre de un modelo de sentence-transformers; vacío = sin embeddings, sólo vocabulario + índice)
+    hashtag_cache_size: int = 10_000
+    hashtag_embedding_model: str = ""
+    hashtag_batch_max_items: int = 50
+    # Cada worker tiene su propio índice: se reconstruye desde la base de datos cada tanto para que
+    # todos acaben viendo lo que se guardó en los demás (0 = sólo al arrancar)
+    hashtag_index_refresh_seconds: int = 600
 
     class Config:
         env_file = ".env"
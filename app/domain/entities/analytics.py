@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+
+@dataclass(slots=True)
+class DailyUploadStats:
+    day: date
+    uploads: int = 0
+    uploaded_bytes: int = 0
+    active_users: int = 0  # usuarios distintos que subieron algo ese día
+
+
+@dataclass(slots=True)
+class StorageSnapshot:
+    """Foto diaria del almacenamiento total (suma de los contadores mantenidos en users)"""
+    day: date
+    live_images: int = 0
+    live_bytes: int = 0
+    trashed_images: int = 0
+    trashed_bytes: int = 0
+
+
+@dataclass(slots=True)
+class TopStorageUser:
+    rank: int
+    user_id: UUID
+    username: str
+    live_bytes: int
+    trashed_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.live_bytes + self.trashed_bytes
+
+
+@dataclass(slots=True)
+class AnalyticsOverview:
+    approx_users: int  # estimaciones del planificador: no recorren las tablas
+    approx_images: int
+    active_users_last_30_days: int
+    refreshed_at: Optional[datetime] = None  # última actualización de las tablas de resumen
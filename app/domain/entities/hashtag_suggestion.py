@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)  # frozen: las sugerencias se comparten desde la caché entre peticiones
+class HashtagSuggestion:
+    tag: str
+    score: float
+    source: str  # vocabulary | index | embedding | season | keyword
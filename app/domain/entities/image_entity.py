@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-@dataclass
+@dataclass(slots=True)  # slots: sin __dict__ por instancia, menos memoria en listados grandes
 class Image:
     id: UUID
     user_id: UUID
@@ -11,4 +11,14 @@ class Image:
     url: str
     created_at: Optional[datetime] = None
     is_deleted: bool = False
-    deleted_at: Optional[datetime] = None
\ No newline at end of file
+    deleted_at: Optional[datetime] = None
+    size_bytes: int = 0
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    content_type: Optional[str] = None
+    taken_at: Optional[datetime] = None
+    placeholder: Optional[str] = None
+    caption: Optional[str] = None
+    hashtags: Optional[str] = None  # separados por espacios: "#playa #verano"
+    original_name: Optional[str] = None  # nombre del archivo tal como lo subió el usuario
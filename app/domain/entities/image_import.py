@@ -0,0 +1,26 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+# Estados de una importación
+IMPORT_PENDING = "pending"
+IMPORT_RUNNING = "running"
+IMPORT_DONE = "done"
+IMPORT_FAILED = "failed"
+
+
+@dataclass(slots=True)
+class ImageImport:
+    """Importación masiva de imágenes desde un ZIP (la procesa el worker de la cola)"""
+    id: UUID
+    user_id: UUID
+    archive_key: str  # ZIP subido a MinIO, se borra al terminar
+    status: str = IMPORT_PENDING
+    total_entries: int = 0
+    processed_entries: int = 0  # punto de control: al reintentar se continúa desde aquí
+    imported: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,27 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+# Estados de un trabajo en la cola
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"  # agotó los reintentos
+
+
+@dataclass(slots=True)
+class Job:
+    job_type: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    priority: int = 0  # mayor = antes
+    max_attempts: int = 5
+    run_at: Optional[datetime] = None  # None = lo antes posible
+    id: Optional[UUID] = None
+    status: str = JOB_QUEUED
+    attempts: int = 0
+    locked_by: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -2,7 +2,7 @@ from datetime import datetime
 from dataclasses import dataclass
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class PendingUser:
     id: uuid.UUID | None
     username: str
@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Optional
+import uuid
+
+
+@dataclass(slots=True)
+class StorageUsage:
+    """Uso de almacenamiento de un usuario (contadores mantenidos en cada subida/borrado/restauración/purga)"""
+    user_id: uuid.UUID
+    live_images: int = 0
+    live_bytes: int = 0
+    trashed_images: int = 0
+    trashed_bytes: int = 0
+    quota_bytes: Optional[int] = None  # None = sin límite
+
+    @property
+    def total_bytes(self) -> int:
+        # Las imágenes en la papelera siguen ocupando espacio en MinIO hasta que se purgan
+        return self.live_bytes + self.trashed_bytes
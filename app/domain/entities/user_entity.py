@@ -5,11 +5,12 @@ import uuid
 
 # This module defines the User entity for the application.
 # It includes fields for user identification, authentication, and metadata.
-@dataclass
+@dataclass(slots=True)
 class User:
     id: uuid.UUID
     username: str
     email: str
     password: str
     is_admin: bool = False
-    created_at: Optional[datetime] = None
\ No newline at end of file
+    created_at: Optional[datetime] = None
+    images_version: int = 0
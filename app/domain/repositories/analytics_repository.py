@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import List, Optional
+
+from domain.entities.analytics import AnalyticsOverview, DailyUploadStats, StorageSnapshot, TopStorageUser
+
+
+class AnalyticsRepository(ABC):
+    """Puerto de las estadísticas de administración (tablas de resumen, no consultas sobre images)"""
+
+    @abstractmethod
+    def refresh(self, until: datetime, top_users: int) -> int:
+        """
+        Incorpora a los resúmenes las imágenes creadas desde la última actualización hasta `until`
+        y renueva la foto de almacenamiento y el ranking. Devuelve cuántas imágenes nuevas se procesaron.
+        """
+        pass
+
+    @abstractmethod
+    def get_daily_uploads(self, since: date) -> List[DailyUploadStats]:
+        """Subidas y usuarios activos por día desde una fecha"""
+        pass
+
+    @abstractmethod
+    def count_active_users(self, since: date) -> int:
+        """Usuarios distintos que han subido alguna imagen desde una fecha"""
+        pass
+
+    @abstractmethod
+    def get_storage_snapshots(self, since: date) -> List[StorageSnapshot]:
+        """Evolución diaria del almacenamiento (incluida la papelera) desde una fecha"""
+        pass
+
+    @abstractmethod
+    def get_top_storage_users(self, limit: int) -> List[TopStorageUser]:
+        """Usuarios que más almacenamiento ocupan (según la última actualización)"""
+        pass
+
+    @abstractmethod
+    def get_overview(self) -> AnalyticsOverview:
+        """Totales aproximados y fecha de la última actualización"""
+        pass
+
+    @abstractmethod
+    def get_refreshed_at(self) -> Optional[datetime]:
+        """Hasta qué instante están incorporadas las imágenes en los resúmenes"""
+        pass
@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+
+from domain.entities.image_import import ImageImport
+
+
+class ImageImportRepository(ABC):
+    """Puerto del repositorio de importaciones masivas"""
+
+    @abstractmethod
+    def create(self, image_import: ImageImport) -> ImageImport:
+        """Registra una importación nueva"""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, import_id: UUID) -> Optional[ImageImport]:
+        """Busca una importación por su ID"""
+        pass
+
+    @abstractmethod
+    def update_progress(
+        self,
+        import_id: UUID,
+        status: str,
+        total_entries: int,
+        processed_entries: int,
+        imported: int,
+        failed: int,
+        errors: List[str],
+    ) -> None:
+        """Guarda el avance de una importación (y su punto de control)"""
+        pass
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 from uuid import UUID
 
 from domain.entities.image_entity import Image
+from domain.entities.storage_usage import StorageUsage
 
 
 class ImageRepository(ABC):
@@ -49,8 +50,8 @@ class ImageRepository(ABC):
         pass
 
     @abstractmethod
-    def restore(self, image_id: UUID) -> None:
-        """Restaura una imagen eliminada (soft delete -> activa)"""
+    def restore(self, image_id: UUID) -> bool:
+        """Restaura una imagen eliminada (soft delete -> activa). False si no existe o no estaba eliminada"""
         pass
 
     @abstractmethod
@@ -61,4 +62,75 @@ class ImageRepository(ABC):
     @abstractmethod
     def hard_delete(self, image_id: UUID):
         """Elimina una imagen de forma permanente"""
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    def list_rows_by_user_id(self, user_id: UUID, deleted: bool = False) -> List[Dict[str, Any]]:
+        """Devuelve las imágenes de un usuario como filas planas (sin pasar por entidad ni DTO), para listados rápidos"""
+        pass
+
+    @abstractmethod
+    def iter_rows_by_user_id(self, user_id: UUID, deleted: bool = False, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Igual que list_rows_by_user_id pero leyendo por lotes con un cursor de servidor (para streaming)"""
+        pass
+
+    @abstractmethod
+    def list_ids_by_user_id(self, user_id: UUID, deleted: bool = False) -> List[UUID]:
+        """Ids de las imágenes de un usuario en orden de subida"""
+        pass
+
+    @abstractmethod
+    def list_rows_by_ids(self, image_ids: List[UUID], deleted: bool = False) -> List[Dict[str, Any]]:
+        """Filas planas de las imágenes indicadas, en el mismo orden; las que ya no existan se omiten"""
+        pass
+
+    @abstractmethod
+    def get_storage_usage(self, user_id: UUID) -> StorageUsage:
+        """Devuelve los contadores de almacenamiento del usuario (sin recorrer sus imágenes)"""
+        pass
+
+    @abstractmethod
+    def set_placeholder(self, image_id: UUID, placeholder: str) -> None:
+        """Guarda la vista previa (LQIP) calculada para una imagen"""
+        pass
+
+    @abstractmethod
+    def update_caption(self, image_id: UUID, caption: Optional[str], hashtags: Optional[str]) -> None:
+        """Guarda el texto de la publicación y los hashtags elegidos para una imagen"""
+        pass
+
+    @abstractmethod
+    def iter_captions(self, batch_size: int = 1000) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+        """Recorre (caption, hashtags) de todas las imágenes que tienen hashtags (para construir el índice de sugerencias)"""
+        pass
+
+    @abstractmethod
+    def iter_file_names(self, batch_size: int = 1000) -> Iterator[str]:
+        """Recorre las claves en MinIO de todas las imágenes (también las de la papelera)"""
+        pass
+
+    @abstractmethod
+    def search_rows(
+        self,
+        user_id: UUID,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, UUID]] = None,
+        similarity_threshold: float = 0.3,
+    ) -> List[Dict[str, Any]]:
+        """
+        Busca entre las imágenes activas de un usuario por nombre original, caption y hashtags (coincidencia difusa).
+        Devuelve filas con una columna extra "rank", ordenadas por (rank, id) descendente; `after` es la
+        última (rank, id) de la página anterior (paginación por cursor)
+        """
+        pass
+
+    @abstractmethod
+    def bulk_save(self, images: List[Image]) -> None:
+        """Inserta muchas imágenes de una vez (importaciones) y ajusta los contadores de sus usuarios"""
+        pass
+
+    @abstractmethod
+    def existing_ids(self, image_ids: List[UUID]) -> List[UUID]:
+        """De una lista de IDs, devuelve los que ya existen (para reanudar importaciones sin duplicar)"""
+        pass
@@ -0,0 +1,56 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from domain.entities.job import Job
+
+
+class JobRepository(ABC):
+    """Puerto de la cola de trabajos en segundo plano"""
+
+    @abstractmethod
+    def enqueue(self, job: Job) -> Job:
+        """Añade un trabajo a la cola"""
+        pass
+
+    @abstractmethod
+    def enqueue_many(self, jobs: List[Job]) -> None:
+        """Añade varios trabajos con un solo INSERT"""
+        pass
+
+    @abstractmethod
+    def claim(self, job_type: str, worker_id: str, limit: int, visibility_timeout: int,
+              max_running: Optional[int] = None) -> List[Job]:
+        """
+        Reserva hasta `limit` trabajos listos de un tipo para este worker durante `visibility_timeout` segundos.
+        Si se indica max_running, nunca habrá más de ese número de trabajos del tipo en curso entre todos los workers.
+        """
+        pass
+
+    @abstractmethod
+    def complete(self, job: Job) -> bool:
+        """Marca un trabajo reservado como terminado. False si la reserva ya no es de este worker"""
+        pass
+
+    @abstractmethod
+    def fail(self, job: Job, error: str, retry_at: Optional[datetime]) -> bool:
+        """
+        Registra un fallo: se reintenta en retry_at o, si es None, queda como fallido definitivamente.
+        False si la reserva ya no es de este worker
+        """
+        pass
+
+    @abstractmethod
+    def extend(self, job: Job, visibility_timeout: int) -> bool:
+        """Renueva el plazo de visibilidad de un trabajo en curso. False si la reserva ya no es de este worker"""
+        pass
+
+    @abstractmethod
+    def fail_expired(self) -> int:
+        """Da por fallidos los trabajos cuyo plazo de visibilidad caducó tras agotar los reintentos"""
+        pass
+
+    @abstractmethod
+    def delete_finished_before(self, date: datetime) -> int:
+        """Borra los trabajos terminados (o fallidos) antes de una fecha"""
+        pass
@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import BinaryIO, List, Optional
+
+from domain.entities.stored_object import StoredObject
+
+
+class ObjectStorage(ABC):
+    """Puerto del almacenamiento de los archivos de las imágenes (MinIO/S3 u otros)"""
+
+    @abstractmethod
+    def put(self, key: str, file_obj: BinaryIO, content_type: Optional[str] = None) -> None:
+        """Guarda el contenido de file_obj (leído en streaming, sin cargarlo entero en memoria)"""
+        pass
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Abre el objeto para leerlo en streaming. Quien lo abre debe cerrarlo (se puede usar con `with`)"""
+        pass
+
+    @abstractmethod
+    def head(self, key: str) -> Optional[StoredObject]:
+        """Metadatos del objeto, o None si no existe"""
+        pass
+
+    @abstractmethod
+    def delete_many(self, keys: List[str]) -> List[str]:
+        """Borra varios objetos con las mínimas llamadas posibles. Devuelve las claves que no se pudieron borrar"""
+        pass
+
+    @abstractmethod
+    def presign(self, key: str, expires_in: int = 3600) -> str:
+        """URL temporal con la que el navegador descarga el objeto directamente"""
+        pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Ruta en disco del objeto si el almacenamiento es local (para servirlo sin copiarlo), None si no"""
+        return None
@@ -4,11 +4,14 @@ from typing import Optional
 from datetime import datetime
 
 from domain.entities.pending_user import PendingUser
-from infrastructure.db.models.pending_user_model import PendingUser as PendingUserModel
 
 
 class PendingUserRepository(ABC):
-    """Puerto (interfaz) para el repositorio de PendingUser"""
+    """
+    Puerto (interfaz) para el repositorio de PendingUser.
+    Implementaciones: tabla pending_users (infrastructure/db), memoria del proceso y Redis (infrastructure/pending_users).
+    Todas deben ignorar los registros caducados aunque todavía no se hayan borrado.
+    """
 
     @abstractmethod
     def create(self, pending_user: PendingUser) -> PendingUser:
@@ -32,14 +35,9 @@ class PendingUserRepository(ABC):
 
     @abstractmethod
     def delete_expired(self, now: datetime) -> int:
-        """Eliminar registros caducados (expires_at < now)"""
+        """Eliminar registros caducados (expires_at < now). Los almacenes con caducidad nativa devuelven 0"""
         pass
 
-    @abstractmethod
-    def _to_entity(self, pending_user_model: PendingUserModel) -> PendingUser:
-        """Convertir un modelo PendingUser a entidad PendingUser"""
-        pass    
-
     @abstractmethod
     def update(self, pending_user: PendingUser) -> PendingUser:
         """Actualizar código y expiración de un pending_user existente"""
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 from domain.entities.user_entity import User
 import uuid
 
@@ -25,6 +25,10 @@ class UserRepository(ABC):
     def delete(self, user_id: uuid.UUID) -> None:
         pass
 
+    @abstractmethod
+    def iter_rows(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]: # Versión en streaming de list_all (filas planas, por lotes)
+        pass
+
 #Anotaciones
 # - `@abstractmethod`: Es un decorador que marca un método como obligatorio de implementar en cualquier clase que herede de UserRepository. Si una subclase no implementa todos los métodos marcados como @abstractmethod, no se podrá instanciar.
 
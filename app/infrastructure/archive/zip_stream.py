@@ -0,0 +1,67 @@
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+# Formatos que ya vienen comprimidos: volver a pasarlos por deflate gasta CPU sin reducir nada
+PRECOMPRESSED_FORMATS = {"JPEG", "MPO", "PNG", "GIF", "WEBP", "HEIF", "AVIF"}
+# Se envía al cliente en cuanto hay al menos esto acumulado
+FLUSH_BYTES = 64 * 1024
+MIN_ZIP_DATE = datetime(1980, 1, 1)  # el formato ZIP no admite fechas anteriores
+
+
+@dataclass(slots=True)
+class ZipEntry:
+    name: str
+    chunks: Iterable[bytes]
+    modified_at: Optional[datetime] = None
+    size: Optional[int] = None  # None = desconocido (se fuerza ZIP64 en la entrada por si supera 4 GiB)
+    compress: bool = True
+
+
+class _Sink:
+    """Destino de ZipFile que sólo acumula lo escrito. Al no ser seekable, zipfile escribe cada entrada en streaming
+    (tamaños y CRC van en un data descriptor detrás de los datos) y nunca vuelve atrás"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self.pending = 0
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self.pending = 0
+        return data
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    """
+    Genera un ZIP en trozos a partir de entradas que también llegan en trozos: no escribe nada en disco
+    y en memoria sólo hay lo pendiente de enviar. ZIP64 se activa solo cuando hace falta (entradas de más
+    de 4 GiB, más de 65535 entradas o un archivo total de más de 4 GiB)
+    """
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", allowZip64=True) as archive:
+        for entry in entries:
+            modified = max(entry.modified_at or datetime.utcnow(), MIN_ZIP_DATE)
+            info = zipfile.ZipInfo(entry.name, date_time=modified.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if entry.compress else zipfile.ZIP_STORED
+            if entry.size is not None:
+                info.file_size = entry.size
+            with archive.open(info, "w", force_zip64=entry.size is None) as dest:
+                for chunk in entry.chunks:
+                    dest.write(chunk)
+                    if sink.pending >= FLUSH_BYTES:
+                        yield sink.drain()
+            if sink.pending >= FLUSH_BYTES:
+                yield sink.drain()
+    # Directorio central
+    yield sink.drain()
@@ -1,51 +1,89 @@
-from fastapi import Depends, HTTPException, status
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
 
-from infrastructure.db.db_config import get_db
-from domain.repositories.user_repository import UserRepository
+from infrastructure.db.db_config import short_session
 from infrastructure.db.repositories.user_repository_impl import UserRepositoryImpl
+from config import settings
 
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+STREAM_TICKET_PURPOSE = "events"  # claim "purpose" de los tickets de /events
 
-import os
-from dotenv import load_dotenv
+bearer_scheme = HTTPBearer()
+optional_bearer_scheme = HTTPBearer(auto_error=False)
 
-load_dotenv()
+def get_current_user(credentials=Depends(bearer_scheme)):
+    # Credentials es un objeto que contiene el token JWT
+    token = credentials.credentials  # Extrae el JWT del header
+    return _load_user(token)
 
-SECRET_KEY = os.getenv("SECRET_KEY", "supersecret")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
 
-bearer_scheme = HTTPBearer()
+def get_current_user_for_stream(
+    credentials=Depends(optional_bearer_scheme),
+    ticket: Optional[str] = Query(None),
+):
+    """
+    Para conexiones largas (SSE): EventSource no permite cabeceras, así que se acepta un ticket de
+    /events/ticket en ?ticket=. El JWT de sesión nunca va en la URL (acabaría en los logs de acceso);
+    el ticket sólo sirve para abrir /events y caduca en sse_ticket_ttl_seconds
+    """
+    if credentials:
+        return _load_user(credentials.credentials)
+    if ticket:
+        return _load_user(ticket, purpose=STREAM_TICKET_PURPOSE)
+    raise _credentials_exception()
 
-def get_user_repository(db: Session = Depends(get_db)) -> UserRepository:
-    return UserRepositoryImpl(db)
 
-def get_current_user(
-    credentials=Depends(bearer_scheme),
-    user_repo: UserRepository = Depends(get_user_repository)
-):
-    # Credentials es un objeto que contiene el token JWT
-    token = credentials.credentials  # Extrae el JWT del header
+def create_stream_ticket(user_id) -> str:
+    """JWT de un solo uso previsto (abrir /events) y vida corta, para pasarlo en la URL"""
+    payload = {
+        "sub": str(user_id),
+        "purpose": STREAM_TICKET_PURPOSE,
+        "exp": datetime.utcnow() + timedelta(seconds=settings.sse_ticket_ttl_seconds),
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+
+def is_admin_token(token: str) -> bool:
+    """Comprueba un token fuera de las dependencias de FastAPI (p. ej. desde un middleware)"""
+    try:
+        return bool(getattr(_load_user(token), "is_admin", False))
+    except HTTPException:
+        return False
+
 
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _load_user(token: str, purpose: Optional[str] = None):
+    """
+    Usuario del token, leído con una sesión propia que se cierra antes de volver. Si se usara get_db,
+    la sesión (con su transacción abierta) no se liberaría hasta terminar de enviar la respuesta:
+    en las descargas en streaming eso es una conexión del pool ocupada durante toda la descarga
+    """
     # Decodificar el token JWT
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        user_id = UUID(payload.get("sub"))
+        # Un ticket de /events no vale como token de sesión, ni al revés
+        if payload.get("purpose") != purpose:
+            raise _credentials_exception()
+    except (JWTError, TypeError, ValueError):
+        raise _credentials_exception()
 
-    user = user_repo.get_by_id(user_id)
+    with short_session() as db:
+        user = UserRepositoryImpl(db).get_by_id(user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     return user
 
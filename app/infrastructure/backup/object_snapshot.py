@@ -0,0 +1,184 @@
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from infrastructure.s3.s3_client import get_s3_client
+from config import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(slots=True)
+class ObjectEntry:
+    """Un objeto del bucket dentro de un snapshot"""
+    key: str
+    etag: str
+    size: int
+    sha256: str  # nombre del blob en el almacén de la copia
+    content_type: Optional[str] = None
+
+
+def _verifiable_md5(etag: str) -> Optional[str]:
+    # En subidas de una sola parte el ETag es el MD5 del contenido; en las multiparte ("<md5>-<partes>") no
+    return None if "-" in etag else etag
+
+
+class BlobStore:
+    """
+    Almacén de contenido de las copias: cada objeto se guarda una sola vez, con su SHA-256 como nombre
+    (objects/ab/abcdef...). Varios snapshots que contienen el mismo objeto comparten el blob.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self.path(sha256))
+
+    def write(self, chunks: Iterable[bytes]) -> Tuple[str, str, int]:
+        """Guarda el contenido y devuelve (sha256, md5, tamaño). Se escribe a un temporal y se renombra al final"""
+        sha256, md5, size = hashlib.sha256(), hashlib.md5(), 0
+        with tempfile.NamedTemporaryFile(dir=self.tmp_dir, delete=False) as tmp:
+            try:
+                for chunk in chunks:
+                    sha256.update(chunk)
+                    md5.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+            except Exception:
+                tmp.close()
+                os.unlink(tmp.name)
+                raise
+        digest = sha256.hexdigest()
+        os.makedirs(os.path.dirname(self.path(digest)), exist_ok=True)
+        os.replace(tmp.name, self.path(digest))
+        return digest, md5.hexdigest(), size
+
+    def verify(self, sha256: str) -> bool:
+        digest = hashlib.sha256()
+        with open(self.path(sha256), "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest() == sha256
+
+    def collect_garbage(self, referenced: set) -> int:
+        """Borra los blobs que ya no aparecen en ningún snapshot. Devuelve cuántos se borraron"""
+        removed = 0
+        for prefix in os.listdir(self.root):
+            folder = os.path.join(self.root, prefix)
+            if prefix == "tmp" or not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name not in referenced:
+                    os.unlink(os.path.join(folder, name))
+                    removed += 1
+        return removed
+
+
+def list_bucket() -> Dict[str, Tuple[str, int]]:
+    """key -> (etag, tamaño) de todos los objetos del bucket"""
+    objects = {}
+    paginator = get_s3_client().get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=settings.minio_bucket):
+        for item in page.get("Contents", []):
+            objects[item["Key"]] = (item["ETag"].strip('"'), item["Size"])
+    return objects
+
+
+def snapshot_bucket(
+    store: BlobStore,
+    previous: Dict[str, ObjectEntry],
+    workers: int = settings.backup_transfer_workers,
+) -> Tuple[List[ObjectEntry], List[str]]:
+    """
+    Copia incremental del bucket: sólo se descargan los objetos cuyo ETag o tamaño cambió respecto al
+    snapshot anterior (o cuyo blob falta). Cada descarga se comprueba contra el MD5 del ETag cuando es posible.
+    Devuelve (entradas del snapshot, errores).
+    """
+    entries: List[ObjectEntry] = []
+    pending: List[Tuple[str, str, int]] = []
+    for key, (etag, size) in sorted(list_bucket().items()):
+        known = previous.get(key)
+        if known and known.etag == etag and known.size == size and store.exists(known.sha256):
+            entries.append(known)
+        else:
+            pending.append((key, etag, size))
+
+    print(f"📦 {len(entries)} objetos sin cambios, {len(pending)} por descargar")
+    errors: List[str] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backup-download") as pool:
+        for key, result in zip([p[0] for p in pending], pool.map(lambda p: _download(store, *p), pending)):
+            if isinstance(result, ObjectEntry):
+                entries.append(result)
+            else:
+                errors.append(f"{key}: {result}")
+    entries.sort(key=lambda entry: entry.key)
+    return entries, errors
+
+
+def _download(store: BlobStore, key: str, etag: str, size: int):
+    try:
+        response = get_s3_client().get_object(Bucket=settings.minio_bucket, Key=key, IfMatch=f'"{etag}"')
+        sha256, md5, written = store.write(response["Body"].iter_chunks(CHUNK_SIZE))
+        expected_md5 = _verifiable_md5(etag)
+        if written != size or (expected_md5 and md5 != expected_md5):
+            return "el contenido descargado no coincide con el ETag/tamaño del bucket"
+        return ObjectEntry(key=key, etag=etag, size=size, sha256=sha256, content_type=response.get("ContentType"))
+    except Exception as e:
+        # IfMatch falla si el objeto cambió entre el listado y la descarga: se recogerá en la siguiente copia
+        return str(e)
+
+
+def restore_bucket(
+    store: BlobStore,
+    entries: List[ObjectEntry],
+    prune: bool = False,
+    workers: int = settings.backup_transfer_workers,
+) -> Tuple[int, List[str]]:
+    """
+    Deja el bucket como en el snapshot. Sólo se suben los objetos que faltan o cuyo ETag no coincide,
+    comprobando antes el SHA-256 del blob. Con prune se borran los objetos que no están en el snapshot.
+    Devuelve (objetos subidos, errores).
+    """
+    current = list_bucket()
+    pending = [e for e in entries if current.get(e.key) != (e.etag, e.size)]
+    print(f"♻️ {len(entries) - len(pending)} objetos ya están en el bucket, {len(pending)} por subir")
+
+    errors: List[str] = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backup-upload") as pool:
+        for entry, error in zip(pending, pool.map(lambda e: _upload(store, e), pending)):
+            if error:
+                errors.append(f"{entry.key}: {error}")
+
+    if prune:
+        wanted = {entry.key for entry in entries}
+        extra = [key for key in current if key not in wanted]
+        s3 = get_s3_client()
+        # delete_objects admite hasta 1000 claves por llamada
+        for start in range(0, len(extra), 1000):
+            s3.delete_objects(
+                Bucket=settings.minio_bucket,
+                Delete={"Objects": [{"Key": key} for key in extra[start : start + 1000]], "Quiet": True},
+            )
+        print(f"🗑 {len(extra)} objetos que no estaban en la copia eliminados")
+    return len(pending) - len(errors), errors
+
+
+def _upload(store: BlobStore, entry: ObjectEntry) -> Optional[str]:
+    try:
+        if not store.verify(entry.sha256):
+            return "el blob de la copia está dañado (SHA-256 distinto)"
+        extra_args = {"ContentType": entry.content_type} if entry.content_type else None
+        with open(store.path(entry.sha256), "rb") as f:
+            get_s3_client().upload_fileobj(f, settings.minio_bucket, entry.key, ExtraArgs=extra_args)
+        return None
+    except Exception as e:
+        return str(e)
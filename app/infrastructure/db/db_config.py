@@ -1,23 +1,79 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.orm import Session
 from fastapi import Depends
-import os
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from typing import Callable, Iterator, TypeVar
+from config import settings  # Las variables de entorno / .env se cargan una sola vez en config.Settings
+from infrastructure.observability.query_stats import install_query_stats
+from infrastructure.resilience.dependencies import POSTGRES, get_breaker
 
-load_dotenv()  # Carga las variables de entorno desde .env
-
-DB_USER = os.getenv("POSTGRES_USER")
-DB_PASSWORD = os.getenv("POSTGRES_PASSWORD")
-DB_NAME = os.getenv("POSTGRES_DB")
-DB_HOST = os.getenv("POSTGRES_HOST", "db")  # por defecto 'db' desde Docker
-DB_PORT = os.getenv("POSTGRES_PORT", "5432")
+DB_USER = settings.postgres_user
+DB_PASSWORD = settings.postgres_password
+DB_NAME = settings.postgres_db
+DB_HOST = settings.postgres_host  # por defecto 'db' desde Docker
+DB_PORT = settings.postgres_port
 
 DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(
+    DATABASE_URL,
+    echo=settings.db_echo,  # el log de consultas lentas y el detector de N+1 sustituyen al echo permanente
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_pre_ping=True,  # descarta conexiones muertas (p. ej. tras reiniciar Postgres) antes de usarlas
+    connect_args={
+        "connect_timeout": settings.db_connect_timeout,
+        # Plazos por sesión: una consulta o un lock colgados se cancelan en vez de bloquear el hilo
+        "options": f"-c statement_timeout={settings.db_statement_timeout_ms} -c lock_timeout={settings.db_lock_timeout_ms}",
+    },
+)
 SessionLocal = sessionmaker(bind=engine)
 
+# Tiempos por consulta, log de consultas lentas y recuento por petición (ver QueryStatsMiddleware)
+install_query_stats(engine)
+
+# Circuit breaker de Postgres: si la base de datos está caída, las siguientes peticiones fallan al momento
+# (503) en vez de esperar cada una su connect_timeout ocupando un hilo
+_postgres_breaker = get_breaker(POSTGRES)
+
+
+@event.listens_for(engine, "engine_connect")
+def _check_postgres_breaker(connection):
+    _postgres_breaker.before_call()
+
+
+@event.listens_for(engine, "handle_error")
+def _record_postgres_failure(context):
+    # Sólo cuentan los fallos de conexión: una consulta cancelada por statement_timeout o un lock que no
+    # llega (lock_timeout) son problemas de esa consulta, y abrir el circuito tumbaría todas las demás
+    error = context.original_exception
+    if getattr(error, "pgcode", None) in _QUERY_LEVEL_PGCODES:
+        return
+    if context.is_disconnect or _is_connect_error(context):
+        _postgres_breaker.record_failure(error)
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _record_postgres_success(conn, cursor, statement, parameters, context, executemany):
+    _postgres_breaker.record_success()
+
+
+# QueryCanceled (57014: statement_timeout o cancelación) y LockNotAvailable (55P03: lock_timeout)
+_QUERY_LEVEL_PGCODES = {"57014", "55P03"}
+
+
+def _is_connect_error(context) -> bool:
+    # Al fallar el connect todavía no hay Connection; el driver lo señala con OperationalError
+    # (servidor caído, conexión rechazada, connect_timeout)
+    return (
+        context.connection is None
+        and isinstance(context.sqlalchemy_exception, DBAPIError)
+        and any(cls.__name__ == "OperationalError" for cls in type(context.original_exception).__mro__)
+    )
+
 Base = declarative_base()
 
 # Dependency to get the database session
@@ -27,4 +83,26 @@ def get_db() -> Session:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+T = TypeVar("T")
+
+# Para respuestas en streaming: el generador se consume después de que el endpoint termine,
+# así que abre su propia sesión y la cierra al acabar de enviar (o si el cliente corta la conexión)
+def iter_with_session(produce: Callable[[Session], Iterator[T]]) -> Iterator[T]:
+    db = SessionLocal()
+    try:
+        yield from produce(db)
+    finally:
+        db.close()
+
+
+# Sesión para una operación corta fuera del ciclo de una petición: al salir se cierra y la conexión vuelve al pool
+@contextmanager
+def short_session() -> Iterator[Session]:
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
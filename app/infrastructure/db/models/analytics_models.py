@@ -0,0 +1,55 @@
+from sqlalchemy import Column, String, Date, DateTime, Integer, BigInteger
+from sqlalchemy.dialects.postgresql import UUID
+
+from infrastructure.db.db_config import Base
+
+# Tablas de resumen para las estadísticas de administración. Las mantiene el job de refresco
+# (infrastructure/scheduler/refresh_analytics.py) de forma incremental: cada ejecución sólo lee
+# las imágenes creadas desde la anterior, así los paneles nunca recorren la tabla images.
+
+
+class AnalyticsWatermark(Base):
+    """Hasta dónde se ha procesado cada fuente (created_at de la última imagen incorporada)"""
+    __tablename__ = "analytics_watermarks"
+
+    name = Column(String(50), primary_key=True)
+    processed_until = Column(DateTime, nullable=False)
+    refreshed_at = Column(DateTime, nullable=False)
+
+
+class DailyUploadStatsModel(Base):
+    __tablename__ = "analytics_daily_uploads"
+
+    day = Column(Date, primary_key=True)
+    uploads = Column(Integer, nullable=False, default=0)
+    uploaded_bytes = Column(BigInteger, nullable=False, default=0)
+    active_users = Column(Integer, nullable=False, default=0)
+
+
+class DailyActiveUserModel(Base):
+    """Un par (día, usuario) por cada usuario que subió algo ese día: da los usuarios activos exactos de un periodo"""
+    __tablename__ = "analytics_daily_active_users"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), primary_key=True)
+
+
+class StorageSnapshotModel(Base):
+    __tablename__ = "analytics_storage_snapshots"
+
+    day = Column(Date, primary_key=True)
+    live_images = Column(BigInteger, nullable=False, default=0)
+    live_bytes = Column(BigInteger, nullable=False, default=0)
+    trashed_images = Column(BigInteger, nullable=False, default=0)
+    trashed_bytes = Column(BigInteger, nullable=False, default=0)
+
+
+class TopStorageUserModel(Base):
+    """Ranking de usuarios por almacenamiento, recalculado en cada refresco"""
+    __tablename__ = "analytics_top_storage_users"
+
+    rank = Column(Integer, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), nullable=False)
+    username = Column(String(50), nullable=False)
+    live_bytes = Column(BigInteger, nullable=False, default=0)
+    trashed_bytes = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, JSON
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+import uuid
+
+from infrastructure.db.db_config import Base
+
+
+class ImageImportModel(Base):
+    __tablename__ = "image_imports"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    archive_key = Column(String, nullable=False)
+    status = Column(String(10), nullable=False, default="pending")
+    total_entries = Column(Integer, nullable=False, default=0)
+    processed_entries = Column(Integer, nullable=False, default=0)
+    imported = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False, default=list)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, BigInteger, Integer, Text, Computed, DDL, Index, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -13,12 +13,54 @@ class ImageModel(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     file_name = Column(String, nullable=False)
+    original_name = Column(String(255), nullable=True)  # nombre del archivo en el equipo del usuario (para buscar)
     url = Column(String, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)  # índice: el refresco de estadísticas lee sólo las nuevas
     # Nuevas columnas para Soft Delete
     is_deleted = Column(Boolean, default=False, nullable=False)
     deleted_at = Column(DateTime, nullable=True)
+    # Tamaño del objeto en bytes (se guarda al subir)
+    size_bytes = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # Metadatos extraídos al subir (así los listados no necesitan un HEAD/GET a MinIO)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    format = Column(String(16), nullable=True)  # JPEG, PNG, WEBP...
+    content_type = Column(String(100), nullable=True)
+    taken_at = Column(DateTime, nullable=True)  # fecha EXIF de captura, si la tiene
+    # Vista previa diminuta (data URI WebP de 16px) que se genera en segundo plano tras la subida
+    placeholder = Column(String, nullable=True)
+    # Texto de la publicación y hashtags elegidos por el usuario (separados por espacios).
+    # También alimentan el índice del generador de hashtags
+    caption = Column(Text, nullable=True)
+    hashtags = Column(Text, nullable=True)
+    # Texto en el que se busca (nombre original + caption + hashtags), en minúsculas.
+    # Columna generada: Postgres la mantiene sola en cada INSERT/UPDATE
+    search_text = Column(
+        Text,
+        Computed("lower(coalesce(original_name, '') || ' ' || coalesce(caption, '') || ' ' || coalesce(hashtags, ''))", persisted=True),
+    )
 
 
     # Relación con usuario (opcional, si quieres acceso desde la ORM)
     user = relationship("UserModel", back_populates="images")
+
+    __table_args__ = (
+        # Búsqueda difusa por usuario: GIN de trigramas (pg_trgm) con user_id en el mismo índice (btree_gin),
+        # así la búsqueda sólo recorre las entradas del usuario y no las de toda la tabla
+        Index(
+            "ix_images_user_search_trgm",
+            "user_id",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
+
+
+# Las extensiones tienen que existir antes de crear el índice (vienen con Postgres, en contrib)
+for extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Base.metadata,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}").execute_if(dialect="postgresql"),
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, JSON, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+import uuid
+
+from infrastructure.db.db_config import Base
+
+
+class JobModel(Base):
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_type = Column(String(50), nullable=False)
+    payload = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False, default=dict)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")
+    status = Column(String(10), nullable=False, default="queued", server_default="queued")
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=5, server_default="5")
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # no se ejecuta antes (backoff de reintentos)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)  # plazo de visibilidad: si el worker muere, el trabajo vuelve a la cola
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Índices parciales: sólo contienen los trabajos pendientes / en curso, así que siguen siendo
+        # pequeños aunque la tabla acumule trabajos terminados
+        Index(
+            "ix_jobs_ready", "job_type", "priority", "run_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index(
+            "ix_jobs_running", "job_type", "locked_until",
+            postgresql_where=text("status = 'running'"),
+        ),
+    )
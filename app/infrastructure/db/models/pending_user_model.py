@@ -14,4 +14,4 @@ class PendingUser(Base):
     password_hash = Column(String(255), nullable=False)
     verification_code = Column(String(6), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # índice para la limpieza periódica (expires_at < now)
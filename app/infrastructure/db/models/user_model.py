@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, DateTime
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, BigInteger
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -15,4 +15,13 @@ class UserModel(Base):
     password = Column(String(255), nullable=False)
     is_admin = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Versión de la colección de imágenes del usuario: se incrementa en cada subida, borrado, restauración o purga.
+    # Se usa como ETag de /images/me y /images/trash
+    images_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Contadores de almacenamiento, actualizados de forma incremental por ImageRepositoryImpl
+    # (así la cuota se comprueba con una lectura por PK, sin SUM sobre images)
+    live_images_count = Column(Integer, nullable=False, default=0, server_default="0")
+    live_images_bytes = Column(BigInteger, nullable=False, default=0, server_default="0")
+    trashed_images_count = Column(Integer, nullable=False, default=0, server_default="0")
+    trashed_images_bytes = Column(BigInteger, nullable=False, default=0, server_default="0")
     images = relationship("ImageModel", back_populates="user", cascade="all, delete-orphan")
\ No newline at end of file
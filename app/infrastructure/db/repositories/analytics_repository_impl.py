@@ -0,0 +1,226 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, func, insert, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from domain.entities.analytics import AnalyticsOverview, DailyUploadStats, StorageSnapshot, TopStorageUser
+from domain.repositories.analytics_repository import AnalyticsRepository
+from infrastructure.db.models.analytics_models import (
+    AnalyticsWatermark,
+    DailyActiveUserModel,
+    DailyUploadStatsModel,
+    StorageSnapshotModel,
+    TopStorageUserModel,
+)
+from infrastructure.db.models.image_model import ImageModel
+from infrastructure.db.models.user_model import UserModel
+
+UPLOADS_WATERMARK = "images"
+EPOCH = datetime(1970, 1, 1)
+
+
+class AnalyticsRepositoryImpl(AnalyticsRepository):
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    # -------------------
+    # Refresco incremental
+    # -------------------
+    def refresh(self, until: datetime, top_users: int) -> int:
+        try:
+            processed = self._refresh_uploads(until)
+            self._refresh_storage()
+            self._refresh_top_users(top_users)
+            self.db.commit()
+            return processed
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def _refresh_uploads(self, until: datetime) -> int:
+        # FOR UPDATE: si dos procesos refrescan a la vez, el segundo espera y encuentra la marca ya avanzada
+        watermark = (
+            self.db.query(AnalyticsWatermark)
+            .filter(AnalyticsWatermark.name == UPLOADS_WATERMARK)
+            .with_for_update()
+            .first()
+        )
+        if watermark is None:
+            watermark = AnalyticsWatermark(name=UPLOADS_WATERMARK, processed_until=EPOCH, refreshed_at=until)
+            self.db.add(watermark)
+        since = watermark.processed_until
+        if until <= since:
+            return 0
+
+        # Sólo las imágenes nuevas (rango sobre el índice de created_at), ya agregadas por día y usuario.
+        # La primera ejecución recorre todo el histórico una vez; las siguientes, sólo lo añadido desde la anterior
+        day = func.date(ImageModel.created_at)
+        rows = (
+            self.db.query(
+                day.label("day"),
+                ImageModel.user_id,
+                func.count(ImageModel.id).label("uploads"),
+                func.coalesce(func.sum(ImageModel.size_bytes), 0).label("uploaded_bytes"),
+            )
+            .filter(ImageModel.created_at > since, ImageModel.created_at <= until)
+            .group_by(day, ImageModel.user_id)
+            .all()
+        )
+
+        per_day = defaultdict(lambda: [0, 0])
+        active = []
+        for row in rows:
+            row_day = row.day if isinstance(row.day, date) else date.fromisoformat(row.day)
+            per_day[row_day][0] += row.uploads
+            per_day[row_day][1] += row.uploaded_bytes
+            active.append({"day": row_day, "user_id": row.user_id})
+
+        if active:
+            self.db.execute(self._insert(DailyActiveUserModel).values(active).on_conflict_do_nothing())
+        for row_day, (uploads, uploaded_bytes) in per_day.items():
+            stmt = self._insert(DailyUploadStatsModel).values(
+                day=row_day, uploads=uploads, uploaded_bytes=uploaded_bytes, active_users=0
+            )
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[DailyUploadStatsModel.day],
+                set_={
+                    "uploads": DailyUploadStatsModel.uploads + uploads,
+                    "uploaded_bytes": DailyUploadStatsModel.uploaded_bytes + uploaded_bytes,
+                },
+            ))
+        if per_day:
+            # Usuarios activos de los días tocados: se cuentan sobre la tabla (día, usuario), no sobre images
+            counts = (
+                self.db.query(DailyActiveUserModel.day, func.count())
+                .filter(DailyActiveUserModel.day.in_(list(per_day)))
+                .group_by(DailyActiveUserModel.day)
+                .all()
+            )
+            for row_day, count in counts:
+                self.db.query(DailyUploadStatsModel).filter(DailyUploadStatsModel.day == row_day).update(
+                    {"active_users": count}, synchronize_session=False
+                )
+
+        watermark.processed_until = until
+        watermark.refreshed_at = datetime.utcnow()
+        return sum(row.uploads for row in rows)
+
+    def _refresh_storage(self) -> None:
+        # Los totales salen de los contadores mantenidos en users (una fila por usuario, nunca de images)
+        totals = self.db.query(
+            func.coalesce(func.sum(UserModel.live_images_count), 0),
+            func.coalesce(func.sum(UserModel.live_images_bytes), 0),
+            func.coalesce(func.sum(UserModel.trashed_images_count), 0),
+            func.coalesce(func.sum(UserModel.trashed_images_bytes), 0),
+        ).one()
+        values = dict(live_images=totals[0], live_bytes=totals[1], trashed_images=totals[2], trashed_bytes=totals[3])
+        stmt = self._insert(StorageSnapshotModel).values(day=datetime.utcnow().date(), **values)
+        self.db.execute(stmt.on_conflict_do_update(index_elements=[StorageSnapshotModel.day], set_=values))
+
+    def _refresh_top_users(self, limit: int) -> None:
+        total = UserModel.live_images_bytes + UserModel.trashed_images_bytes
+        rows = (
+            self.db.query(UserModel.id, UserModel.username, UserModel.live_images_bytes, UserModel.trashed_images_bytes)
+            .filter(total > 0)
+            .order_by(total.desc())
+            .limit(limit)
+            .all()
+        )
+        self.db.execute(delete(TopStorageUserModel))
+        if rows:
+            self.db.execute(insert(TopStorageUserModel).values([
+                {
+                    "rank": rank,
+                    "user_id": row.id,
+                    "username": row.username,
+                    "live_bytes": row.live_images_bytes,
+                    "trashed_bytes": row.trashed_images_bytes,
+                }
+                for rank, row in enumerate(rows, start=1)
+            ]))
+
+    def _insert(self, model):
+        # INSERT ... ON CONFLICT del dialecto en uso (Postgres en producción)
+        dialect = postgresql if self.db.get_bind().dialect.name == "postgresql" else sqlite
+        return dialect.insert(model)
+
+    # -------------------
+    # Lecturas (sólo tablas de resumen)
+    # -------------------
+    def get_daily_uploads(self, since: date) -> List[DailyUploadStats]:
+        rows = (
+            self.db.query(DailyUploadStatsModel)
+            .filter(DailyUploadStatsModel.day >= since)
+            .order_by(DailyUploadStatsModel.day)
+            .all()
+        )
+        return [
+            DailyUploadStats(day=r.day, uploads=r.uploads, uploaded_bytes=r.uploaded_bytes, active_users=r.active_users)
+            for r in rows
+        ]
+
+    def count_active_users(self, since: date) -> int:
+        return (
+            self.db.query(func.count(func.distinct(DailyActiveUserModel.user_id)))
+            .filter(DailyActiveUserModel.day >= since)
+            .scalar()
+        )
+
+    def get_storage_snapshots(self, since: date) -> List[StorageSnapshot]:
+        rows = (
+            self.db.query(StorageSnapshotModel)
+            .filter(StorageSnapshotModel.day >= since)
+            .order_by(StorageSnapshotModel.day)
+            .all()
+        )
+        return [
+            StorageSnapshot(
+                day=r.day,
+                live_images=r.live_images,
+                live_bytes=r.live_bytes,
+                trashed_images=r.trashed_images,
+                trashed_bytes=r.trashed_bytes,
+            )
+            for r in rows
+        ]
+
+    def get_top_storage_users(self, limit: int) -> List[TopStorageUser]:
+        rows = self.db.query(TopStorageUserModel).order_by(TopStorageUserModel.rank).limit(limit).all()
+        return [
+            TopStorageUser(
+                rank=r.rank, user_id=r.user_id, username=r.username, live_bytes=r.live_bytes, trashed_bytes=r.trashed_bytes
+            )
+            for r in rows
+        ]
+
+    def get_overview(self) -> AnalyticsOverview:
+        return AnalyticsOverview(
+            approx_users=self._approx_count(UserModel),
+            approx_images=self._approx_count(ImageModel),
+            active_users_last_30_days=self.count_active_users(datetime.utcnow().date() - timedelta(days=30)),
+            refreshed_at=self.get_refreshed_at(),
+        )
+
+    def get_refreshed_at(self) -> Optional[datetime]:
+        return (
+            self.db.query(AnalyticsWatermark.refreshed_at)
+            .filter(AnalyticsWatermark.name == UPLOADS_WATERMARK)
+            .scalar()
+        )
+
+    def _approx_count(self, model) -> int:
+        """
+        En Postgres, COUNT(*) exacto recorre la tabla entera; la estimación que mantienen
+        VACUUM/ANALYZE en pg_class basta para un panel. En otros motores (pruebas) se cuenta
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            estimate = self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+                {"table": model.__tablename__},
+            ).scalar()
+            if estimate is not None and estimate >= 0:  # -1 = tabla nunca analizada
+                return estimate
+        return self.db.query(func.count()).select_from(model).scalar()
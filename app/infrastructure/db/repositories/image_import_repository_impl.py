@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from domain.entities.image_import import IMPORT_DONE, IMPORT_FAILED, ImageImport
+from domain.repositories.image_import_repository import ImageImportRepository
+from infrastructure.db.models.image_import_model import ImageImportModel
+
+
+class ImageImportRepositoryImpl(ImageImportRepository):
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def create(self, image_import: ImageImport) -> ImageImport:
+        model = ImageImportModel(
+            id=image_import.id,
+            user_id=image_import.user_id,
+            archive_key=image_import.archive_key,
+            status=image_import.status,
+        )
+        self.db.add(model)
+        self.db.commit()
+        self.db.refresh(model)
+        return self._to_entity(model)
+
+    def get_by_id(self, import_id: UUID) -> Optional[ImageImport]:
+        model = self.db.query(ImageImportModel).filter(ImageImportModel.id == import_id).first()
+        return self._to_entity(model) if model else None
+
+    def update_progress(
+        self,
+        import_id: UUID,
+        status: str,
+        total_entries: int,
+        processed_entries: int,
+        imported: int,
+        failed: int,
+        errors: List[str],
+    ) -> None:
+        self.db.execute(
+            update(ImageImportModel)
+            .where(ImageImportModel.id == import_id)
+            .values(
+                status=status,
+                total_entries=total_entries,
+                processed_entries=processed_entries,
+                imported=imported,
+                failed=failed,
+                errors=errors,
+                finished_at=datetime.utcnow() if status in (IMPORT_DONE, IMPORT_FAILED) else None,
+            )
+        )
+        self.db.commit()
+
+    @staticmethod
+    def _to_entity(model: ImageImportModel) -> ImageImport:
+        return ImageImport(
+            id=model.id,
+            user_id=model.user_id,
+            archive_key=model.archive_key,
+            status=model.status,
+            total_entries=model.total_entries,
+            processed_entries=model.processed_entries,
+            imported=model.imported,
+            failed=model.failed,
+            errors=list(model.errors or []),
+            created_at=model.created_at,
+            finished_at=model.finished_at,
+        )
@@ -1,11 +1,16 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import Float, case, cast, delete, func, insert, literal, or_, select, tuple_, update
 from sqlalchemy.orm import Session
+from collections import defaultdict
+import io
 from datetime import datetime
 
 from domain.entities.image_entity import Image
+from domain.entities.storage_usage import StorageUsage
 from domain.repositories.image_repository import ImageRepository
 from infrastructure.db.models.image_model import ImageModel
+from infrastructure.db.models.user_model import UserModel
 from infrastructure.mappers.image_mapper import ImageMapper
 
 
@@ -15,9 +20,34 @@ class ImageRepositoryImpl(ImageRepository):
     def __init__(self, db_session: Session):
         self.db = db_session
 
+    def _apply_collection_change(
+        self,
+        user_id: UUID,
+        live_images: int = 0,
+        live_bytes: int = 0,
+        trashed_images: int = 0,
+        trashed_bytes: int = 0,
+    ) -> None:
+        """
+        Invalida el ETag de las listas del usuario y ajusta sus contadores de almacenamiento
+        con una sola UPDATE por PK (se confirma en el mismo commit que el cambio de la imagen)
+        """
+        self.db.execute(
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(
+                images_version=UserModel.images_version + 1,
+                live_images_count=UserModel.live_images_count + live_images,
+                live_images_bytes=UserModel.live_images_bytes + live_bytes,
+                trashed_images_count=UserModel.trashed_images_count + trashed_images,
+                trashed_images_bytes=UserModel.trashed_images_bytes + trashed_bytes,
+            )
+        )
+
     def save(self, image: Image) -> Image:
         image_model = ImageMapper.to_model(image)
         self.db.add(image_model)
+        self._apply_collection_change(image.user_id, live_images=1, live_bytes=image.size_bytes)
         self.db.commit()
         self.db.refresh(image_model)
         return ImageMapper.to_entity(image_model)
@@ -33,6 +63,11 @@ class ImageRepositoryImpl(ImageRepository):
     def delete(self, image_id: UUID) -> None:
         image_model = self.db.query(ImageModel).filter(ImageModel.id == image_id).first()
         if image_model:
+            size = image_model.size_bytes or 0
+            if image_model.is_deleted:
+                self._apply_collection_change(image_model.user_id, trashed_images=-1, trashed_bytes=-size)
+            else:
+                self._apply_collection_change(image_model.user_id, live_images=-1, live_bytes=-size)
             self.db.delete(image_model)
             self.db.commit()
 
@@ -54,11 +89,13 @@ class ImageRepositoryImpl(ImageRepository):
 
 
     def soft_delete(self, image_id: UUID) -> bool:
-        model = self.db.query(ImageModel).filter(ImageModel.id == image_id).first()
-        if not model:
-            return False
-        model.is_deleted = True
-        model.deleted_at = datetime.utcnow()
+        # UPDATE condicional: de dos peticiones simultáneas sólo una cambia la fila y ajusta los contadores
+        row = self._set_deleted(image_id, deleted=True)
+        if row is None:
+            # No existía o ya estaba en la papelera (entonces no se vuelve a contar)
+            return self.db.query(ImageModel.id).filter(ImageModel.id == image_id).first() is not None
+        user_id, size = row
+        self._apply_collection_change(user_id, live_images=-1, live_bytes=-size, trashed_images=1, trashed_bytes=size)
         self.db.commit()
         return True
     
@@ -72,12 +109,24 @@ class ImageRepositoryImpl(ImageRepository):
         return [ImageMapper.to_entity(m) for m in models]
 
     
-    def restore(self, image_id: UUID) -> None:
-        model = self.db.query(ImageModel).filter(ImageModel.id == image_id).first()
-        if model:
-            model.is_deleted = False
-            model.deleted_at = None
-            self.db.commit()
+    def restore(self, image_id: UUID) -> bool:
+        row = self._set_deleted(image_id, deleted=False)
+        if row is None:
+            return False
+        user_id, size = row
+        self._apply_collection_change(user_id, live_images=1, live_bytes=size, trashed_images=-1, trashed_bytes=-size)
+        self.db.commit()
+        return True
+
+    def _set_deleted(self, image_id: UUID, deleted: bool):
+        """Cambia is_deleted sólo si tenía el valor contrario. Devuelve (user_id, size_bytes) o None si no cambió nada"""
+        row = self.db.execute(
+            update(ImageModel)
+            .where(ImageModel.id == image_id, ImageModel.is_deleted == (not deleted))
+            .values(is_deleted=deleted, deleted_at=datetime.utcnow() if deleted else None)
+            .returning(ImageModel.user_id, ImageModel.size_bytes)
+        ).first()
+        return None if row is None else (row.user_id, row.size_bytes or 0)
 
     
     def find_deleted_before(self, date: datetime) -> List[Image]:
@@ -91,5 +140,216 @@ class ImageRepositoryImpl(ImageRepository):
 
 
     def hard_delete(self, image_id: UUID):
-        self.db.query(ImageModel).filter(ImageModel.id == image_id).delete()
+        # RETURNING nos da el dueño, el tamaño y el estado sin una SELECT previa
+        row = self.db.execute(
+            delete(ImageModel)
+            .where(ImageModel.id == image_id)
+            .returning(ImageModel.user_id, ImageModel.size_bytes, ImageModel.is_deleted)
+        ).first()
+        if row is not None:
+            size = row.size_bytes or 0
+            if row.is_deleted:
+                self._apply_collection_change(row.user_id, trashed_images=-1, trashed_bytes=-size)
+            else:
+                self._apply_collection_change(row.user_id, live_images=-1, live_bytes=-size)
+        self.db.commit()
+
+
+    def list_rows_by_user_id(self, user_id: UUID, deleted: bool = False) -> List[Dict[str, Any]]:
+        """Consulta sólo las columnas que expone la API y las devuelve como diccionarios"""
+        # Al seleccionar columnas en vez de ImageModel, SQLAlchemy no crea objetos ORM ni los registra en la sesión
+        rows = (
+            self.db.query(*ImageMapper.RESPONSE_COLUMNS)
+            .filter(ImageModel.user_id == user_id, ImageModel.is_deleted == deleted)
+            .all()
+        )
+        return [ImageMapper.row_to_response(row) for row in rows]
+
+    def iter_rows_by_user_id(self, user_id: UUID, deleted: bool = False, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Recorre las imágenes con un cursor de servidor: en memoria sólo hay un lote de filas a la vez"""
+        query = (
+            self.db.query(*ImageMapper.RESPONSE_COLUMNS)
+            .filter(ImageModel.user_id == user_id, ImageModel.is_deleted == deleted)
+            .execution_options(stream_results=True)  # psycopg usa un cursor con nombre (server-side)
+            .yield_per(batch_size)
+        )
+        for row in query:
+            yield ImageMapper.row_to_response(row)
+
+    def list_ids_by_user_id(self, user_id: UUID, deleted: bool = False) -> List[UUID]:
+        """Sólo los ids, en orden de subida: una consulta corta cuyo resultado se puede usar con la sesión ya cerrada"""
+        return list(
+            self.db.scalars(
+                select(ImageModel.id)
+                .where(ImageModel.user_id == user_id, ImageModel.is_deleted == deleted)
+                .order_by(ImageModel.created_at, ImageModel.id)
+            )
+        )
+
+    def list_rows_by_ids(self, image_ids: List[UUID], deleted: bool = False) -> List[Dict[str, Any]]:
+        """Filas de las imágenes indicadas (búsqueda por PK) en el orden de image_ids; las que ya no están se omiten"""
+        if not image_ids:
+            return []
+        rows = (
+            self.db.query(*ImageMapper.RESPONSE_COLUMNS)
+            .filter(ImageModel.id.in_(image_ids), ImageModel.is_deleted == deleted)
+            .all()
+        )
+        by_id = {row.id: ImageMapper.row_to_response(row) for row in rows}
+        return [by_id[image_id] for image_id in image_ids if image_id in by_id]
+
+    def get_storage_usage(self, user_id: UUID) -> StorageUsage:
+        """Lee los contadores mantenidos en users (una búsqueda por PK)"""
+        row = (
+            self.db.query(
+                UserModel.live_images_count,
+                UserModel.live_images_bytes,
+                UserModel.trashed_images_count,
+                UserModel.trashed_images_bytes,
+            )
+            .filter(UserModel.id == user_id)
+            .first()
+        )
+        if not row:
+            return StorageUsage(user_id=user_id)
+        return StorageUsage(
+            user_id=user_id,
+            live_images=row.live_images_count,
+            live_bytes=row.live_images_bytes,
+            trashed_images=row.trashed_images_count,
+            trashed_bytes=row.trashed_images_bytes,
+        )
+
+    def set_placeholder(self, image_id: UUID, placeholder: str) -> None:
+        user_id = self.db.execute(
+            update(ImageModel)
+            .where(ImageModel.id == image_id)
+            .values(placeholder=placeholder)
+            .returning(ImageModel.user_id)
+        ).scalar_one_or_none()
+        if user_id is not None:
+            # Las listas cambian (ahora llevan placeholder): nuevo ETag, mismos contadores
+            self._apply_collection_change(user_id)
+        self.db.commit()
+
+    def update_caption(self, image_id: UUID, caption: Optional[str], hashtags: Optional[str]) -> None:
+        user_id = self.db.execute(
+            update(ImageModel)
+            .where(ImageModel.id == image_id)
+            .values(caption=caption, hashtags=hashtags)
+            .returning(ImageModel.user_id)
+        ).scalar_one_or_none()
+        if user_id is not None:
+            # Los listados devuelven caption/hashtags: nuevo ETag
+            self._apply_collection_change(user_id)
         self.db.commit()
+
+    def iter_captions(self, batch_size: int = 1000) -> Iterator[Tuple[Optional[str], Optional[str]]]:
+        query = (
+            self.db.query(ImageModel.caption, ImageModel.hashtags)
+            .filter(ImageModel.hashtags.isnot(None), ImageModel.is_deleted == False)
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
+        for row in query:
+            yield row.caption, row.hashtags
+
+    def iter_file_names(self, batch_size: int = 1000) -> Iterator[str]:
+        query = (
+            self.db.query(ImageModel.file_name)
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
+        for row in query:
+            yield row.file_name
+
+    def search_rows(
+        self,
+        user_id: UUID,
+        query: str,
+        limit: int,
+        after: Optional[Tuple[float, UUID]] = None,
+        similarity_threshold: float = 0.3,
+    ) -> List[Dict[str, Any]]:
+        text = query.lower()
+        pattern = "%" + text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        contains = ImageModel.search_text.like(pattern, escape="\\")
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            # Umbral de similitud sólo para esta transacción
+            self.db.execute(
+                select(func.set_config("pg_trgm.word_similarity_threshold", str(similarity_threshold), True))
+            )
+            # "q <% texto" (word_similarity) y LIKE '%q%' se resuelven con el índice GIN de trigramas
+            matches = or_(literal(text).op("<%")(ImageModel.search_text), contains)
+            # float8 en ambos lados: el rank del cursor tiene que compararse exactamente igual que se calculó
+            rank = cast(
+                case((contains, 1.0), else_=func.word_similarity(text, ImageModel.search_text)),
+                Float(precision=53),
+            )
+        else:
+            # Otros motores (pruebas): sólo coincidencia por subcadena
+            matches = contains
+            rank = cast(literal(1.0), Float(precision=53))
+
+        q = (
+            self.db.query(*ImageMapper.RESPONSE_COLUMNS, rank.label("rank"))
+            .filter(ImageModel.user_id == user_id, ImageModel.is_deleted == False, matches)
+        )
+        if after is not None:
+            q = q.filter(tuple_(rank, ImageModel.id) < tuple_(literal(after[0]), literal(after[1], ImageModel.id.type)))
+        rows = q.order_by(rank.desc(), ImageModel.id.desc()).limit(limit).all()
+        return [ImageMapper.row_to_response(row) for row in rows]
+
+    # Columnas que se rellenan en una importación (el resto toman su valor por defecto o son NULL)
+    BULK_COLUMNS = (
+        "id", "user_id", "file_name", "original_name", "url", "created_at", "is_deleted",
+        "size_bytes", "width", "height", "format", "content_type", "taken_at",
+    )
+
+    def bulk_save(self, images: List[Image]) -> None:
+        if not images:
+            return
+        rows = [tuple(getattr(image, column) for column in self.BULK_COLUMNS) for image in images]
+        if self.db.get_bind().dialect.name == "postgresql":
+            # COPY: las filas viajan en un solo flujo, sin una sentencia (ni un round trip) por fila
+            buffer = io.StringIO()
+            for row in rows:
+                buffer.write("\t".join(_copy_value(value) for value in row) + "\n")
+            buffer.seek(0)
+            cursor = self.db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(f"COPY images ({', '.join(self.BULK_COLUMNS)}) FROM STDIN", buffer)
+            finally:
+                cursor.close()
+        else:
+            # Otros motores (pruebas): INSERT de varias filas
+            self.db.execute(insert(ImageModel), [dict(zip(self.BULK_COLUMNS, row)) for row in rows])
+
+        # Contadores: una UPDATE por usuario, no por imagen
+        per_user = defaultdict(lambda: [0, 0])
+        for image in images:
+            per_user[image.user_id][0] += 1
+            per_user[image.user_id][1] += image.size_bytes or 0
+        for user_id, (count, size) in per_user.items():
+            self._apply_collection_change(user_id, live_images=count, live_bytes=size)
+        self.db.commit()
+
+    def existing_ids(self, image_ids: List[UUID]) -> List[UUID]:
+        if not image_ids:
+            return []
+        return [row.id for row in self.db.query(ImageModel.id).filter(ImageModel.id.in_(image_ids)).all()]
+
+
+# Formato de texto de COPY: \N es NULL y los separadores dentro de un valor se escapan
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value).translate(_COPY_ESCAPES)
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from domain.entities.job import Job, JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from domain.repositories.job_repository import JobRepository
+from infrastructure.db.models.job_model import JobModel
+
+
+class JobRepositoryImpl(JobRepository):
+    """Cola de trabajos sobre Postgres: los workers reservan filas con SELECT ... FOR UPDATE SKIP LOCKED"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def enqueue(self, job: Job) -> Job:
+        model = JobModel(
+            job_type=job.job_type,
+            payload=job.payload,
+            priority=job.priority,
+            max_attempts=job.max_attempts,
+            run_at=job.run_at or datetime.utcnow(),
+        )
+        self.db.add(model)
+        self.db.commit()
+        self.db.refresh(model)
+        return self._to_entity(model)
+
+    def enqueue_many(self, jobs: List[Job]) -> None:
+        if not jobs:
+            return
+        now = datetime.utcnow()
+        self.db.execute(insert(JobModel), [
+            {
+                "job_type": job.job_type,
+                "payload": job.payload,
+                "priority": job.priority,
+                "max_attempts": job.max_attempts,
+                "run_at": job.run_at or now,
+            }
+            for job in jobs
+        ])
+        self.db.commit()
+
+    def claim(self, job_type: str, worker_id: str, limit: int, visibility_timeout: int,
+              max_running: Optional[int] = None) -> List[Job]:
+        now = datetime.utcnow()
+        try:
+            if max_running is not None:
+                if self.db.get_bind().dialect.name == "postgresql":
+                    # Serializa las reservas de este tipo entre todos los workers para que el recuento de
+                    # trabajos en curso sea exacto. Es un lock de transacción: se libera con el commit
+                    self.db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"jobs:{job_type}"))))
+                running = (
+                    self.db.query(func.count(JobModel.id))
+                    .filter(
+                        JobModel.job_type == job_type,
+                        JobModel.status == JOB_RUNNING,
+                        JobModel.locked_until > now,
+                    )
+                    .scalar()
+                )
+                limit = min(limit, max_running - running)
+                if limit <= 0:
+                    self.db.rollback()
+                    return []
+
+            ready = or_(
+                and_(JobModel.status == JOB_QUEUED, JobModel.run_at <= now),
+                # Trabajo de un worker que murió o se colgó: caducó su plazo de visibilidad y vuelve a estar disponible
+                and_(
+                    JobModel.status == JOB_RUNNING,
+                    JobModel.locked_until <= now,
+                    JobModel.attempts < JobModel.max_attempts,
+                ),
+            )
+            # SKIP LOCKED: las filas que otro worker está reservando en este momento se saltan en vez de esperar
+            models = (
+                self.db.query(JobModel)
+                .filter(JobModel.job_type == job_type, ready)
+                .order_by(JobModel.priority.desc(), JobModel.run_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for model in models:
+                model.status = JOB_RUNNING
+                model.locked_by = worker_id
+                model.locked_until = now + timedelta(seconds=visibility_timeout)
+                model.attempts += 1
+            self.db.commit()
+            return [self._to_entity(model) for model in models]
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def complete(self, job: Job) -> bool:
+        return self._update_owned(job, status=JOB_DONE, finished_at=datetime.utcnow(), locked_by=None, locked_until=None)
+
+    def fail(self, job: Job, error: str, retry_at: Optional[datetime]) -> bool:
+        if retry_at is not None:
+            values = dict(status=JOB_QUEUED, run_at=retry_at)
+        else:
+            values = dict(status=JOB_FAILED, finished_at=datetime.utcnow())
+        return self._update_owned(job, last_error=error, locked_by=None, locked_until=None, **values)
+
+    def extend(self, job: Job, visibility_timeout: int) -> bool:
+        return self._update_owned(job, locked_until=datetime.utcnow() + timedelta(seconds=visibility_timeout))
+
+    def _update_owned(self, job: Job, **values) -> bool:
+        """
+        UPDATE sólo si la reserva sigue siendo de este worker: mismo locked_by y mismo número de intento
+        (si el plazo caducó y el trabajo se volvió a reservar, aunque sea el mismo proceso, attempts cambió)
+        """
+        result = self.db.execute(
+            update(JobModel)
+            .where(
+                JobModel.id == job.id,
+                JobModel.status == JOB_RUNNING,
+                JobModel.locked_by == job.locked_by,
+                JobModel.attempts == job.attempts,
+            )
+            .values(**values)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def fail_expired(self) -> int:
+        now = datetime.utcnow()
+        result = self.db.execute(
+            update(JobModel)
+            .where(
+                JobModel.status == JOB_RUNNING,
+                JobModel.locked_until <= now,
+                JobModel.attempts >= JobModel.max_attempts,
+            )
+            .values(status=JOB_FAILED, finished_at=now, last_error="Plazo de visibilidad agotado")
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def delete_finished_before(self, date: datetime) -> int:
+        result = self.db.execute(
+            delete(JobModel).where(JobModel.status.in_((JOB_DONE, JOB_FAILED)), JobModel.finished_at < date)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def _to_entity(model: JobModel) -> Job:
+        return Job(
+            id=model.id,
+            job_type=model.job_type,
+            payload=model.payload or {},
+            priority=model.priority,
+            max_attempts=model.max_attempts,
+            run_at=model.run_at,
+            status=model.status,
+            attempts=model.attempts,
+            locked_by=model.locked_by,
+            locked_until=model.locked_until,
+            last_error=model.last_error,
+            created_at=model.created_at,
+            finished_at=model.finished_at,
+        )
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 import uuid
 
 from domain.entities.user_entity import User
@@ -43,6 +43,22 @@ class UserRepositoryImpl(UserRepository):
         self.session.query(UserModel).filter_by(id=user_id).delete()
         self.session.commit()
 
+    def iter_rows(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        # Sólo las columnas públicas (nunca el hash de la contraseña), leídas con un cursor de servidor
+        query = (
+            self.session.query(
+                UserModel.id,
+                UserModel.username,
+                UserModel.email,
+                UserModel.is_admin,
+                UserModel.created_at,
+            )
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
+        for row in query:
+            yield dict(row._mapping)
+
     def _to_entity(self, user_model: UserModel) -> User:   # Método privado para convertir el modelo en entidad
         return User(
             id=user_model.id,
@@ -51,4 +67,5 @@ class UserRepositoryImpl(UserRepository):
             password=user_model.password,
             is_admin=user_model.is_admin,
             created_at=user_model.created_at,
+            images_version=user_model.images_version or 0,
         )
@@ -0,0 +1,45 @@
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+
+class DailyUploadsDTO(BaseModel):
+    day: date
+    uploads: int
+    uploaded_bytes: int
+    active_users: int
+
+
+class ActiveUsersDTO(BaseModel):
+    days: int
+    active_users: int  # usuarios distintos con alguna subida en el periodo
+
+
+class StorageSnapshotDTO(BaseModel):
+    day: date
+    live_images: int
+    live_bytes: int
+    trashed_images: int
+    trashed_bytes: int
+
+
+class TopStorageUserDTO(BaseModel):
+    rank: int
+    user_id: UUID
+    username: str
+    live_bytes: int
+    trashed_bytes: int
+    total_bytes: int
+
+
+class AnalyticsOverviewDTO(BaseModel):
+    approx_users: int
+    approx_images: int
+    active_users_last_30_days: int
+    refreshed_at: Optional[datetime] = None
+
+
+class UploadsPerDayResponseDTO(BaseModel):
+    refreshed_at: Optional[datetime] = None
+    days: List[DailyUploadsDTO]
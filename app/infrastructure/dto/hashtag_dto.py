@@ -0,0 +1,42 @@
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class HashtagSuggestRequestDTO(BaseModel):
+    """DTO para pedir sugerencias de hashtags para un texto (y opcionalmente una imagen propia)"""
+    caption: str = Field(..., max_length=2200)  # límite de caption de Instagram
+    image_id: Optional[UUID] = None  # si se indica, se usan sus metadatos (fecha de captura)
+    platform: Optional[str] = None  # instagram, tiktok, x... (fija el número de hashtags por defecto)
+    limit: Optional[int] = Field(None, ge=1, le=30)
+
+
+class HashtagSuggestionDTO(BaseModel):
+    tag: str
+    score: float
+    source: str
+
+
+class HashtagSuggestResponseDTO(BaseModel):
+    hashtags: List[HashtagSuggestionDTO]
+
+
+class HashtagBatchRequestDTO(BaseModel):
+    """DTO para pedir sugerencias de varias publicaciones en una sola petición"""
+    items: List[HashtagSuggestRequestDTO]
+
+
+class HashtagBatchResponseDTO(BaseModel):
+    results: List[HashtagSuggestResponseDTO]  # en el mismo orden que items
+
+
+class ImageHashtagsUpdateDTO(BaseModel):
+    """DTO para guardar el caption y los hashtags elegidos para una imagen"""
+    caption: Optional[str] = Field(None, max_length=2200)
+    hashtags: List[str] = []
+
+
+class ImageHashtagsResponseDTO(BaseModel):
+    image_id: UUID
+    caption: Optional[str] = None
+    hashtags: List[str]
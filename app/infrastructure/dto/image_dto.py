@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -9,6 +9,13 @@ class ImageCreateDTO(BaseModel):
     file_name: str
     url: str
     user_id: UUID
+    size_bytes: int = 0
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    content_type: Optional[str] = None
+    taken_at: Optional[datetime] = None
+    original_name: Optional[str] = None
 
 
 class ImageResponseDTO(BaseModel):
@@ -19,3 +26,46 @@ class ImageResponseDTO(BaseModel):
     url: str
     created_at: Optional[datetime]
     is_deleted: bool = False
+    size_bytes: int = 0
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    content_type: Optional[str] = None
+    taken_at: Optional[datetime] = None
+    placeholder: Optional[str] = None  # data URI para mostrar mientras carga la imagen
+    caption: Optional[str] = None
+    hashtags: Optional[str] = None
+    original_name: Optional[str] = None
+
+
+class StorageUsageResponseDTO(BaseModel):
+    """DTO con el uso de almacenamiento del usuario"""
+    live_images: int
+    live_bytes: int
+    trashed_images: int
+    trashed_bytes: int
+    total_bytes: int
+    quota_bytes: Optional[int] = None
+
+
+class ImageImportResponseDTO(BaseModel):
+    """Estado de una importación desde ZIP (se consulta hasta que status sea done o failed)"""
+    id: UUID
+    status: str
+    total_entries: int
+    processed_entries: int
+    imported: int
+    failed: int
+    errors: List[str]
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class ImageSearchResultDTO(ImageResponseDTO):
+    rank: float  # relevancia (0-1): similitud de trigramas; 1 si el texto aparece tal cual
+
+
+class ImageSearchResponseDTO(BaseModel):
+    """Página de resultados de búsqueda; next_cursor se pasa como ?cursor= para pedir la siguiente"""
+    items: List[ImageSearchResultDTO]
+    next_cursor: Optional[str] = None
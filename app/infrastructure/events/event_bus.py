@@ -0,0 +1,76 @@
+import asyncio
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Dict, Optional, Set
+from uuid import UUID
+
+from config import settings
+
+RESYNC_EVENT = {"type": "resync", "data": {}}
+
+
+class TooManySubscriptions(Exception):
+    pass
+
+
+class EventBus:
+    """
+    Pub/sub en proceso para las conexiones SSE: cada conexión abierta tiene su cola y los eventos se
+    reparten por usuario. Se puede publicar desde cualquier hilo (rutas síncronas, listener de Postgres);
+    la entrega a las colas se hace siempre en el event loop.
+    """
+
+    def __init__(self, queue_size: int = 100, max_per_user: int = settings.sse_max_connections_per_user):
+        self.queue_size = queue_size
+        self.max_per_user = max_per_user
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._lock = Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, user_id: UUID) -> asyncio.Queue:
+        """Se llama desde el event loop al abrir una conexión SSE"""
+        self._loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            queues = self._subscribers[str(user_id)]
+            if self.max_per_user and len(queues) >= self.max_per_user:
+                raise TooManySubscriptions()
+            queues.add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: UUID, queue: asyncio.Queue) -> None:
+        with self._lock:
+            queues = self._subscribers.get(str(user_id))
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[str(user_id)]
+
+    def dispatch(self, user_id: UUID, event: Dict[str, Any]) -> None:
+        """Entrega un evento a las conexiones del usuario en este proceso (si no tiene ninguna, no hace nada)"""
+        with self._lock:
+            queues = list(self._subscribers.get(str(user_id), ()))
+        if queues and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._deliver, queues, event)
+
+    def broadcast(self, event: Dict[str, Any]) -> None:
+        """Entrega un evento a todas las conexiones del proceso"""
+        with self._lock:
+            queues = [queue for user_queues in self._subscribers.values() for queue in user_queues]
+        if queues and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._deliver, queues, event)
+
+    @staticmethod
+    def _deliver(queues, event: Dict[str, Any]) -> None:
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Cliente demasiado lento: se descartan sus eventos pendientes y se le pide que recargue
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC_EVENT)
+
+
+# Instancia compartida por proceso
+event_bus = EventBus()
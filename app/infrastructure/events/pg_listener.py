@@ -0,0 +1,98 @@
+import logging
+import select
+from threading import Event, Thread
+from typing import Optional
+
+import orjson
+
+from config import settings
+from infrastructure.events.event_bus import RESYNC_EVENT, EventBus, event_bus
+from infrastructure.events.publisher import CHANNEL
+
+POLL_SECONDS = 5
+MAX_BACKOFF_SECONDS = 30
+
+
+class PostgresEventListener:
+    """
+    Hilo con una conexión dedicada que hace LISTEN y reparte las notificaciones en el EventBus del proceso.
+    Una sola conexión por proceso de la API, independientemente de cuántos clientes SSE tenga abiertos.
+    """
+
+    def __init__(self, bus: EventBus, channel: str = CHANNEL):
+        self.bus = bus
+        self.channel = channel
+        self._stop = Event()
+        self._thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        self._thread = Thread(target=self._run, name="pg-event-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        backoff = 1
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                self._listen(resync=connected_before)
+            except Exception as e:
+                logging.warning(f"❌ Listener de eventos desconectado, reintentando en {backoff}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+            else:
+                backoff = 1
+            connected_before = True
+
+    def _listen(self, resync: bool) -> None:
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(
+            host=settings.postgres_host,
+            port=settings.postgres_port,
+            user=settings.postgres_user,
+            password=settings.postgres_password,
+            dbname=settings.postgres_db,
+        )
+        try:
+            conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+            if resync:
+                # Mientras estuvo desconectado se pudieron perder eventos: los clientes recargan
+                self.bus.broadcast(RESYNC_EVENT)
+            while not self._stop.is_set():
+                if select.select([conn], [], [], POLL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._dispatch(conn.notifies.pop(0).payload)
+        finally:
+            conn.close()
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            message = orjson.loads(payload)
+            self.bus.dispatch(message["user_id"], message["event"])
+        except Exception as e:
+            logging.warning(f"❌ Notificación de evento no válida: {e}")
+
+
+_listener: Optional[PostgresEventListener] = None
+
+
+def start_event_listener() -> None:
+    global _listener
+    if _listener is None:
+        _listener = PostgresEventListener(event_bus)
+        _listener.start()
+
+
+def stop_event_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
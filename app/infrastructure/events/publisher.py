@@ -0,0 +1,39 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import orjson
+from sqlalchemy import text
+
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.events.event_bus import event_bus
+
+CHANNEL = "user_events"
+# NOTIFY admite hasta 8000 bytes por mensaje; si los datos no caben se envía el evento sin ellos
+MAX_NOTIFY_BYTES = 7900
+
+
+def publish_event(user_id: UUID, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Publica un evento para las conexiones SSE del usuario. Con Postgres va por NOTIFY, así lo reciben
+    todos los procesos de la API (incluido este) aunque se publique desde el worker o el scheduler;
+    con otros motores (pruebas) se entrega sólo en este proceso.
+    Nunca lanza: un evento perdido no debe hacer fallar la operación que lo generó.
+    """
+    event = {"type": event_type, "data": data or {}, "at": datetime.utcnow().isoformat()}
+    db = SessionLocal()
+    try:
+        if db.get_bind().dialect.name != "postgresql":
+            event_bus.dispatch(user_id, event)
+            return
+        payload = orjson.dumps({"user_id": str(user_id), "event": event}, default=str)
+        if len(payload) > MAX_NOTIFY_BYTES:
+            event["data"] = {}
+            payload = orjson.dumps({"user_id": str(user_id), "event": event})
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload.decode()})
+        db.commit()
+    except Exception as e:
+        logging.warning(f"❌ No se pudo publicar el evento {event_type}: {e}")
+    finally:
+        db.close()
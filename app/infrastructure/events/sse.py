@@ -0,0 +1,8 @@
+from typing import Any, Dict
+
+import orjson
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Un evento en formato text/event-stream: el tipo va en `event:` y los datos en JSON en `data:`"""
+    return f"event: {event['type']}\ndata: {orjson.dumps(event, default=str).decode()}\n\n"
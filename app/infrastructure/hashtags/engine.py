@@ -0,0 +1,339 @@
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime
+from threading import Lock, Thread
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import settings
+from domain.entities.hashtag_suggestion import HashtagSuggestion
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
+from infrastructure.hashtags.vocabulary import (
+    DEFAULT_LIMIT,
+    KEYWORD_TAGS,
+    PLATFORM_LIMITS,
+    SEASON_TAGS,
+    STOPWORDS,
+)
+
+WORD_RE = re.compile(r"[a-z0-9ñ]+")
+HASHTAG_RE = re.compile(r"#\w+", re.UNICODE)
+
+# Pesos de cada fuente de sugerencias
+VOCABULARY_WEIGHT = 1.0
+INDEX_WEIGHT = 0.8
+EMBEDDING_WEIGHT = 0.6
+SEASON_WEIGHT = 0.4
+KEYWORD_AS_TAG_WEIGHT = 0.3
+
+
+def normalize(text: str) -> str:
+    """Minúsculas y sin tildes (la ñ se conserva) para comparar palabras"""
+    text = text.lower().replace("ñ", "\0")
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return text.replace("\0", "ñ")
+
+
+def tokenize(text: str) -> List[str]:
+    return [w for w in WORD_RE.findall(normalize(HASHTAG_RE.sub(" ", text or ""))) if len(w) >= 3 and w not in STOPWORDS]
+
+
+def extract_hashtags(text: str) -> List[str]:
+    return [tag.lower() for tag in HASHTAG_RE.findall(text or "")]
+
+
+def _count_documents(documents: Iterable[Tuple[Optional[str], Optional[str]]]) -> Tuple[Dict[str, Counter], Counter, int]:
+    """Recuentos que aportan unos (caption, hashtags): palabra -> Counter(hashtag), popularidad y documentos"""
+    updates: Dict[str, Counter] = defaultdict(Counter)
+    popularity: Counter = Counter()
+    count = 0
+    for caption, hashtags in documents:
+        tags = extract_hashtags(hashtags or "") + extract_hashtags(caption or "")
+        if not tags:
+            continue
+        for word in set(tokenize(caption or "")):
+            updates[word].update(tags)
+        popularity.update(tags)
+        count += 1
+    return updates, popularity, count
+
+
+def season_of(date: datetime) -> str:
+    # Hemisferio norte
+    return {12: "winter", 1: "winter", 2: "winter", 3: "spring", 4: "spring", 5: "spring",
+            6: "summer", 7: "summer", 8: "summer"}.get(date.month, "autumn")
+
+
+class HashtagEngine:
+    """
+    Motor de sugerencia de hashtags 100% CPU:
+    - vocabulario precalculado (palabra clave -> hashtags),
+    - índice invertido construido con los captions/hashtags que ya han usado los usuarios
+      (palabra -> cuántas veces apareció junto a cada hashtag),
+    - opcionalmente, un modelo local de embeddings para relacionar palabras que no están en el vocabulario.
+    Los resultados se cachean por hash del contenido; la caché se invalida sola al cambiar el índice.
+
+    El índice es de cada proceso: al guardar hashtags sólo se actualiza el del worker que atendió la
+    petición, y rebuild() (cada hashtag_index_refresh_seconds) lo rehace desde la base de datos para
+    que todos los workers converjan.
+    """
+
+    def __init__(self, embedder=None, cache_size: int = 10_000):
+        self.embedder = embedder
+        self.cache_size = cache_size
+        self._index: Dict[str, Counter] = {}  # palabra -> Counter(hashtag)
+        self._tag_popularity: Counter = Counter()
+        self._generation = 0  # cambia con cada actualización del índice (forma parte de la clave de caché)
+        self._index_lock = Lock()
+        self._cache: "OrderedDict[str, List[HashtagSuggestion]]" = OrderedDict()
+        self._cache_lock = Lock()
+        self._vocabulary_tags = sorted({tag for tags in KEYWORD_TAGS.values() for tag in tags})
+        self._vocabulary_vectors = None  # se calculan la primera vez que se usa el embedder
+
+    # -------------------
+    # Índice invertido
+    # -------------------
+    def index_documents(self, documents: Iterable[Tuple[Optional[str], Optional[str]]]) -> int:
+        """Añade (caption, hashtags) al índice. Devuelve cuántos documentos se indexaron"""
+        updates, popularity, count = _count_documents(documents)
+        if count:
+            self._apply(updates, popularity)
+        return count
+
+    def replace_document(
+        self, previous: Tuple[Optional[str], Optional[str]], current: Tuple[Optional[str], Optional[str]]
+    ) -> None:
+        """
+        Cambia el caption/hashtags de una publicación ya indexada: resta lo que aportaba antes y suma lo nuevo.
+        Guardar lo mismo otra vez no cambia nada (no se cuenta dos veces ni sube la popularidad de sus hashtags)
+        """
+        if previous == current:
+            return
+        removed, removed_popularity, _ = _count_documents([previous])
+        updates, popularity, _ = _count_documents([current])
+        for word, tags in removed.items():
+            updates[word].subtract(tags)
+        popularity.subtract(removed_popularity)
+        self._apply(updates, popularity)
+
+    def rebuild(self, documents: Iterable[Tuple[Optional[str], Optional[str]]]) -> int:
+        """Rehace el índice entero (fuera del lock) y lo sustituye de una vez. Devuelve cuántos documentos tiene"""
+        updates, popularity, count = _count_documents(documents)
+        with self._index_lock:
+            self._index = dict(updates)
+            self._tag_popularity = popularity
+            self._generation += 1
+        return count
+
+    def _apply(self, updates: Dict[str, Counter], popularity: Counter) -> None:
+        with self._index_lock:
+            # Copy-on-write: las peticiones que están puntuando leen los Counter sin lock,
+            # así que nunca se modifican en sitio; se sustituye cada uno por una copia actualizada
+            for word, tags in updates.items():
+                merged = Counter(self._index.get(word, ()))
+                merged.update(tags)
+                merged = +merged  # sin recuentos a cero o negativos (hashtags que ya no usa nadie)
+                if merged:
+                    self._index[word] = merged
+                else:
+                    self._index.pop(word, None)
+            merged_popularity = Counter(self._tag_popularity)
+            merged_popularity.update(popularity)
+            self._tag_popularity = +merged_popularity
+            self._generation += 1
+
+    # -------------------
+    # Sugerencias
+    # -------------------
+    def suggest(
+        self,
+        caption: str,
+        platform: Optional[str] = None,
+        limit: Optional[int] = None,
+        taken_at: Optional[datetime] = None,
+    ) -> List[HashtagSuggestion]:
+        return self.suggest_batch([(caption, platform, limit, taken_at)])[0]
+
+    def suggest_batch(
+        self, requests: List[Tuple[str, Optional[str], Optional[int], Optional[datetime]]]
+    ) -> List[List[HashtagSuggestion]]:
+        """
+        Resuelve varias peticiones de una vez: las repetidas (mismo hash de contenido) se calculan
+        una sola vez y, si hay modelo de embeddings, todas las palabras desconocidas se codifican en un único lote.
+        """
+        keys = [self._cache_key(*request) for request in requests]
+        results: Dict[str, List[HashtagSuggestion]] = {}
+        pending: Dict[str, Tuple] = {}
+        for key, request in zip(keys, requests):
+            cached = self._cache_get(key)
+            if cached is not None:
+                results[key] = cached
+            elif key not in pending:
+                pending[key] = request
+
+        if pending:
+            embedding_scores = self._embedding_scores([tokenize(request[0]) for request in pending.values()])
+            for (key, request), extra in zip(pending.items(), embedding_scores):
+                suggestions = self._score(*request, extra_scores=extra)
+                self._cache_put(key, suggestions)
+                results[key] = suggestions
+
+        return [results[key] for key in keys]
+
+    def _score(self, caption, platform, limit, taken_at, extra_scores=None) -> List[HashtagSuggestion]:
+        limit = limit or PLATFORM_LIMITS.get((platform or "").lower(), DEFAULT_LIMIT)
+        words = tokenize(caption)
+        already_used = set(extract_hashtags(caption))
+        scores: Counter = Counter()
+        sources: Dict[str, str] = {}
+
+        def add(tag: str, score: float, source: str):
+            if tag in already_used:
+                return
+            scores[tag] += score
+            if tag not in sources or score > 0.5:
+                sources[tag] = source
+
+        for word in words:
+            for position, tag in enumerate(KEYWORD_TAGS.get(word, ())):
+                add(tag, VOCABULARY_WEIGHT / (1 + 0.25 * position), "vocabulary")
+
+            postings = self._index.get(word)
+            if postings:
+                total = sum(postings.values())
+                for tag, count in postings.most_common(20):
+                    add(tag, INDEX_WEIGHT * count / total, "index")
+
+            add(f"#{word}", KEYWORD_AS_TAG_WEIGHT, "keyword")
+
+        for tag, score in (extra_scores or {}).items():
+            add(tag, EMBEDDING_WEIGHT * score, "embedding")
+
+        if taken_at:
+            for tag in SEASON_TAGS[season_of(taken_at)]:
+                add(tag, SEASON_WEIGHT, "season")
+
+        # Desempate por popularidad global del hashtag
+        ranked = sorted(scores.items(), key=lambda item: (item[1], self._tag_popularity[item[0]]), reverse=True)
+        return [HashtagSuggestion(tag=tag, score=round(score, 4), source=sources[tag]) for tag, score in ranked[:limit]]
+
+    # -------------------
+    # Embeddings (opcional)
+    # -------------------
+    def _embedding_scores(self, batches: List[List[str]]) -> List[Dict[str, float]]:
+        """Relaciona las palabras que no están en el vocabulario con los hashtags del vocabulario más cercanos"""
+        empty = [{} for _ in batches]
+        if self.embedder is None:
+            return empty
+        unknown = sorted({word for words in batches for word in words if word not in KEYWORD_TAGS})
+        if not unknown:
+            return empty
+        try:
+            # Vectores unitarios: el producto escalar es la similitud coseno y el umbral de 0.5 no depende del modelo
+            if self._vocabulary_vectors is None:
+                self._vocabulary_vectors = self.embedder.encode(
+                    [tag.lstrip("#") for tag in self._vocabulary_tags], normalize_embeddings=True
+                )
+            word_vectors = dict(zip(unknown, self.embedder.encode(unknown, normalize_embeddings=True)))
+        except Exception as e:
+            logging.warning(f"❌ Embeddings no disponibles, se sigue sin ellos: {e}")
+            return empty
+
+        results = []
+        for words in batches:
+            scores: Dict[str, float] = {}
+            for word in words:
+                vector = word_vectors.get(word)
+                if vector is None:
+                    continue
+                similarities = self._vocabulary_vectors @ vector  # similitud coseno en [-1, 1]
+                for i in similarities.argsort()[-3:]:
+                    if similarities[i] > 0.5:
+                        tag = self._vocabulary_tags[i]
+                        scores[tag] = max(scores.get(tag, 0.0), float(similarities[i]))
+            results.append(scores)
+        return results
+
+    # -------------------
+    # Caché por hash de contenido
+    # -------------------
+    def _cache_key(self, caption, platform, limit, taken_at) -> str:
+        content = f"{self._generation}|{normalize(caption or '')}|{platform or ''}|{limit or ''}|{taken_at.month if taken_at else ''}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[List[HashtagSuggestion]]:
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, key: str, value: List[HashtagSuggestion]) -> None:
+        with self._cache_lock:
+            self._cache[key] = value
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+# -------------------
+# Instancia compartida por proceso
+# -------------------
+_engine: Optional[HashtagEngine] = None
+_engine_lock = Lock()
+
+
+def _load_embedder(model_name: str):
+    if not model_name:
+        return None
+    try:
+        from sentence_transformers import SentenceTransformer  # dependencia opcional
+    except ImportError:
+        logging.warning("❌ sentence-transformers no está instalado: el generador de hashtags funciona sin embeddings")
+        return None
+    return SentenceTransformer(model_name, device="cpu")
+
+
+def _build_index(engine: HashtagEngine) -> int:
+    db = SessionLocal()
+    try:
+        return engine.rebuild(ImageRepositoryImpl(db).iter_captions())
+    finally:
+        db.close()
+
+
+def _keep_index_fresh(engine: HashtagEngine) -> None:
+    """Construye el índice al arrancar y lo rehace cada hashtag_index_refresh_seconds"""
+    first = True
+    while True:
+        try:
+            count = _build_index(engine)
+            if first:
+                print(f"✅ Índice de hashtags construido con {count} publicaciones")
+        except Exception as e:
+            logging.warning(f"❌ No se pudo construir el índice de hashtags: {e}")
+        first = False
+        if settings.hashtag_index_refresh_seconds <= 0:
+            return
+        time.sleep(settings.hashtag_index_refresh_seconds)
+
+
+def get_hashtag_engine() -> HashtagEngine:
+    """
+    Devuelve el motor del proceso. La primera llamada lo crea y lanza en segundo plano la carga del índice
+    desde la base de datos (y su reconstrucción periódica); mientras tanto las sugerencias salen sólo del vocabulario.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                engine = HashtagEngine(
+                    embedder=_load_embedder(settings.hashtag_embedding_model),
+                    cache_size=settings.hashtag_cache_size,
+                )
+                Thread(target=_keep_index_fresh, args=(engine,), name="hashtag-index", daemon=True).start()
+                _engine = engine
+    return _engine
@@ -0,0 +1,111 @@
+# Vocabulario precalculado: palabra clave (normalizada como normalize(): sin tildes pero con ñ) -> hashtags relacionados.
+# Es la fuente "en frío" de sugerencias: funciona aunque todavía no haya captions de usuarios en el índice.
+KEYWORD_TAGS = {
+    # Viajes / lugares
+    "playa": ["#playa", "#beach", "#verano", "#mar"],
+    "beach": ["#beach", "#playa", "#summer", "#sea"],
+    "mar": ["#mar", "#sea", "#ocean", "#playa"],
+    "montaña": ["#montaña", "#mountains", "#hiking", "#naturaleza"],
+    "mountain": ["#mountains", "#hiking", "#nature", "#adventure"],
+    "viaje": ["#viaje", "#travel", "#wanderlust", "#viajar"],
+    "travel": ["#travel", "#wanderlust", "#travelgram", "#explore"],
+    "ciudad": ["#ciudad", "#city", "#urban", "#streetphotography"],
+    "city": ["#city", "#urban", "#cityscape", "#streetphotography"],
+    "atardecer": ["#atardecer", "#sunset", "#goldenhour", "#cielo"],
+    "sunset": ["#sunset", "#goldenhour", "#sky", "#atardecer"],
+    "amanecer": ["#amanecer", "#sunrise", "#goodmorning"],
+    "naturaleza": ["#naturaleza", "#nature", "#landscape", "#paisaje"],
+    "nature": ["#nature", "#naturephotography", "#landscape", "#outdoors"],
+    "paisaje": ["#paisaje", "#landscape", "#naturaleza"],
+    "nieve": ["#nieve", "#snow", "#invierno", "#winter"],
+    "bosque": ["#bosque", "#forest", "#naturaleza"],
+    # Comida
+    "comida": ["#comida", "#food", "#foodie", "#instafood"],
+    "food": ["#food", "#foodie", "#instafood", "#yummy"],
+    "cafe": ["#cafe", "#coffee", "#coffeetime", "#coffeelover"],
+    "coffee": ["#coffee", "#coffeetime", "#coffeelover", "#cafe"],
+    "receta": ["#receta", "#recipe", "#homemade", "#cocina"],
+    "cocina": ["#cocina", "#cooking", "#homemade", "#foodie"],
+    "postre": ["#postre", "#dessert", "#sweet", "#foodporn"],
+    "pizza": ["#pizza", "#pizzalover", "#food"],
+    "vino": ["#vino", "#wine", "#winelover"],
+    "brunch": ["#brunch", "#breakfast", "#foodie"],
+    # Personas / estilo de vida
+    "amigos": ["#amigos", "#friends", "#friendship", "#goodtimes"],
+    "friends": ["#friends", "#friendship", "#goodtimes", "#amigos"],
+    "familia": ["#familia", "#family", "#love"],
+    "family": ["#family", "#familytime", "#love"],
+    "boda": ["#boda", "#wedding", "#love", "#weddingday"],
+    "wedding": ["#wedding", "#weddingday", "#bride", "#love"],
+    "selfie": ["#selfie", "#me", "#portrait"],
+    "retrato": ["#retrato", "#portrait", "#portraitphotography"],
+    "moda": ["#moda", "#fashion", "#ootd", "#style"],
+    "fashion": ["#fashion", "#ootd", "#style", "#outfit"],
+    "outfit": ["#outfit", "#ootd", "#fashion", "#style"],
+    "gym": ["#gym", "#fitness", "#workout", "#fitnessmotivation"],
+    "fitness": ["#fitness", "#workout", "#fit", "#healthy"],
+    "yoga": ["#yoga", "#mindfulness", "#wellness"],
+    "running": ["#running", "#run", "#runner", "#fitness"],
+    "correr": ["#running", "#runner", "#correr"],
+    # Animales
+    "perro": ["#perro", "#dog", "#dogsofinstagram", "#puppy"],
+    "dog": ["#dog", "#dogsofinstagram", "#puppy", "#doglover"],
+    "gato": ["#gato", "#cat", "#catsofinstagram", "#catlover"],
+    "cat": ["#cat", "#catsofinstagram", "#catlover", "#kitten"],
+    "mascota": ["#mascota", "#pet", "#petsofinstagram"],
+    # Trabajo / tecnología
+    "trabajo": ["#trabajo", "#work", "#worklife", "#productividad"],
+    "oficina": ["#oficina", "#office", "#worklife"],
+    "codigo": ["#code", "#programming", "#developer", "#coding"],
+    "code": ["#code", "#coding", "#programming", "#developer"],
+    "python": ["#python", "#programming", "#coding", "#developer"],
+    "tecnologia": ["#tecnologia", "#tech", "#technology", "#innovation"],
+    "startup": ["#startup", "#entrepreneur", "#business"],
+    "emprendimiento": ["#emprendimiento", "#emprender", "#business", "#entrepreneur"],
+    "marketing": ["#marketing", "#digitalmarketing", "#socialmedia"],
+    # Ocio / arte
+    "musica": ["#musica", "#music", "#musician", "#live"],
+    "music": ["#music", "#musician", "#livemusic", "#musica"],
+    "concierto": ["#concierto", "#concert", "#livemusic"],
+    "arte": ["#arte", "#art", "#artist", "#artwork"],
+    "art": ["#art", "#artist", "#artwork", "#arte"],
+    "fotografia": ["#fotografia", "#photography", "#photooftheday"],
+    "photography": ["#photography", "#photooftheday", "#photographer"],
+    "libro": ["#libro", "#books", "#bookstagram", "#lectura"],
+    "book": ["#books", "#bookstagram", "#reading"],
+    "futbol": ["#futbol", "#football", "#soccer"],
+    "fiesta": ["#fiesta", "#party", "#goodvibes"],
+    "party": ["#party", "#goodvibes", "#fiesta"],
+    "navidad": ["#navidad", "#christmas", "#xmas"],
+    "christmas": ["#christmas", "#xmas", "#holidays"],
+    "cumpleaños": ["#cumpleaños", "#birthday", "#celebration"],
+    "birthday": ["#birthday", "#celebration", "#party"],
+}
+
+# Etiquetas por estación (se usan con la fecha EXIF de captura de la imagen)
+SEASON_TAGS = {
+    "winter": ["#invierno", "#winter"],
+    "spring": ["#primavera", "#spring"],
+    "summer": ["#verano", "#summer"],
+    "autumn": ["#otoño", "#autumn"],
+}
+
+# Palabras vacías (es/en) que nunca generan hashtags
+STOPWORDS = {
+    "el", "la", "los", "las", "un", "una", "unos", "unas", "de", "del", "al", "y", "o", "que", "en", "con",
+    "por", "para", "mi", "mis", "tu", "tus", "su", "sus", "es", "son", "muy", "mas", "pero", "este", "esta",
+    "esto", "estos", "estas", "hoy", "ayer", "como", "sin", "sobre", "entre", "nos", "les", "lo", "le", "se",
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "at", "for", "with", "my", "our", "your", "is",
+    "are", "was", "this", "that", "these", "those", "today", "very", "just", "from", "by", "it", "its",
+}
+
+# Límite recomendado de hashtags por plataforma
+PLATFORM_LIMITS = {
+    "instagram": 30,
+    "tiktok": 5,
+    "twitter": 3,
+    "x": 3,
+    "linkedin": 5,
+    "facebook": 5,
+}
+DEFAULT_LIMIT = 10
@@ -0,0 +1,17 @@
+import base64
+from typing import Any, List
+
+import orjson
+from fastapi import HTTPException
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Cursor opaco para paginación por clave (keyset): los valores de la última fila de la página"""
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        return orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor no válido")
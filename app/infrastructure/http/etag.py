@@ -0,0 +1,25 @@
+from typing import Optional
+
+from fastapi.responses import Response
+
+
+def collection_etag(user_id, version: int, collection: str) -> str:
+    """ETag fuerte de una colección de imágenes: cambia cada vez que se incrementa images_version"""
+    return f'"{collection}-{user_id}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comprueba la cabecera If-None-Match (puede traer varias etiquetas separadas por comas o '*')"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def cache_headers(etag: str) -> dict:
+    # private + no-cache: el navegador puede guardar la respuesta, pero debe revalidarla siempre con el ETag
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,37 @@
+from typing import Any, Dict, Iterable, Iterator, Literal, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+
+StreamFormat = Literal["ndjson", "json"]
+
+# Número de filas que se agrupan en cada trozo enviado al cliente (evita un write por fila)
+ROWS_PER_CHUNK = 500
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], fmt: StreamFormat) -> Iterator[bytes]:
+    """Codifica las filas de forma incremental: NDJSON (una por línea) o un array JSON"""
+    buffer = []
+    first = True
+    if fmt == "json":
+        yield b"["
+    for row in rows:
+        encoded = orjson.dumps(row)
+        if fmt == "ndjson":
+            buffer.append(encoded + b"\n")
+        else:
+            buffer.append(encoded if first else b"," + encoded)
+            first = False
+        if len(buffer) >= ROWS_PER_CHUNK:
+            yield b"".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield b"".join(buffer)
+    if fmt == "json":
+        yield b"]"
+
+
+def stream_rows(rows: Iterable[Dict[str, Any]], fmt: StreamFormat, headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Envía las filas según se van leyendo de la BD, sin construir la lista completa en memoria"""
+    media_type = "application/x-ndjson" if fmt == "ndjson" else "application/json"
+    return StreamingResponse(_chunks(rows, fmt), media_type=media_type, headers=headers)
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from PIL import Image as PILImage, UnidentifiedImageError
+
+# Etiquetas EXIF con la fecha de captura (DateTimeOriginal está en el sub-IFD Exif; DateTime en el IFD0)
+EXIF_IFD = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_DATETIME = 0x0132
+
+
+class ImageTooLargeError(ValueError):
+    """La cabecera declara más píxeles de los que Pillow acepta decodificar (posible decompression bomb)"""
+
+
+@dataclass(slots=True)
+class ImageMetadata:
+    """Datos de la imagen que se guardan junto a la fila para no tener que consultar MinIO después"""
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None
+    content_type: Optional[str] = None
+    taken_at: Optional[datetime] = None
+
+
+def extract_image_metadata(file_obj, fallback_content_type: Optional[str] = None) -> ImageMetadata:
+    """
+    Lee sólo la cabecera de la imagen (Pillow no decodifica los píxeles hasta que se le pide),
+    así que el coste no depende del tamaño del archivo. Deja el archivo en la posición original
+    para que después se pueda subir a S3 tal cual. Si no es una imagen reconocible devuelve
+    los metadatos vacíos en lugar de fallar; si declara dimensiones desorbitadas lanza ImageTooLargeError.
+    """
+    position = file_obj.tell()
+    try:
+        with PILImage.open(file_obj) as img:
+            return ImageMetadata(
+                width=img.width,
+                height=img.height,
+                format=img.format,
+                content_type=PILImage.MIME.get(img.format or "") or fallback_content_type,
+                taken_at=_exif_taken_at(img),
+            )
+    except PILImage.DecompressionBombError as e:
+        # No hereda de OSError/ValueError: sin esto una cabecera de 70 bytes que declara 40000x40000 daba un 500
+        raise ImageTooLargeError(str(e)) from e
+    except (UnidentifiedImageError, OSError, ValueError):
+        return ImageMetadata(content_type=fallback_content_type)
+    finally:
+        file_obj.seek(position)
+
+
+def _exif_taken_at(img) -> Optional[datetime]:
+    try:
+        exif = img.getexif()
+    except Exception:
+        return None
+    value = exif.get_ifd(EXIF_IFD).get(EXIF_DATETIME_ORIGINAL) or exif.get(EXIF_DATETIME)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value).strip("\x00 "), "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
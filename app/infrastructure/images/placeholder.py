@@ -0,0 +1,26 @@
+import base64
+import io
+
+from PIL import Image as PILImage, ImageOps
+
+# Lado mayor de la miniatura (px) y calidad WebP: el resultado ocupa ~100-300 bytes en base64
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_QUALITY = 40
+
+
+def build_placeholder(data) -> str:
+    """
+    Genera una vista previa diminuta (LQIP) como data URI, lista para usarse como `src`
+    o fondo difuminado mientras carga la imagen real.
+    `data` es un archivo binario o bytes con la imagen original.
+    """
+    source = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+    with PILImage.open(source) as img:
+        # En JPEG, draft() decodifica directamente a escala reducida (mucho más rápido que decodificar entero)
+        img.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        img = ImageOps.exif_transpose(img)  # respetar la orientación de la cámara
+        img = img.convert("RGB")
+        img.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE))
+        out = io.BytesIO()
+        img.save(out, "WEBP", quality=PLACEHOLDER_QUALITY)
+    return "data:image/webp;base64," + base64.b64encode(out.getvalue()).decode("ascii")
@@ -0,0 +1,29 @@
+from uuid import UUID
+
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
+from infrastructure.images.placeholder import build_placeholder
+from infrastructure.jobs.job_queue import enqueue_job
+from infrastructure.jobs.job_types import GENERATE_PLACEHOLDER
+from infrastructure.storage.object_storage import get_object_storage
+
+
+def generate_placeholder(image_id: UUID, file_name: str) -> None:
+    """Descarga la imagen, calcula el placeholder y lo guarda en la fila (lo ejecuta el worker de la cola)"""
+    db = SessionLocal()
+    try:
+        with get_object_storage().open(file_name) as body:
+            placeholder = build_placeholder(body.read())
+        ImageRepositoryImpl(db).set_placeholder(image_id, placeholder)
+    finally:
+        db.close()
+
+
+def schedule_placeholder_generation(image_id: UUID, file_name: str, user_id: UUID) -> None:
+    """
+    Encola el cálculo del placeholder de una imagen recién subida. Lo hace el worker (worker.py), así no
+    compite con las peticiones y no se pierde si la API se reinicia. Sin placeholder el frontend
+    simplemente muestra el hueco vacío como antes
+    """
+    # user_id: para avisar al usuario por /events cuando el placeholder esté listo
+    enqueue_job(GENERATE_PLACEHOLDER, {"image_id": str(image_id), "file_name": file_name, "user_id": str(user_id)})
@@ -0,0 +1,56 @@
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+from application.use_cases.image_use_cases.import_images_zip_use_case import ImportImagesZipUseCase
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.image_import_repository_impl import ImageImportRepositoryImpl
+from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
+from infrastructure.db.repositories.job_repository_impl import JobRepositoryImpl
+from infrastructure.events.publisher import publish_event
+from infrastructure.images.placeholder_worker import generate_placeholder
+from infrastructure.storage.object_storage import get_object_storage
+from infrastructure.jobs.job_types import GENERATE_PLACEHOLDER, IMPORT_IMAGES_ZIP, SEND_VERIFICATION_EMAIL
+from infrastructure.mail.email_service import EmailService
+
+
+# Cada handler recibe el payload del trabajo. Si lanza una excepción, el trabajo se reintenta con backoff.
+# La entrega es "al menos una vez" (un trabajo cuyo plazo de visibilidad caduca puede ejecutarse de nuevo),
+# así que los handlers deben poder repetirse sin efectos indeseados
+def _send_verification_email(payload: Dict[str, Any]) -> None:
+    EmailService().send_verification_email(payload["to_email"], payload["code"])
+
+
+def _generate_placeholder(payload: Dict[str, Any]) -> None:
+    generate_placeholder(UUID(payload["image_id"]), payload["file_name"])
+
+
+def _import_images_zip(payload: Dict[str, Any]) -> None:
+    db = SessionLocal()
+    try:
+        ImportImagesZipUseCase(
+            ImageRepositoryImpl(db),
+            ImageImportRepositoryImpl(db),
+            JobRepositoryImpl(db),
+            get_object_storage(),
+            on_progress=_publish_import_progress,
+        ).execute(UUID(payload["import_id"]))
+    finally:
+        db.close()
+
+
+def _publish_import_progress(image_import) -> None:
+    publish_event(image_import.user_id, "import.progress", {
+        "import_id": str(image_import.id),
+        "status": image_import.status,
+        "total_entries": image_import.total_entries,
+        "processed_entries": image_import.processed_entries,
+        "imported": image_import.imported,
+        "failed": image_import.failed,
+    })
+
+
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], None]] = {
+    SEND_VERIFICATION_EMAIL: _send_verification_email,
+    GENERATE_PLACEHOLDER: _generate_placeholder,
+    IMPORT_IMAGES_ZIP: _import_images_zip,
+}
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict
+
+from domain.entities.job import Job
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.job_repository_impl import JobRepositoryImpl
+from infrastructure.jobs.job_types import JOB_TYPES
+
+
+def new_job(job_type: str, payload: Dict[str, Any], delay_seconds: int = 0) -> Job:
+    """Crea un Job con la prioridad y los reintentos configurados para su tipo"""
+    config = JOB_TYPES[job_type]
+    return Job(
+        job_type=job_type,
+        payload=payload,
+        priority=config.priority,
+        max_attempts=config.max_attempts,
+        run_at=datetime.utcnow() + timedelta(seconds=delay_seconds) if delay_seconds else None,
+    )
+
+
+def enqueue_job(job_type: str, payload: Dict[str, Any], delay_seconds: int = 0) -> Job:
+    """Encola un trabajo con su propia sesión (para quien no tiene una a mano)"""
+    db = SessionLocal()
+    try:
+        return JobRepositoryImpl(db).enqueue(new_job(job_type, payload, delay_seconds))
+    finally:
+        db.close()
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+from config import settings
+
+# Tipos de trabajo
+SEND_VERIFICATION_EMAIL = "send_verification_email"
+GENERATE_PLACEHOLDER = "generate_placeholder"
+IMPORT_IMAGES_ZIP = "import_images_zip"
+
+
+@dataclass(frozen=True, slots=True)
+class JobTypeConfig:
+    max_concurrency: int  # trabajos de este tipo en curso a la vez, sumando todos los workers
+    priority: int = 0  # mayor = antes
+    max_attempts: int = 5
+    visibility_timeout: int = 300  # segundos que un worker tiene reservado el trabajo antes de que vuelva a la cola
+
+
+JOB_TYPES = {
+    # El usuario está esperando el código: prioridad alta y plazo corto (si el SMTP se cuelga, se reintenta pronto)
+    SEND_VERIFICATION_EMAIL: JobTypeConfig(
+        max_concurrency=settings.email_job_concurrency, priority=10, max_attempts=5, visibility_timeout=60
+    ),
+    GENERATE_PLACEHOLDER: JobTypeConfig(
+        max_concurrency=settings.placeholder_workers, priority=0, max_attempts=3, visibility_timeout=120
+    ),
+    # Trabajo largo: plazo amplio. Si se reintenta, continúa desde el último lote guardado sin duplicar imágenes
+    IMPORT_IMAGES_ZIP: JobTypeConfig(
+        max_concurrency=settings.import_job_concurrency, priority=-10, max_attempts=3, visibility_timeout=2 * 3600
+    ),
+}
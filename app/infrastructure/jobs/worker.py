@@ -0,0 +1,183 @@
+import os
+import random
+import signal
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+from config import settings
+from domain.entities.job import Job
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.job_repository_impl import JobRepositoryImpl
+from infrastructure.events.publisher import publish_event
+from infrastructure.jobs.job_types import JOB_TYPES, JobTypeConfig
+
+# Cada cuánto se dan por fallidos los trabajos abandonados que ya agotaron sus reintentos
+REAP_INTERVAL_SECONDS = 60
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff exponencial con jitter: 10s, 20s, 40s... hasta el máximo configurado"""
+    delay = min(settings.job_retry_base_seconds * 2 ** (attempts - 1), settings.job_retry_max_seconds)
+    return delay * random.uniform(0.5, 1.0)
+
+
+class JobWorker:
+    """
+    Proceso que consume la cola de trabajos. Por cada tipo tiene un pool de hilos del tamaño de su
+    max_concurrency y sólo reserva trabajos cuando le quedan hilos libres, así nunca tiene reservado
+    (con el plazo de visibilidad corriendo) un trabajo que no está ejecutando.
+    Mientras un trabajo se ejecuta, el bucle principal renueva su plazo de visibilidad al pasar la mitad;
+    si la reserva se perdió (el plazo caducó y otro worker lo reservó), su resultado se descarta.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, Callable[[Dict[str, Any]], None]],
+        job_types: Dict[str, JobTypeConfig] = JOB_TYPES,
+        poll_interval: float = settings.job_poll_interval,
+    ):
+        self.handlers = handlers
+        self.job_types = {name: job_types[name] for name in handlers}
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._executors = {
+            name: ThreadPoolExecutor(max_workers=config.max_concurrency, thread_name_prefix=f"job-{name}")
+            for name, config in self.job_types.items()
+        }
+        self._in_flight: Counter = Counter()
+        self._in_flight_lock = threading.Lock()
+        self._running: Dict[UUID, tuple] = {}  # id -> (trabajo, instante monotonic en que caduca su plazo)
+        self._stop = threading.Event()
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        print(f"👷 Worker {self.worker_id} escuchando: {', '.join(self.job_types)}")
+
+        last_reap = 0.0
+        while not self._stop.is_set():
+            claimed = self._claim_round()
+            self._extend_leases()
+            if time.monotonic() - last_reap > REAP_INTERVAL_SECONDS:
+                self._reap()
+                last_reap = time.monotonic()
+            if not claimed:
+                self._stop.wait(self.poll_interval)
+
+        # Parada ordenada: no se reservan más trabajos y se terminan los que están en curso
+        print("🛑 Worker parando, esperando a los trabajos en curso...")
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+    def _claim_round(self) -> int:
+        claimed = 0
+        for name, config in self.job_types.items():
+            with self._in_flight_lock:
+                free = config.max_concurrency - self._in_flight[name]
+            if free <= 0:
+                continue
+            db = SessionLocal()
+            try:
+                jobs = JobRepositoryImpl(db).claim(
+                    name, self.worker_id, free, config.visibility_timeout, max_running=config.max_concurrency
+                )
+            except Exception as e:
+                print(f"❌ Error reservando trabajos {name}: {e}")
+                jobs = []
+            finally:
+                db.close()
+
+            for job in jobs:
+                with self._in_flight_lock:
+                    self._in_flight[name] += 1
+                    self._running[job.id] = (job, time.monotonic() + config.visibility_timeout)
+                self._executors[name].submit(self._run_job, job)
+            claimed += len(jobs)
+        return claimed
+
+    def _run_job(self, job: Job) -> None:
+        db = SessionLocal()
+        try:
+            repo = JobRepositoryImpl(db)
+            try:
+                self.handlers[job.job_type](job.payload)
+            except Exception as e:
+                retry_at = None
+                if job.attempts < job.max_attempts:
+                    retry_at = datetime.utcnow() + timedelta(seconds=retry_delay(job.attempts))
+                print(f"❌ Trabajo {job.job_type} {job.id} falló (intento {job.attempts}/{job.max_attempts}): {e}")
+                if repo.fail(job, f"{type(e).__name__}: {e}", retry_at):
+                    self._notify(job, "job.retrying" if retry_at else "job.failed")
+                else:
+                    self._lost(job)
+            else:
+                if repo.complete(job):
+                    self._notify(job, "job.completed")
+                else:
+                    self._lost(job)
+        except Exception as e:
+            # No se pudo registrar el resultado: el plazo de visibilidad caducará y el trabajo volverá a la cola
+            print(f"❌ Error guardando el resultado del trabajo {job.id}: {e}")
+        finally:
+            db.close()
+            with self._in_flight_lock:
+                self._in_flight[job.job_type] -= 1
+                self._running.pop(job.id, None)
+
+    @staticmethod
+    def _lost(job: Job) -> None:
+        print(f"⚠️ Trabajo {job.job_type} {job.id}: la reserva caducó y la tiene otro worker, se descarta el resultado")
+
+    def _extend_leases(self) -> None:
+        """Renueva el plazo de los trabajos en curso a los que les queda menos de la mitad"""
+        now = time.monotonic()
+        with self._in_flight_lock:
+            due = [job for job, expires in self._running.values()
+                   if expires - now < self.job_types[job.job_type].visibility_timeout / 2]
+        if not due:
+            return
+        db = SessionLocal()
+        try:
+            repo = JobRepositoryImpl(db)
+            for job in due:
+                timeout = self.job_types[job.job_type].visibility_timeout
+                owned = repo.extend(job, timeout)
+                with self._in_flight_lock:
+                    if job.id in self._running:
+                        # Si se perdió la reserva no se vuelve a intentar: el resultado se descartará al terminar
+                        self._running[job.id] = (job, time.monotonic() + timeout if owned else float("inf"))
+                if not owned:
+                    self._lost(job)
+        except Exception as e:
+            print(f"❌ Error renovando el plazo de los trabajos en curso: {e}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _notify(job: Job, event_type: str) -> None:
+        # Sólo los trabajos que pertenecen a un usuario (llevan user_id en el payload) se avisan por /events
+        user_id = job.payload.get("user_id")
+        if user_id:
+            data = {"job_id": str(job.id), "job_type": job.job_type, "attempts": job.attempts}
+            data.update({key: value for key, value in job.payload.items() if key.endswith("_id") and key != "user_id"})
+            publish_event(user_id, event_type, data)
+
+    def _reap(self) -> None:
+        db = SessionLocal()
+        try:
+            failed = JobRepositoryImpl(db).fail_expired()
+            if failed:
+                print(f"🧹 Trabajos abandonados marcados como fallidos: {failed}")
+        except Exception as e:
+            print(f"❌ Error revisando trabajos caducados: {e}")
+        finally:
+            db.close()
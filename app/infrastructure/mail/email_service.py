@@ -1,15 +1,21 @@
 import smtplib
+import socket
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import os
+from config import settings
+from infrastructure.resilience.dependencies import SMTP, get_breaker, get_retry_budget
+from infrastructure.resilience.retry import call_with_retry
+
+# Errores transitorios que merece la pena reintentar en el momento (el resto los reintenta la cola con backoff)
+TRANSIENT_SMTP_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, socket.timeout, ConnectionError)
 
 
 class EmailService:
     def __init__(self):
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", 587))
-        self.smtp_user = os.getenv("SMTP_USER")
-        self.smtp_password = os.getenv("SMTP_PASSWORD")
+        self.smtp_server = settings.smtp_server
+        self.smtp_port = settings.smtp_port
+        self.smtp_user = settings.smtp_user
+        self.smtp_password = settings.smtp_password
 
     def send_verification_email(self, to_email: str, code: str):
         subject = "Verifica tu cuenta"
@@ -22,8 +28,17 @@ class EmailService:
         msg["Subject"] = subject
         msg.attach(MIMEText(body, "plain"))
 
-        # Conectar y enviar
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
+        # Conectar y enviar (con timeout: un servidor lento no puede bloquear el hilo indefinidamente)
+        call_with_retry(
+            lambda: self._send(msg),
+            get_breaker(SMTP),
+            get_retry_budget(SMTP),
+            attempts=2,
+            retry_on=TRANSIENT_SMTP_ERRORS,
+        )
+
+    def _send(self, msg) -> None:
+        with smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=settings.smtp_timeout) as server:
             server.starttls()
             server.login(self.smtp_user, self.smtp_password)
             server.send_message(msg)
@@ -0,0 +1,18 @@
+from domain.repositories.job_repository import JobRepository
+from infrastructure.jobs.job_queue import new_job
+from infrastructure.jobs.job_types import SEND_VERIFICATION_EMAIL
+from infrastructure.mail.email_service import EmailService
+
+
+class QueuedEmailService(EmailService):
+    """
+    Misma interfaz que EmailService, pero en vez de hablar con el SMTP durante la petición encola el envío.
+    El worker lo hace con reintentos (usa EmailService por debajo)
+    """
+
+    def __init__(self, job_repository: JobRepository):
+        super().__init__()
+        self.job_repository = job_repository
+
+    def send_verification_email(self, to_email: str, code: str):
+        self.job_repository.enqueue(new_job(SEND_VERIFICATION_EMAIL, {"to_email": to_email, "code": code}))
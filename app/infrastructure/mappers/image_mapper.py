@@ -6,6 +6,26 @@ from infrastructure.dto.image_dto import ImageCreateDTO, ImageResponseDTO
 class ImageMapper:
     """Convierte entre ImageModel (ORM) ↔ Image (entidad de dominio) ↔ DTO"""
 
+    # Columnas que se devuelven en los listados (mismos campos que ImageResponseDTO)
+    RESPONSE_COLUMNS = (
+        ImageModel.id,
+        ImageModel.user_id,
+        ImageModel.file_name,
+        ImageModel.url,
+        ImageModel.created_at,
+        ImageModel.is_deleted,
+        ImageModel.size_bytes,
+        ImageModel.width,
+        ImageModel.height,
+        ImageModel.format,
+        ImageModel.content_type,
+        ImageModel.taken_at,
+        ImageModel.placeholder,
+        ImageModel.caption,
+        ImageModel.hashtags,
+        ImageModel.original_name,
+    )
+
     # -------------------
     # ORM ↔ Entidad de dominio
     # -------------------
@@ -18,7 +38,17 @@ class ImageMapper:
             url=model.url,
             created_at=model.created_at,
             is_deleted=model.is_deleted,       
-            deleted_at=model.deleted_at
+            deleted_at=model.deleted_at,
+            size_bytes=model.size_bytes or 0,
+            width=model.width,
+            height=model.height,
+            format=model.format,
+            content_type=model.content_type,
+            taken_at=model.taken_at,
+            placeholder=model.placeholder,
+            caption=model.caption,
+            hashtags=model.hashtags,
+            original_name=model.original_name
         )
 
     @staticmethod
@@ -30,7 +60,17 @@ class ImageMapper:
             url=entity.url,
             created_at=entity.created_at,
             is_deleted=entity.is_deleted,    
-            deleted_at=entity.deleted_at
+            deleted_at=entity.deleted_at,
+            size_bytes=entity.size_bytes,
+            width=entity.width,
+            height=entity.height,
+            format=entity.format,
+            content_type=entity.content_type,
+            taken_at=entity.taken_at,
+            placeholder=entity.placeholder,
+            caption=entity.caption,
+            hashtags=entity.hashtags,
+            original_name=entity.original_name
         )
 
     # -------------------
@@ -44,7 +84,14 @@ class ImageMapper:
             user_id=dto.user_id,
             file_name=dto.file_name,
             url=dto.url,
-            created_at=None
+            created_at=None,
+            size_bytes=dto.size_bytes,
+            width=dto.width,
+            height=dto.height,
+            format=dto.format,
+            content_type=dto.content_type,
+            taken_at=dto.taken_at,
+            original_name=dto.original_name
         )
 
     @staticmethod
@@ -56,5 +103,23 @@ class ImageMapper:
             file_name=entity.file_name,
             url=entity.url,
             created_at=entity.created_at,
-            is_deleted=entity.is_deleted
+            is_deleted=entity.is_deleted,
+            size_bytes=entity.size_bytes,
+            width=entity.width,
+            height=entity.height,
+            format=entity.format,
+            content_type=entity.content_type,
+            taken_at=entity.taken_at,
+            placeholder=entity.placeholder,
+            caption=entity.caption,
+            hashtags=entity.hashtags,
+            original_name=entity.original_name
         )
+
+    # -------------------
+    # Fila SQL → respuesta (ruta rápida para listados)
+    # -------------------
+    @staticmethod
+    def row_to_response(row) -> dict:
+        """Convierte una fila de RESPONSE_COLUMNS en un dict con la forma de ImageResponseDTO, sin validar con pydantic"""
+        return dict(row._mapping)
@@ -0,0 +1,121 @@
+import random
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+
+from infrastructure.auth.auth_dependencies import is_admin_token
+from infrastructure.observability.profiler import (
+    FORMATS,
+    HTML,
+    RequestProfile,
+    profiling_available,
+    render,
+    save_profile,
+)
+from infrastructure.observability.query_stats import report_request, track_queries
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que cuenta las consultas SQL de cada petición (incluidas las de las respuestas en
+    streaming y las background tasks) y avisa de los patrones N+1. Con `server_timing` añade la cabecera
+    Server-Timing (db;dur=...) con las consultas hechas hasta enviar las cabeceras, visible en el navegador.
+    """
+
+    def __init__(self, app, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        with track_queries() as stats:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start" and stats.count:
+                    headers = list(message.get("headers", []))
+                    timing = f'db;dur={stats.total_ms:.1f};desc="{stats.count} consultas"'
+                    headers.append((b"server-timing", timing.encode()))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing if self.server_timing else send)
+            finally:
+                report_request(f"{scope['method']} {scope['path']}", stats)
+
+
+class ProfilingMiddleware:
+    """
+    Perfilado de peticiones con pyinstrument, sin redesplegar:
+    - bajo demanda: un admin añade la cabecera `X-Profile: html|speedscope` (o `?profile=html|speedscope`)
+      y recibe el perfil de esa petición en lugar de la respuesta. Si el token no es de un admin, la
+      petición sigue normal, sin perfilar,
+    - por muestreo: una fracción `sample_rate` de las peticiones se perfila y se guarda en settings.profile_dir.
+    """
+
+    def __init__(self, app, sample_rate: float = 0.0, sample_format: str = HTML):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.sample_format = sample_format if sample_format in FORMATS else HTML
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        output = await self._requested_output(scope)
+        sampled = output is None and self.sample_rate > 0 and random.random() < self.sample_rate
+        if (output is None and not sampled) or not profiling_available():
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile()
+        status = None
+
+        async def discard_response(message):
+            # Se perfila la petición completa pero al cliente se le devuelve el perfil
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send if output is None else discard_response)
+        finally:
+            session = profile.stop()
+
+        if output is None:
+            await run_in_threadpool(save_profile, session, self.sample_format, scope["method"], scope["path"])
+            return
+
+        content_type, _ = FORMATS[output]
+        body = (await run_in_threadpool(render, session, output)).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", content_type.encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"cache-control", b"no-store"),
+                (b"x-profiled-status", str(status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _requested_output(scope) -> Optional[str]:
+        """Formato pedido por la cabecera X-Profile o ?profile=, sólo si el token es de un admin"""
+        headers = dict(scope.get("headers", []))
+        requested = headers.get(b"x-profile", b"").decode("latin-1").strip().lower()
+        if not requested and b"profile=" in scope.get("query_string", b""):
+            requested = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [""])[0].lower()
+        if not requested:
+            return None
+
+        authorization = headers.get(b"authorization", b"").decode("latin-1")
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+        if not await run_in_threadpool(is_admin_token, token.strip()):
+            return None
+        return requested if requested in FORMATS else HTML
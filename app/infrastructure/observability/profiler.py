@@ -0,0 +1,110 @@
+"""
+Perfilado bajo demanda de peticiones con pyinstrument (va en requirements.txt para poder perfilar en
+producción sin redesplegar; si falta en algún entorno, la app funciona igual pero no se perfila nada).
+
+Los endpoints de la app son síncronos y FastAPI los ejecuta en el threadpool, donde un perfilador
+arrancado en el hilo del event loop no ve nada. Por eso ProfiledRoute envuelve cada endpoint síncrono:
+si la petición se está perfilando (contextvar que run_in_threadpool copia al hilo), arranca otro
+Profiler en ese hilo y su sesión se combina con la del event loop al terminar. Las dependencias
+síncronas (get_db, get_current_user) no se envuelven: su tiempo aparece como espera del threadpool.
+"""
+import functools
+import inspect
+import logging
+import os
+import re
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from fastapi.routing import APIRoute
+
+from config import settings
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+    from pyinstrument.session import Session
+except ImportError:  # entornos sin requirements.txt completo
+    Profiler = None
+
+HTML = "html"
+SPEEDSCOPE = "speedscope"
+FORMATS = {HTML: ("text/html; charset=utf-8", ".html"), SPEEDSCOPE: ("application/json", ".speedscope.json")}
+
+# Sesiones de los hilos del threadpool de la petición que se está perfilando (None = no se perfila)
+_thread_sessions: ContextVar[Optional[List]] = ContextVar("profile_sessions", default=None)
+_warned_missing = False
+
+
+def profiling_available() -> bool:
+    global _warned_missing
+    if Profiler is None and not _warned_missing:
+        _warned_missing = True
+        logging.warning("❌ pyinstrument no está instalado: el perfilado de peticiones está desactivado")
+    return Profiler is not None
+
+
+class RequestProfile:
+    """Perfil de una petición: un Profiler en el event loop más los de los hilos que ejecutan el endpoint"""
+
+    def __init__(self):
+        self.sessions: List = []
+        self.profiler = Profiler(interval=settings.profile_interval, async_mode="enabled")
+        self._token = None
+
+    def start(self) -> None:
+        self._token = _thread_sessions.set(self.sessions)
+        self.profiler.start()
+
+    def stop(self):
+        session = self.profiler.stop()
+        _thread_sessions.reset(self._token)
+        for thread_session in self.sessions:
+            session = Session.combine(session, thread_session)
+        return session
+
+
+def render(session, output: str) -> str:
+    renderer = SpeedscopeRenderer() if output == SPEEDSCOPE else HTMLRenderer()
+    return renderer.render(session)
+
+
+def save_profile(session, output: str, method: str, path: str) -> str:
+    """Guarda el perfil en settings.profile_dir y borra los más antiguos por encima de profile_max_files"""
+    os.makedirs(settings.profile_dir, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_")[:80] or "root"
+    name = f"{datetime.utcnow():%Y%m%d_%H%M%S_%f}_{method}_{slug}_{session.duration * 1000:.0f}ms{FORMATS[output][1]}"
+    file_path = os.path.join(settings.profile_dir, name)
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(render(session, output))
+
+    files = sorted(os.listdir(settings.profile_dir))
+    for old in files[: max(0, len(files) - settings.profile_max_files)]:
+        os.unlink(os.path.join(settings.profile_dir, old))
+    return file_path
+
+
+def _profile_in_thread(function: Callable) -> Callable:
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        sessions = _thread_sessions.get()
+        if sessions is None:
+            return function(*args, **kwargs)
+        profiler = Profiler(interval=settings.profile_interval, async_mode="disabled")
+        profiler.start()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            sessions.append(profiler.stop())
+
+    return wrapper
+
+
+class ProfiledRoute(APIRoute):
+    """APIRoute cuyos endpoints síncronos se pueden perfilar en el hilo del threadpool que los ejecuta"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if Profiler is not None and not inspect.iscoroutinefunction(endpoint) and not inspect.isgeneratorfunction(endpoint):
+            endpoint = _profile_in_thread(endpoint)
+        super().__init__(path, endpoint, **kwargs)
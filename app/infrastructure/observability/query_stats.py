@@ -0,0 +1,179 @@
+"""
+Estadísticas de las consultas SQL por petición, con los eventos de SQLAlchemy:
+- cada sentencia se cronometra; las que superan settings.db_slow_query_ms se registran con la forma
+  de sus parámetros (tipos y longitudes, nunca los valores: hay emails y hashes de contraseñas),
+- QueryStatsMiddleware abre un QueryStats por petición y al terminar avisa si la misma sentencia se repitió
+  más de settings.db_repeated_query_threshold veces (patrón N+1) o si se ejecutó dos veces la misma
+  consulta con los mismos parámetros (p. ej. get_by_id seguido de restore, que vuelve a leer la fila),
+- query_budget() comprueba en pruebas cuántas consultas hace un endpoint.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from config import settings
+
+MAX_LOGGED_STATEMENT = 500  # caracteres de la sentencia que se escriben en el log
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Consultas de una petición (o del bloque vigilado por query_budget)"""
+    count: int = 0
+    total_ms: float = 0.0
+    statements: Counter = field(default_factory=Counter)  # sentencia -> veces
+    executions: Counter = field(default_factory=Counter)  # (sentencia, parámetros) -> veces
+    slow: List[Tuple[str, float]] = field(default_factory=list)
+
+    def record(self, statement: str, parameters, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.statements[statement] += 1
+        self.executions[(statement, _hashable(parameters))] += 1
+        if elapsed_ms >= settings.db_slow_query_ms:
+            self.slow.append((statement, elapsed_ms))
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Sentencias ejecutadas más de `threshold` veces (candidatas a N+1)"""
+        return [(statement, times) for statement, times in self.statements.most_common() if times > threshold]
+
+    def duplicates(self) -> List[Tuple[str, int]]:
+        """Consultas idénticas (misma sentencia y mismos parámetros) ejecutadas más de una vez"""
+        return [(statement, times) for (statement, _), times in self.executions.most_common() if times > 1]
+
+
+# Estadísticas de la petición en curso (las copia run_in_threadpool, así que los endpoints síncronos también cuentan)
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Colectores globales de query_budget: ven las consultas de todos los hilos (TestClient ejecuta la app en otro)
+_collectors: List[QueryStats] = []
+_collectors_lock = Lock()
+
+
+def _hashable(parameters):
+    if isinstance(parameters, dict):
+        return tuple(sorted((key, _hashable(value)) for key, value in parameters.items()))
+    if isinstance(parameters, (list, tuple)):
+        return tuple(_hashable(value) for value in parameters)
+    try:
+        hash(parameters)
+        return parameters
+    except TypeError:
+        return repr(parameters)
+
+
+def bind_shape(parameters, executemany: bool = False) -> str:
+    """Forma de los parámetros sin sus valores: {'id_1': 'UUID', 'email_1': 'str(14)'}"""
+    if executemany and isinstance(parameters, (list, tuple)):
+        return f"{len(parameters)} x {bind_shape(parameters[0]) if parameters else '{}'}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"'{key}': {_value_shape(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(_value_shape(value) for value in parameters) + ")"
+    return _value_shape(parameters)
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (str, bytes)):
+        return f"{type(value).__name__}({len(value)})"
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _short(statement: str) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= MAX_LOGGED_STATEMENT else statement[:MAX_LOGGED_STATEMENT] + "..."
+
+
+# -------------------
+# Eventos del engine
+# -------------------
+def install_query_stats(engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+        if elapsed_ms >= settings.db_slow_query_ms:
+            logging.warning(
+                f"🐢 Consulta lenta ({elapsed_ms:.0f} ms): {_short(statement)} "
+                f"parámetros={bind_shape(parameters, executemany)}"
+            )
+        stats = _current.get()
+        if stats is not None:
+            stats.record(statement, parameters, elapsed_ms)
+        if _collectors:
+            with _collectors_lock:
+                for collector in _collectors:
+                    collector.record(statement, parameters, elapsed_ms)
+
+    @event.listens_for(engine, "handle_error")
+    def _discard_timer(context):
+        # La sentencia falló: after_cursor_execute no llega, se quita su instante de inicio
+        started = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+# -------------------
+# Por petición
+# -------------------
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Cuenta las consultas del contexto actual (petición o tarea) mientras dura el bloque"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def report_request(label: str, stats: QueryStats) -> None:
+    """Avisa de los patrones N+1 y de las consultas duplicadas de una petición"""
+    for statement, times in stats.repeated(settings.db_repeated_query_threshold):
+        logging.warning(f"🔁 {label}: la misma consulta se ejecutó {times} veces (¿N+1?): {_short(statement)}")
+    for statement, times in stats.duplicates():
+        logging.warning(f"♻️ {label}: consulta idéntica repetida {times} veces: {_short(statement)}")
+
+
+# -------------------
+# Pruebas
+# -------------------
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None, allow_duplicates: bool = False) -> Iterator[QueryStats]:
+    """
+    Falla (AssertionError) si el bloque hace más de `max_queries` consultas, repite una misma sentencia
+    más de `max_repeats` veces o, salvo allow_duplicates, ejecuta dos veces la misma consulta:
+
+        with query_budget(3):
+            client.get("/images/me")
+    """
+    stats = QueryStats()
+    with _collectors_lock:
+        _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _collectors_lock:
+            _collectors.remove(stats)
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} consultas (máximo {max_queries})")
+    if max_repeats is not None:
+        problems += [f"{times} veces: {_short(statement)}" for statement, times in stats.repeated(max_repeats)]
+    if not allow_duplicates:
+        problems += [f"duplicada {times} veces: {_short(statement)}" for statement, times in stats.duplicates()]
+    if problems:
+        listing = "\n".join(f"  {times} x {_short(statement)}" for statement, times in stats.statements.most_common())
+        raise AssertionError("Presupuesto de consultas superado: " + "; ".join(problems) + "\n" + listing)
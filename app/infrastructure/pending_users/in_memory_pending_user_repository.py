@@ -0,0 +1,104 @@
+import heapq
+import uuid
+from dataclasses import replace
+from datetime import datetime
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from domain.entities.pending_user import PendingUser
+from domain.repositories.pending_user_repository import PendingUserRepository
+
+
+class InMemoryPendingUserRepository(PendingUserRepository):
+    """
+    Registros pendientes en un diccionario del proceso, con caducidad propia.
+    Sirve para un único nodo con un solo proceso (uvicorn sin workers) y como sustituto local de Redis en pruebas.
+
+    Los caducados se eliminan de forma perezosa: un heap ordenado por expires_at se va vaciando por la cabeza
+    en cada escritura (coste proporcional a lo que caduca, nunca se recorre todo el almacén). Además se limita
+    el número de entradas para que una avalancha de registros de bots no haga crecer la memoria sin control.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._by_email: Dict[str, PendingUser] = {}
+        self._email_by_id: Dict[uuid.UUID, str] = {}
+        self._expiry_heap: List[Tuple[datetime, str]] = []  # (expires_at, email); puede tener entradas obsoletas
+        self._lock = Lock()
+
+    def create(self, pending_user: PendingUser) -> PendingUser:
+        now = datetime.utcnow()
+        entry = replace(pending_user, id=pending_user.id or uuid.uuid4())
+        with self._lock:
+            self._purge(now)
+            current = self._by_email.get(entry.email)
+            if current and current.expires_at > now:
+                # Igual que el UNIQUE(email) de la tabla
+                raise ValueError("Ya hay un registro pendiente con ese email")
+            if current:
+                self._remove(current)
+            while len(self._by_email) >= self.max_entries and self._expiry_heap:
+                # Se sacrifica el que antes iba a caducar
+                _, email = heapq.heappop(self._expiry_heap)
+                if email in self._by_email:
+                    self._remove(self._by_email[email])
+            self._store(entry)
+        return replace(entry)
+
+    def get_by_email_and_code(self, email: str, code: str) -> Optional[PendingUser]:
+        pending_user = self.get_by_email(email)
+        if pending_user and pending_user.verification_code == code and pending_user.expires_at > datetime.utcnow():
+            return pending_user
+        return None
+
+    def get_by_email(self, email: str) -> Optional[PendingUser]:
+        with self._lock:
+            pending_user = self._by_email.get(email)
+        # Se devuelve una copia: los casos de uso modifican la entidad antes de llamar a update
+        return replace(pending_user) if pending_user else None
+
+    def delete(self, pending_user_id: uuid.UUID) -> None:
+        with self._lock:
+            email = self._email_by_id.get(pending_user_id)
+            if email:
+                self._remove(self._by_email[email])
+
+    def delete_expired(self, now: datetime) -> int:
+        with self._lock:
+            return self._purge(now)
+
+    def update(self, pending_user: PendingUser) -> PendingUser:
+        with self._lock:
+            if pending_user.id not in self._email_by_id:
+                raise ValueError("Pending user not found")
+            current = self._by_email[self._email_by_id[pending_user.id]]
+            entry = replace(
+                current,
+                verification_code=pending_user.verification_code,
+                expires_at=pending_user.expires_at,
+            )
+            self._store(entry)
+        return replace(entry)
+
+    # -------------------
+    # Internos (se llaman con el lock tomado)
+    # -------------------
+    def _store(self, entry: PendingUser) -> None:
+        self._by_email[entry.email] = entry
+        self._email_by_id[entry.id] = entry.email
+        heapq.heappush(self._expiry_heap, (entry.expires_at, entry.email))
+
+    def _remove(self, entry: PendingUser) -> None:
+        self._by_email.pop(entry.email, None)
+        self._email_by_id.pop(entry.id, None)
+
+    def _purge(self, now: datetime) -> int:
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires_at, email = heapq.heappop(self._expiry_heap)
+            entry = self._by_email.get(email)
+            # Si se reenvió el código, la entrada tiene otra caducidad y esta posición del heap está obsoleta
+            if entry and entry.expires_at == expires_at:
+                self._remove(entry)
+                removed += 1
+        return removed
@@ -0,0 +1,31 @@
+from functools import lru_cache
+
+from sqlalchemy.orm import Session
+
+from domain.repositories.pending_user_repository import PendingUserRepository
+from infrastructure.db.repositories.pending_user_repository_impl import PendingUserRepositoryImpl
+from infrastructure.pending_users.in_memory_pending_user_repository import InMemoryPendingUserRepository
+from config import settings
+
+
+@lru_cache(maxsize=1)
+def _shared_store() -> PendingUserRepository:
+    # Una sola instancia por proceso: el almacén en memoria debe ser el mismo en todas las peticiones
+    if settings.pending_user_backend == "redis":
+        import redis  # dependencia opcional, sólo necesaria con varios nodos
+        from infrastructure.pending_users.redis_pending_user_repository import RedisPendingUserRepository
+
+        return RedisPendingUserRepository(redis.Redis.from_url(settings.redis_url))
+    return InMemoryPendingUserRepository()
+
+
+def build_pending_user_repository(db: Session) -> PendingUserRepository:
+    """Devuelve el almacén de registros pendientes configurado (pending_user_backend)"""
+    if settings.pending_user_backend == "database":
+        return PendingUserRepositoryImpl(db)
+    return _shared_store()
+
+
+def uses_periodic_cleanup() -> bool:
+    """Sólo la tabla necesita la limpieza periódica; memoria y Redis caducan solos"""
+    return settings.pending_user_backend == "database"
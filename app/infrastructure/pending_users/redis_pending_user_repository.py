@@ -0,0 +1,91 @@
+import hmac
+import json
+import math
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from domain.entities.pending_user import PendingUser
+from domain.repositories.pending_user_repository import PendingUserRepository
+
+
+class RedisPendingUserRepository(PendingUserRepository):
+    """
+    Registros pendientes compartidos en Redis para despliegues con varios nodos/workers.
+    Cada registro es una clave con TTL igual a su caducidad: Redis la borra solo, no hace falta limpieza periódica.
+    Recibe un cliente ya creado (redis.Redis o cualquier objeto con los mismos get/set/delete).
+    """
+
+    def __init__(self, client, prefix: str = "pending_user:"):
+        self.client = client
+        self.prefix = prefix
+
+    def create(self, pending_user: PendingUser) -> PendingUser:
+        entry = PendingUser(**{**_as_dict(pending_user), "id": pending_user.id or uuid.uuid4()})
+        ttl_ms = _ttl_ms(entry.expires_at)
+        # NX: igual que el UNIQUE(email) de la tabla (si el anterior caducó, Redis ya lo ha borrado)
+        if not self.client.set(self._email_key(entry.email), _dumps(entry), nx=True, px=ttl_ms):
+            raise ValueError("Ya hay un registro pendiente con ese email")
+        self.client.set(self._id_key(entry.id), entry.email, px=ttl_ms)
+        return entry
+
+    def get_by_email_and_code(self, email: str, code: str) -> Optional[PendingUser]:
+        pending_user = self.get_by_email(email)
+        if (
+            pending_user
+            and hmac.compare_digest(pending_user.verification_code, code)
+            and pending_user.expires_at > datetime.utcnow()
+        ):
+            return pending_user
+        return None
+
+    def get_by_email(self, email: str) -> Optional[PendingUser]:
+        raw = self.client.get(self._email_key(email))
+        return _loads(raw) if raw else None
+
+    def delete(self, pending_user_id: uuid.UUID) -> None:
+        email = self.client.get(self._id_key(pending_user_id))
+        if email:
+            email = email.decode() if isinstance(email, bytes) else email
+            self.client.delete(self._email_key(email), self._id_key(pending_user_id))
+
+    def delete_expired(self, now: datetime) -> int:
+        return 0  # Redis elimina las claves al vencer su TTL
+
+    def update(self, pending_user: PendingUser) -> PendingUser:
+        ttl_ms = _ttl_ms(pending_user.expires_at)
+        # XX: sólo si sigue existiendo; el TTL se renueva con la nueva caducidad
+        if not self.client.set(self._email_key(pending_user.email), _dumps(pending_user), xx=True, px=ttl_ms):
+            raise ValueError("Pending user not found")
+        self.client.set(self._id_key(pending_user.id), pending_user.email, px=ttl_ms)
+        return pending_user
+
+    def _email_key(self, email: str) -> str:
+        return f"{self.prefix}email:{email}"
+
+    def _id_key(self, pending_user_id: uuid.UUID) -> str:
+        return f"{self.prefix}id:{pending_user_id}"
+
+
+def _ttl_ms(expires_at: datetime) -> int:
+    return max(1, math.ceil((expires_at - datetime.utcnow()).total_seconds() * 1000))
+
+
+def _as_dict(pending_user: PendingUser) -> dict:
+    return {name: getattr(pending_user, name) for name in PendingUser.__slots__}
+
+
+def _dumps(pending_user: PendingUser) -> str:
+    data = _as_dict(pending_user)
+    data["id"] = str(data["id"])
+    data["created_at"] = data["created_at"].isoformat() if data["created_at"] else None
+    data["expires_at"] = data["expires_at"].isoformat()
+    return json.dumps(data)
+
+
+def _loads(raw) -> PendingUser:
+    data = json.loads(raw)
+    data["id"] = uuid.UUID(data["id"])
+    data["created_at"] = datetime.fromisoformat(data["created_at"]) if data["created_at"] else None
+    data["expires_at"] = datetime.fromisoformat(data["expires_at"])
+    return PendingUser(**data)
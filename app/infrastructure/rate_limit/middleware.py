@@ -0,0 +1,132 @@
+import json
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from infrastructure.rate_limit.token_bucket import TokenBucketStore
+
+# Tamaño máximo de cuerpo que se lee para sacar el email (los DTOs de auth son diminutos)
+MAX_BODY_FOR_EMAIL = 16 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """Bucket de `capacity` peticiones que se rellena entero cada `per_seconds` segundos"""
+    capacity: int
+    per_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.per_seconds
+
+
+@dataclass(frozen=True, slots=True)
+class RouteLimits:
+    """Límites de una ruta: por IP del cliente y, opcionalmente, por el email del cuerpo JSON"""
+    per_ip: Optional[RateLimitRule] = None
+    per_email: Optional[RateLimitRule] = None
+
+
+class RateLimitMiddleware:
+    """
+    Middleware ASGI de rate limiting con token buckets.
+    Sólo actúa sobre las rutas configuradas; el resto pasa sin coste. Las peticiones rechazadas
+    reciben un 429 antes de llegar al router (sin sesión de BD, sin bcrypt, sin SMTP).
+    """
+
+    def __init__(self, app, routes: Dict[Tuple[str, str], RouteLimits], store: TokenBucketStore, trust_forwarded: bool = False):
+        self.app = app
+        self.routes = routes
+        self.store = store
+        self.trust_forwarded = trust_forwarded
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        limits = self.routes.get((scope["method"], scope["path"]))
+        if limits is None:
+            return await self.app(scope, receive, send)
+
+        route_key = f"{scope['method']}:{scope['path']}"
+
+        if limits.per_ip:
+            retry_after = await self._consume(f"ip:{self._client_ip(scope)}:{route_key}", limits.per_ip)
+            if retry_after is not None:
+                return await self._reject(send, retry_after)
+
+        if limits.per_email:
+            body, complete = await self._read_body(receive)
+            email = self._extract_email(body) if complete else None
+            if email:
+                retry_after = await self._consume(f"email:{email}:{route_key}", limits.per_email)
+                if retry_after is not None:
+                    return await self._reject(send, retry_after)
+            receive = self._replay(body, receive, complete)
+
+        return await self.app(scope, receive, send)
+
+    async def _consume(self, key: str, rule: RateLimitRule) -> Optional[float]:
+        allowed, retry_after = await self.store.consume(key, rule.capacity, rule.refill_per_second)
+        return None if allowed else retry_after
+
+    def _client_ip(self, scope) -> str:
+        if self.trust_forwarded:
+            for name, value in scope.get("headers", []):
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _read_body(receive) -> Tuple[bytes, bool]:
+        """Lee el cuerpo hasta MAX_BODY_FOR_EMAIL; devuelve (bytes leídos, si el cuerpo está completo)"""
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                return b"".join(chunks), False
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks), True
+            if size > MAX_BODY_FOR_EMAIL:
+                return b"".join(chunks), False
+
+    @staticmethod
+    def _replay(body: bytes, receive, complete: bool):
+        """Devuelve un receive que entrega primero lo ya leído y luego sigue con el original"""
+        sent = False
+
+        async def replay_receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": not complete}
+            return await receive()
+
+        return replay_receive
+
+    @staticmethod
+    def _extract_email(body: bytes) -> Optional[str]:
+        try:
+            email = json.loads(body).get("email")
+        except (ValueError, AttributeError):
+            return None
+        return email.strip().lower() if isinstance(email, str) else None
+
+    @staticmethod
+    async def _reject(send, retry_after: float):
+        payload = b'{"detail":"Demasiadas peticiones, vuelve a intentarlo m\\u00e1s tarde"}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
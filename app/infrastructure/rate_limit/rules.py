@@ -0,0 +1,31 @@
+from infrastructure.rate_limit.middleware import RateLimitRule, RouteLimits
+from infrastructure.rate_limit.token_bucket import InMemoryTokenBucketStore, RedisTokenBucketStore, TokenBucketStore
+from config import settings
+
+# Límites por ruta de los endpoints caros (bcrypt y/o envío de email por SMTP)
+AUTH_RATE_LIMITS = {
+    ("POST", "/users/login"): RouteLimits(
+        per_ip=RateLimitRule(capacity=20, per_seconds=60),
+        per_email=RateLimitRule(capacity=5, per_seconds=60),
+    ),
+    ("POST", "/users/register-pending"): RouteLimits(
+        per_ip=RateLimitRule(capacity=5, per_seconds=60),
+        per_email=RateLimitRule(capacity=3, per_seconds=600),
+    ),
+    ("POST", "/users/resend-code"): RouteLimits(
+        per_ip=RateLimitRule(capacity=5, per_seconds=60),
+        per_email=RateLimitRule(capacity=3, per_seconds=600),
+    ),
+    ("POST", "/users/"): RouteLimits(
+        per_ip=RateLimitRule(capacity=5, per_seconds=60),
+    ),
+}
+
+
+def build_token_bucket_store() -> TokenBucketStore:
+    """Crea el almacén de buckets según la configuración"""
+    if settings.rate_limit_backend == "redis":
+        import redis.asyncio  # dependencia opcional, sólo necesaria con varios nodos
+
+        return RedisTokenBucketStore(redis.asyncio.Redis.from_url(settings.redis_url))
+    return InMemoryTokenBucketStore()
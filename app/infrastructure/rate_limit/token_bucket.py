@@ -0,0 +1,90 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Tuple
+
+
+class TokenBucketStore(ABC):
+    """
+    Puerto del almacén de token buckets (en proceso o compartido entre nodos).
+    Es asíncrono porque lo llama el middleware desde el event loop: un backend de red no puede bloquearlo
+    """
+
+    @abstractmethod
+    async def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> Tuple[bool, float]:
+        """
+        Intenta gastar `cost` tokens del bucket `key`.
+        Devuelve (permitido, segundos hasta que haya tokens suficientes si no se permite).
+        """
+        pass
+
+
+class InMemoryTokenBucketStore(TokenBucketStore):
+    """
+    Buckets en un diccionario del proceso. Sirve para un único nodo y como sustituto local
+    del backend compartido en pruebas. Se limita el número de claves (LRU) para que una
+    avalancha de IPs distintas no haga crecer la memoria sin control.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, último instante)
+        self._lock = Lock()
+
+    async def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> Tuple[bool, float]:
+        # Sin E/S y con un lock que sólo se mantiene unos microsegundos: se puede hacer en el event loop
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - last) * refill_per_second)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        if allowed:
+            return True, 0.0
+        return False, (cost - tokens) / refill_per_second
+
+
+# Script Lua: la lectura, el relleno y el consumo se hacen de forma atómica en Redis
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisTokenBucketStore(TokenBucketStore):
+    """
+    Buckets compartidos en Redis para despliegues con varios nodos/workers.
+    Recibe un cliente asíncrono ya creado (redis.asyncio.Redis o cualquier objeto con el mismo `eval`).
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def consume(self, key: str, capacity: int, refill_per_second: float, cost: int = 1) -> Tuple[bool, float]:
+        allowed, tokens = await self.client.eval(
+            _REDIS_TOKEN_BUCKET, 1, self.prefix + key, capacity, refill_per_second, cost, time.time()
+        )
+        if int(allowed) == 1:
+            return True, 0.0
+        return False, (cost - float(tokens)) / refill_per_second
@@ -0,0 +1,113 @@
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(HTTPException):
+    """La dependencia está marcada como caída: se falla al momento en vez de esperar a su timeout"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail=f"Servicio no disponible temporalmente ({name})",
+            headers={"Retry-After": str(max(1, int(retry_after)))},
+        )
+        self.name = name
+
+
+@dataclass(slots=True)
+class BreakerState:
+    name: str
+    state: str
+    consecutive_failures: int
+    opened_at: Optional[float]
+    last_error: Optional[str]
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por dependencia (Postgres, S3, SMTP):
+    - closed: las llamadas pasan; tras `failure_threshold` fallos seguidos se abre,
+    - open: todas las llamadas fallan al momento con CircuitOpenError durante `reset_timeout` segundos,
+    - half_open: pasado ese tiempo se deja pasar una llamada de prueba; si va bien se cierra, si falla se vuelve a abrir.
+    Así una dependencia caída no ocupa los hilos del threadpool esperando timeouts.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+    ):
+        self.name = name
+        # Qué errores indican que la dependencia falla (p. ej. un 404 de S3 no: el servicio respondió)
+        self.is_failure = is_failure or (lambda error: True)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_started_at = float("-inf")
+        self._last_error: Optional[str] = None
+        self._lock = Lock()
+
+    def before_call(self) -> None:
+        """Lanza CircuitOpenError si la llamada no debe intentarse"""
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if self._state == OPEN and elapsed >= self.reset_timeout:
+                self._state = HALF_OPEN
+                self._trial_started_at = float("-inf")
+            # Sólo una llamada de prueba a la vez (si no llegó a informar del resultado, otra pasado el plazo)
+            if self._state == HALF_OPEN and time.monotonic() - self._trial_started_at >= self.reset_timeout:
+                self._trial_started_at = time.monotonic()
+                return
+            raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+
+    def record_success(self) -> None:
+        if self._state == CLOSED and not self._failures:
+            return  # caso normal: sin lock (se llama en cada consulta)
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self, error: BaseException) -> None:
+        with self._lock:
+            self._failures += 1
+            self._last_error = f"{type(error).__name__}: {error}"[:300]
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def call(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        self.before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure(e)
+            else:
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def snapshot(self) -> BreakerState:
+        with self._lock:
+            state = self._state
+            if state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                state = HALF_OPEN  # la siguiente llamada será de prueba
+            return BreakerState(self.name, state, self._failures, self._opened_at, self._last_error)
@@ -0,0 +1,53 @@
+import smtplib
+import socket
+from typing import Dict
+
+from fastapi import HTTPException
+
+from config import settings
+from infrastructure.resilience.circuit_breaker import BreakerState, CircuitBreaker
+from infrastructure.resilience.retry import RetryBudget
+
+# Un breaker y un presupuesto de reintentos por dependencia externa, compartidos por todo el proceso
+POSTGRES = "postgres"
+STORAGE = "storage"
+SMTP = "smtp"
+
+
+def _storage_failure(error: BaseException) -> bool:
+    # Los 4xx de S3 (no existe, precondición...) y los errores de la propia petición no son caídas del servicio
+    if isinstance(error, (HTTPException, FileNotFoundError, ValueError)):
+        return False
+    status = getattr(error, "response", {}).get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return status is None or status >= 500
+
+
+def _smtp_failure(error: BaseException) -> bool:
+    # Un destinatario rechazado o un error de autenticación son respuestas del servidor, no una caída
+    return isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, socket.timeout, ConnectionError, socket.gaierror))
+
+
+def _breaker(name: str, is_failure=None) -> CircuitBreaker:
+    return CircuitBreaker(name, settings.breaker_failure_threshold, settings.breaker_reset_seconds, is_failure)
+
+
+_breakers: Dict[str, CircuitBreaker] = {
+    POSTGRES: _breaker(POSTGRES),
+    STORAGE: _breaker(STORAGE, _storage_failure),
+    SMTP: _breaker(SMTP, _smtp_failure),
+}
+_budgets: Dict[str, RetryBudget] = {
+    name: RetryBudget(settings.retry_budget_ratio, settings.retry_budget_min_per_second) for name in _breakers
+}
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    return _breakers[name]
+
+
+def get_retry_budget(name: str) -> RetryBudget:
+    return _budgets[name]
+
+
+def breaker_states() -> Dict[str, BreakerState]:
+    return {name: breaker.snapshot() for name, breaker in _breakers.items()}
@@ -0,0 +1,74 @@
+import random
+import time
+from threading import Lock
+from typing import Callable, Tuple, Type, TypeVar
+
+from infrastructure.resilience.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+T = TypeVar("T")
+
+
+class RetryBudget:
+    """
+    Limita los reintentos a una fracción de las llamadas (más un mínimo por segundo) en una ventana deslizante.
+    Si la dependencia está fallando para todos, los reintentos no multiplican la carga sobre ella.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, window_seconds: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.window_seconds = window_seconds
+        self._window_start = time.monotonic()
+        self._calls = 0
+        self._retries = 0
+        self._lock = Lock()
+
+    def _roll(self) -> None:
+        if time.monotonic() - self._window_start >= self.window_seconds:
+            self._window_start = time.monotonic()
+            self._calls = 0
+            self._retries = 0
+
+    def record_call(self) -> None:
+        with self._lock:
+            self._roll()
+            self._calls += 1
+
+    def try_spend(self) -> bool:
+        """True si queda presupuesto para un reintento (y lo consume)"""
+        with self._lock:
+            self._roll()
+            allowed = max(self.ratio * self._calls, self.min_per_second * self.window_seconds)
+            if self._retries >= allowed:
+                return False
+            self._retries += 1
+            return True
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """Backoff exponencial con jitter completo: aleatorio entre 0 y base * 2^(intento-1), con tope"""
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    breaker: CircuitBreaker,
+    budget: RetryBudget,
+    attempts: int = 3,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+) -> T:
+    """Llama a fn a través del breaker, reintentando los errores transitorios mientras quede presupuesto"""
+    budget.record_call()
+    attempt = 1
+    while True:
+        try:
+            return breaker.call(fn)
+        except CircuitOpenError:
+            raise
+        except retry_on:
+            if attempt >= attempts or not budget.try_spend():
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
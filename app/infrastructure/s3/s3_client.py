@@ -1,12 +1,27 @@
-import boto3
-import os
-
-# Configuración del cliente S3 usando las variables de entorno 
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=os.getenv("MINIO_ACCESS_KEY"),
-    aws_secret_access_key=os.getenv("MINIO_SECRET_KEY"),
-    endpoint_url=os.getenv("MINIO_ENDPOINT"),
-    region_name="us-east-1",  # o la región que uses en AWS (no afecta en MinIO)
-    use_ssl=os.getenv("USE_SSL", "false").lower() == "true"
-)
+from functools import lru_cache
+
+from config import settings
+
+
+# El cliente se crea la primera vez que se usa (no al importar el módulo): importar boto3 y construir
+# el cliente cuesta bastante y retrasaba el arranque aunque la petición no tocara S3
+@lru_cache(maxsize=1)
+def get_s3_client():
+    import boto3
+    from botocore.config import Config
+
+    # Configuración del cliente S3 usando la configuración centralizada
+    return boto3.client(
+        "s3",
+        aws_access_key_id=settings.minio_access_key,
+        aws_secret_access_key=settings.minio_secret_key,
+        endpoint_url=settings.minio_endpoint,
+        region_name="us-east-1",  # o la región que uses en AWS (no afecta en MinIO)
+        use_ssl=settings.use_ssl,
+        config=Config(
+            max_pool_connections=settings.s3_max_pool_connections,
+            connect_timeout=settings.s3_connect_timeout,
+            read_timeout=settings.s3_read_timeout,
+            retries={"max_attempts": settings.s3_max_attempts, "mode": settings.s3_retry_mode},
+        ),
+    )
@@ -0,0 +1,80 @@
+from typing import BinaryIO, List, Optional
+
+from config import settings
+from domain.entities.stored_object import StoredObject
+from domain.repositories.object_storage import ObjectStorage
+from infrastructure.resilience.circuit_breaker import CircuitOpenError
+from infrastructure.resilience.dependencies import STORAGE, get_breaker
+from infrastructure.s3.s3_client import get_s3_client
+
+# delete_objects admite hasta 1000 claves por llamada
+DELETE_BATCH_SIZE = 1000
+
+
+class S3ObjectStorage(ObjectStorage):
+    """
+    Almacenamiento en MinIO/S3 con el cliente boto3 compartido del proceso (pool, plazos y reintentos en settings).
+    Los reintentos los hace botocore (el modo standard ya limita cuántos se gastan con su propia cuota);
+    encima, el circuit breaker corta las llamadas mientras MinIO/S3 esté caído
+    """
+
+    def __init__(self, bucket: str = settings.minio_bucket):
+        self.bucket = bucket
+        self.breaker = get_breaker(STORAGE)
+
+    def put(self, key: str, file_obj: BinaryIO, content_type: Optional[str] = None) -> None:
+        # upload_fileobj sube por partes en paralelo los archivos grandes
+        extra_args = {"ContentType": content_type} if content_type else None
+        self.breaker.call(get_s3_client().upload_fileobj, file_obj, self.bucket, key, ExtraArgs=extra_args)
+
+    def open(self, key: str) -> BinaryIO:
+        return self.breaker.call(get_s3_client().get_object, Bucket=self.bucket, Key=key)["Body"]
+
+    def head(self, key: str) -> Optional[StoredObject]:
+        from botocore.exceptions import ClientError
+
+        try:
+            response = self.breaker.call(get_s3_client().head_object, Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return StoredObject(
+            key=key,
+            size=response["ContentLength"],
+            content_type=response.get("ContentType"),
+            etag=response.get("ETag", "").strip('"') or None,
+            last_modified=response.get("LastModified"),
+        )
+
+    def delete_many(self, keys: List[str]) -> List[str]:
+        failed: List[str] = []
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start : start + DELETE_BATCH_SIZE]
+            try:
+                response = self.breaker.call(
+                    get_s3_client().delete_objects,
+                    Bucket=self.bucket,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except CircuitOpenError:
+                raise
+            except Exception:
+                failed.extend(batch)
+                continue
+            failed.extend(error["Key"] for error in response.get("Errors", []))
+        return failed
+
+    def presign(self, key: str, expires_in: int = 3600) -> str:
+        # Generar la URL firmada usando endpoint que tenga boto3 (MinIO/S3)
+        url = get_s3_client().generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires_in
+        )
+        # Si la URL generada contiene amazonaws.com → estamos en AWS, la devolvemos tal cual.
+        # Si no → estamos en MinIO y sustituimos el host interno (minio:9000) por el público (MINIO_PUBLIC_HOST),
+        # que es con el que el navegador llega a MinIO
+        if settings.minio_endpoint and "amazonaws.com" not in url:
+            internal_host = settings.minio_endpoint.replace("http://", "").replace("https://", "")
+            public_host = settings.minio_public_host.replace("http://", "").replace("https://", "")
+            return url.replace(internal_host, public_host)
+        return url
@@ -0,0 +1,18 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.job_repository_impl import JobRepositoryImpl
+from config import settings
+
+def delete_finished_jobs():
+    print("🔹 Ejecutando limpieza de trabajos terminados de la cola...")
+    db: Session = SessionLocal()
+    try:
+        repo = JobRepositoryImpl(db)
+        deleted_count = repo.delete_finished_before(datetime.utcnow() - timedelta(days=settings.job_retention_days))
+        print(f"✅ Limpieza completada ({deleted_count} trabajos eliminados)")
+        return deleted_count
+    except Exception as e:
+        print(f"❌ Error en limpieza de trabajos: {e}")
+    finally:
+        db.close()
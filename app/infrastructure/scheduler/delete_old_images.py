@@ -2,31 +2,47 @@ from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from infrastructure.db.db_config import SessionLocal
 from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
-from infrastructure.s3.s3_client import s3_client
-from config import settings
+from domain.repositories.object_storage import ObjectStorage
+from infrastructure.storage.object_storage import get_object_storage
 import logging
+from collections import Counter
+from typing import Optional
+from infrastructure.events.publisher import publish_event
 
-def delete_old_images():
+def delete_old_images(storage: Optional[ObjectStorage] = None):
     logging.info("🗑 Ejecutando cron para borrar imágenes eliminadas hace más de 30 días...")
     db: Session = SessionLocal()
     repo = ImageRepositoryImpl(db)
+    storage = storage or get_object_storage()
     deleted_count = 0
+    purged_per_user = Counter()
 
 
     limit_date = datetime.utcnow() - timedelta(days=30) # Fecha límite para eliminar imágenes antiguas
     old_images = repo.find_deleted_before(limit_date)
 
+    # Borrar de MinIO / S3 por lotes (una llamada cada 1000 objetos, no una por imagen).
+    # Si un objeto no se pudo borrar, su fila se queda para reintentarlo en la siguiente ejecución
+    failed = set(storage.delete_many([img.file_name for img in old_images]))
+    for file_name in failed:
+        logging.error(f"❌ Error eliminando {file_name} del almacenamiento")
+
     for img in old_images:
+        if img.file_name in failed:
+            continue
         try:
-            # Borrar de MinIO / S3
-            s3_client.delete_object(Bucket=settings.minio_bucket, Key=img.file_name)
             # Borrar de la BD
             repo.hard_delete(img.id)
             logging.info(f"✅ Imagen {img.file_name} eliminada definitivamente")
             deleted_count += 1
+            purged_per_user[img.user_id] += 1
         except Exception as e:
             logging.error(f"❌ Error eliminando {img.file_name}: {e}")
 
     db.close()
 
+    # Aviso por /events a cada usuario afectado (uno por usuario, no por imagen)
+    for user_id, count in purged_per_user.items():
+        publish_event(user_id, "images.purged", {"count": count})
+
     return deleted_count
\ No newline at end of file
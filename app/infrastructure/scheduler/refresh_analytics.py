@@ -0,0 +1,20 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.db.repositories.analytics_repository_impl import AnalyticsRepositoryImpl
+from config import settings
+
+def refresh_analytics():
+    db: Session = SessionLocal()
+    try:
+        repo = AnalyticsRepositoryImpl(db)
+        # Se deja un margen para no saltarse imágenes cuyo INSERT aún no se ha confirmado
+        # (created_at se asigna antes del commit)
+        until = datetime.utcnow() - timedelta(seconds=settings.analytics_refresh_lag_seconds)
+        processed = repo.refresh(until, settings.analytics_top_users)
+        print(f"📊 Estadísticas actualizadas ({processed} imágenes nuevas)")
+        return processed
+    except Exception as e:
+        print(f"❌ Error actualizando estadísticas: {e}")
+    finally:
+        db.close()
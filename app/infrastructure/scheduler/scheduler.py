@@ -1,10 +1,39 @@
+import fcntl
+import os
+import threading
+from datetime import datetime
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from infrastructure.scheduler.delete_old_images import delete_old_images
 from infrastructure.scheduler.delete_expired_pending_users import delete_expired_pending_users
+from infrastructure.scheduler.delete_finished_jobs import delete_finished_jobs
+from infrastructure.scheduler.refresh_analytics import refresh_analytics
+from infrastructure.pending_users.pending_user_store import uses_periodic_cleanup
+from config import settings
 
 scheduler = BackgroundScheduler()
 
-def start_scheduler():
+# Con varios workers (serve.py) cada proceso ejecuta el evento startup. Para que los cron jobs
+# corran una sola vez, sólo arranca el scheduler el proceso que consigue el lock del fichero.
+# El resto lo reintenta cada cierto tiempo: si el worker que lo tenía se recicla, otro lo coge.
+LOCK_RETRY_SECONDS = 30
+_lock_fd = None
+_stop_retry = threading.Event()
+
+
+def _try_acquire_lock() -> bool:
+    global _lock_fd
+    fd = os.open(settings.scheduler_lock_file, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    _lock_fd = fd  # se mantiene abierto: el lock se libera al cerrar el fichero o al morir el proceso
+    return True
+
+
+def _add_jobs_and_start():
     # Tarea: borrar imágenes antiguas a medianoche
     scheduler.add_job(
             #delete_old_images, "cron", hour=0, minute=0
@@ -12,21 +41,51 @@ def start_scheduler():
             "cron", hour=0, minute=0
         )
 
-    # Tarea: borrar usuarios pendientes caducados cada hora
+    # Tarea: borrar usuarios pendientes caducados cada hora (sólo con la tabla; memoria y Redis caducan solos)
+    if uses_periodic_cleanup():
+        scheduler.add_job(
+            #delete_expired_pending_users, "interval", hours=1
+                lambda: print(f"🧹 Usuarios pendientes eliminados: {delete_expired_pending_users()}"),
+                "interval", hours=1
+            )
+
+    # Tarea: purgar de la cola los trabajos terminados hace más de job_retention_days, cada noche
+    scheduler.add_job(delete_finished_jobs, "cron", hour=0, minute=30)
+
+    # Tarea: actualizar las tablas de resumen de estadísticas (la primera vez, nada más arrancar)
     scheduler.add_job(
-        #delete_expired_pending_users, "interval", hours=1
-            lambda: print(f"🧹 Usuarios pendientes eliminados: {delete_expired_pending_users()}"),
-            "interval", hours=1
-        )
+        refresh_analytics, "interval", minutes=settings.analytics_refresh_minutes, next_run_time=datetime.now()
+    )
 
     if not scheduler.running:
         scheduler.start()
-        print("⏱️ Scheduler started")
+        print(f"⏱️ Scheduler started (pid {os.getpid()})")
+
+
+def _retry_until_leader():
+    while not _stop_retry.wait(LOCK_RETRY_SECONDS):
+        if _try_acquire_lock():
+            _add_jobs_and_start()
+            return
+
+
+def start_scheduler():
+    if scheduler.running:
+        return
+    if _try_acquire_lock():
+        _add_jobs_and_start()
+    else:
+        threading.Thread(target=_retry_until_leader, name="scheduler-lock-retry", daemon=True).start()
 
 def stop_scheduler():
     """
     Detiene el scheduler.
     """
+    global _lock_fd
+    _stop_retry.set()
     if scheduler.running:
         scheduler.shutdown()
         print("🛑 Scheduler stopped")
+    if _lock_fd is not None:
+        os.close(_lock_fd)
+        _lock_fd = None
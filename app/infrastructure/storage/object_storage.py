@@ -0,0 +1,19 @@
+from functools import lru_cache
+
+from config import settings
+from domain.repositories.object_storage import ObjectStorage
+
+
+@lru_cache(maxsize=1)
+def get_object_storage() -> ObjectStorage:
+    """Almacenamiento de objetos del proceso según STORAGE_BACKEND (una sola instancia: comparte el pool de conexiones)"""
+    if settings.storage_backend == "local":
+        from infrastructure.storage.local_object_storage import LocalObjectStorage
+
+        return LocalObjectStorage()
+    if settings.storage_backend != "s3":
+        raise ValueError(f"STORAGE_BACKEND desconocido: {settings.storage_backend} (s3 | local)")
+
+    from infrastructure.s3.s3_object_storage import S3ObjectStorage
+
+    return S3ObjectStorage()
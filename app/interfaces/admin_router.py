@@ -0,0 +1,90 @@
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+# Infraestructura
+from infrastructure.db.db_config import get_db
+from infrastructure.db.repositories.analytics_repository_impl import AnalyticsRepositoryImpl
+from infrastructure.auth.auth_dependencies import get_current_admin_user
+from infrastructure.observability.profiler import ProfiledRoute
+from infrastructure.dto.analytics_dto import (
+    ActiveUsersDTO,
+    AnalyticsOverviewDTO,
+    DailyUploadsDTO,
+    StorageSnapshotDTO,
+    TopStorageUserDTO,
+    UploadsPerDayResponseDTO,
+)
+
+# Casos de uso
+from application.use_cases.admin_use_cases.get_admin_analytics_use_case import GetAdminAnalyticsUseCase
+
+
+# Estadísticas del panel de administración. Todas leen de las tablas de resumen que el scheduler
+# actualiza cada pocos minutos (infrastructure/scheduler/refresh_analytics.py), nunca de images
+router = APIRouter(prefix="/admin/analytics", tags=["Admin"], route_class=ProfiledRoute)
+
+
+@router.get("/overview", response_model=AnalyticsOverviewDTO)
+def get_overview(db: Session = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    overview = GetAdminAnalyticsUseCase(AnalyticsRepositoryImpl(db)).overview()
+    return AnalyticsOverviewDTO(
+        approx_users=overview.approx_users,
+        approx_images=overview.approx_images,
+        active_users_last_30_days=overview.active_users_last_30_days,
+        refreshed_at=overview.refreshed_at,
+    )
+
+
+# Subidas, bytes subidos y usuarios activos por día
+@router.get("/uploads", response_model=UploadsPerDayResponseDTO)
+def get_uploads_per_day(days: int = 30, db: Session = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    repo = AnalyticsRepositoryImpl(db)
+    stats = GetAdminAnalyticsUseCase(repo).uploads_per_day(days)
+    return UploadsPerDayResponseDTO(
+        refreshed_at=repo.get_refreshed_at(),
+        days=[
+            DailyUploadsDTO(day=s.day, uploads=s.uploads, uploaded_bytes=s.uploaded_bytes, active_users=s.active_users)
+            for s in stats
+        ],
+    )
+
+
+# Usuarios distintos que han subido algo en los últimos `days` días
+@router.get("/active-users", response_model=ActiveUsersDTO)
+def get_active_users(days: int = 30, db: Session = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    active = GetAdminAnalyticsUseCase(AnalyticsRepositoryImpl(db)).active_users(days)
+    return ActiveUsersDTO(days=days, active_users=active)
+
+
+# Evolución del almacenamiento total y del volumen de la papelera
+@router.get("/storage", response_model=List[StorageSnapshotDTO])
+def get_storage(days: int = 30, db: Session = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    snapshots = GetAdminAnalyticsUseCase(AnalyticsRepositoryImpl(db)).storage(days)
+    return [
+        StorageSnapshotDTO(
+            day=s.day,
+            live_images=s.live_images,
+            live_bytes=s.live_bytes,
+            trashed_images=s.trashed_images,
+            trashed_bytes=s.trashed_bytes,
+        )
+        for s in snapshots
+    ]
+
+
+# Usuarios que más almacenamiento ocupan
+@router.get("/top-users", response_model=List[TopStorageUserDTO])
+def get_top_users(limit: int = 10, db: Session = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    users = GetAdminAnalyticsUseCase(AnalyticsRepositoryImpl(db)).top_users(limit)
+    return [
+        TopStorageUserDTO(
+            rank=u.rank,
+            user_id=u.user_id,
+            username=u.username,
+            live_bytes=u.live_bytes,
+            trashed_bytes=u.trashed_bytes,
+            total_bytes=u.total_bytes,
+        )
+        for u in users
+    ]
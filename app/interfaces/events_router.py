@@ -0,0 +1,51 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from infrastructure.auth.auth_dependencies import create_stream_ticket, get_current_user, get_current_user_for_stream
+from infrastructure.events.event_bus import TooManySubscriptions, event_bus
+from infrastructure.events.sse import format_sse
+from infrastructure.observability.profiler import ProfiledRoute
+from config import settings
+
+router = APIRouter(tags=["Events"], route_class=ProfiledRoute)
+
+
+# Ticket para abrir /events desde el navegador: EventSource no envía cabeceras, así que el cliente pide
+# un ticket con su token (cabecera Authorization) y conecta a /events?ticket=<ticket>
+@router.post("/events/ticket")
+def create_events_ticket(current_user=Depends(get_current_user)):
+    return {"ticket": create_stream_ticket(current_user.id), "expires_in": settings.sse_ticket_ttl_seconds}
+
+
+# Eventos del usuario en tiempo real (Server-Sent Events): imágenes subidas, borradas o restauradas,
+# purgas de la papelera y estado de los trabajos en segundo plano. Sustituye al sondeo de /images/me.
+# Tras un evento "resync" (o al reconectar) el cliente debe recargar sus datos: los eventos no se guardan
+@router.get("/events")
+async def stream_events(current_user=Depends(get_current_user_for_stream)):
+    user_id = current_user.id
+    try:
+        queue = event_bus.subscribe(user_id)
+    except TooManySubscriptions:
+        raise HTTPException(status_code=429, detail="Demasiadas conexiones de eventos abiertas")
+
+    async def body():
+        try:
+            yield "retry: 5000\n\n"  # el navegador reconecta a los 5s si se corta
+            yield format_sse({"type": "ready", "data": {}})
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.sse_heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            # Al desconectarse el cliente Starlette cancela el generador y se libera la cola
+            event_bus.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
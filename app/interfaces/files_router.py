@@ -0,0 +1,29 @@
+import mimetypes
+import os
+import time
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+from infrastructure.storage.local_object_storage import verify_signature
+from infrastructure.storage.object_storage import get_object_storage
+from infrastructure.observability.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/files", tags=["Files"], route_class=ProfiledRoute)
+
+
+# Descarga de archivos del almacenamiento local con URL firmada (equivalente a las URLs firmadas de MinIO).
+# FileResponse atiende Range/If-Range y, si el servidor lo soporta (extensión pathsend), el envío lo hace el
+# propio servidor con sendfile sin pasar los bytes por Python
+@router.get("/{key:path}")
+def get_file(key: str, expires: int, signature: str):
+    if not verify_signature(key, expires, signature):
+        raise HTTPException(status_code=403, detail="URL no válida o caducada")
+    path = get_object_storage().local_path(key)
+    if not path or not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="Archivo no encontrado")
+    max_age = max(int(expires - time.time()), 0)
+    return FileResponse(
+        path,
+        media_type=mimetypes.guess_type(key)[0] or "application/octet-stream",
+        headers={"Cache-Control": f"private, max-age={max_age}"},
+    )
@@ -0,0 +1,73 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+# Infraestructura
+from infrastructure.db.db_config import get_db
+from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
+from infrastructure.auth.auth_dependencies import get_current_user
+from infrastructure.hashtags.engine import get_hashtag_engine
+from infrastructure.observability.profiler import ProfiledRoute
+from infrastructure.dto.hashtag_dto import (
+    HashtagBatchRequestDTO,
+    HashtagBatchResponseDTO,
+    HashtagSuggestRequestDTO,
+    HashtagSuggestResponseDTO,
+    HashtagSuggestionDTO,
+    ImageHashtagsResponseDTO,
+    ImageHashtagsUpdateDTO,
+)
+
+# Casos de uso
+from application.use_cases.hashtag_use_cases.suggest_hashtags_use_case import SuggestHashtagsUseCase
+from application.use_cases.hashtag_use_cases.save_image_hashtags_use_case import SaveImageHashtagsUseCase
+
+
+router = APIRouter(prefix="/hashtags", tags=["Hashtags"], route_class=ProfiledRoute)
+
+
+def _to_response(suggestions) -> HashtagSuggestResponseDTO:
+    return HashtagSuggestResponseDTO(
+        hashtags=[HashtagSuggestionDTO(tag=s.tag, score=s.score, source=s.source) for s in suggestions]
+    )
+
+
+# Sugerencias para un caption (y opcionalmente una imagen del usuario)
+# Endpoints síncronos a propósito: el motor es CPU puro y se ejecuta en el threadpool, sin bloquear el event loop
+@router.post("/suggest", response_model=HashtagSuggestResponseDTO)
+def suggest_hashtags(
+    body: HashtagSuggestRequestDTO,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    use_case = SuggestHashtagsUseCase(ImageRepositoryImpl(db), get_hashtag_engine())
+    suggestions = use_case.execute(current_user.id, body.caption, body.image_id, body.platform, body.limit)
+    return _to_response(suggestions)
+
+
+# Varias publicaciones en una sola petición (los captions repetidos se calculan una vez)
+@router.post("/suggest/batch", response_model=HashtagBatchResponseDTO)
+def suggest_hashtags_batch(
+    body: HashtagBatchRequestDTO,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    use_case = SuggestHashtagsUseCase(ImageRepositoryImpl(db), get_hashtag_engine())
+    results = use_case.execute_batch(
+        current_user.id,
+        [(item.caption, item.image_id, item.platform, item.limit) for item in body.items],
+    )
+    return HashtagBatchResponseDTO(results=[_to_response(suggestions) for suggestions in results])
+
+
+# Guardar el caption y los hashtags elegidos para una imagen (alimentan el índice de sugerencias)
+@router.put("/images/{image_id}", response_model=ImageHashtagsResponseDTO)
+def save_image_hashtags(
+    image_id: UUID,
+    body: ImageHashtagsUpdateDTO,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    use_case = SaveImageHashtagsUseCase(ImageRepositoryImpl(db), get_hashtag_engine())
+    caption, hashtags = use_case.execute(current_user.id, image_id, body.caption, body.hashtags)
+    return ImageHashtagsResponseDTO(image_id=image_id, caption=caption, hashtags=hashtags)
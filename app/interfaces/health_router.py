@@ -0,0 +1,62 @@
+import time
+from dataclasses import asdict
+from typing import Callable, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from infrastructure.db.db_config import SessionLocal
+from infrastructure.resilience.dependencies import breaker_states
+from infrastructure.storage.object_storage import get_object_storage
+from infrastructure.observability.profiler import ProfiledRoute
+
+router = APIRouter(prefix="/health", tags=["Health"], route_class=ProfiledRoute)
+
+HEALTHCHECK_KEY = "__healthcheck__"  # no tiene por qué existir: basta con que el almacenamiento responda
+
+
+def _probe(check: Callable[[], object]) -> Dict:
+    start = time.perf_counter()
+    try:
+        check()
+        result = {"ok": True}
+    except Exception as e:
+        result = {"ok": False, "error": str(getattr(e, "detail", None) or e)}
+    result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def _ping_database() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+
+
+# Liveness: el proceso responde (no toca dependencias, para que un Postgres caído no reinicie los contenedores)
+@router.get("")
+def health():
+    return {"status": "ok"}
+
+
+# Readiness: prueba Postgres y el almacenamiento a través de sus circuit breakers (con el breaker abierto
+# la respuesta es inmediata). Sólo Postgres es imprescindible: sin almacenamiento o SMTP la API va degradada
+@router.get("/deep")
+def deep_health():
+    checks = {
+        "postgres": _probe(_ping_database),
+        "storage": _probe(lambda: get_object_storage().head(HEALTHCHECK_KEY)),
+    }
+    breakers = {name: asdict(state) for name, state in breaker_states().items()}
+    healthy = all(check["ok"] for check in checks.values()) and all(b["state"] == "closed" for b in breakers.values())
+    status = "ok" if healthy else "degraded"
+    status_code = 200
+    if not checks["postgres"]["ok"]:
+        status, status_code = "down", 503
+    return JSONResponse(
+        {"status": status, "checks": checks, "breakers": breakers},
+        status_code=status_code,
+        headers={"Cache-Control": "no-store"},
+    )
@@ -1,32 +1,55 @@
 import os
 import shutil
+from contextlib import contextmanager
 from uuid import uuid4
 from uuid import UUID
-from typing import List
-from fastapi import APIRouter, UploadFile, Depends, HTTPException
+from typing import Iterator, List, Optional
+from fastapi import APIRouter, UploadFile, Depends, HTTPException, Header
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 # Infraestructura
-from infrastructure.db.db_config import get_db
+from infrastructure.db.db_config import get_db, iter_with_session, short_session
 from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
-from infrastructure.dto.image_dto import ImageCreateDTO, ImageResponseDTO
+from infrastructure.db.repositories.image_import_repository_impl import ImageImportRepositoryImpl
+from infrastructure.db.repositories.job_repository_impl import JobRepositoryImpl
+from infrastructure.dto.image_dto import (
+    ImageCreateDTO,
+    ImageImportResponseDTO,
+    ImageResponseDTO,
+    ImageSearchResponseDTO,
+    StorageUsageResponseDTO,
+)
 from infrastructure.mappers.image_mapper import ImageMapper
 from infrastructure.auth.auth_dependencies import get_current_user
+from infrastructure.http.orjson_response import ORJSONResponse
+from infrastructure.http.streaming import StreamFormat, stream_rows
+from infrastructure.images.placeholder_worker import schedule_placeholder_generation
+from infrastructure.http.etag import cache_headers, collection_etag, etag_matches, not_modified
+from infrastructure.http.cursor import decode_cursor, encode_cursor
+from infrastructure.events.publisher import publish_event
+from infrastructure.storage.object_storage import get_object_storage
+from infrastructure.observability.profiler import ProfiledRoute
 
 # Casos de uso
 from application.use_cases.image_use_cases.upload_image_use_case import UploadImageUseCase
 from application.use_cases.image_use_cases.list_user_images_use_case import ListUserImagesUseCase
 from application.use_cases.image_use_cases.get_signed_image_url_use_case import GetSignedImageUrlUseCase
+from application.use_cases.image_use_cases.stream_image_use_case import StreamImageUseCase
 from application.use_cases.image_use_cases.soft_delete_image_use_case import SoftDeleteImageUseCase
 from application.use_cases.image_use_cases.list_deleted_images_use_case import ListDeletedImagesUseCase
 from application.use_cases.image_use_cases.restore_image_use_case import RestoreImageUseCase
+from application.use_cases.image_use_cases.get_storage_usage_use_case import GetStorageUsageUseCase
+from application.use_cases.image_use_cases.search_images_use_case import SearchImagesUseCase
+from application.use_cases.image_use_cases.export_images_zip_use_case import ExportImagesZipUseCase
+from application.use_cases.image_use_cases.start_image_import_use_case import StartImageImportUseCase
+from application.use_cases.image_use_cases.get_image_import_use_case import GetImageImportUseCase
 
-# Lo de minIO / S3
-from infrastructure.s3.s3_client import s3_client  # 👈 importar el cliente
+# Lo de minIO / S3 (los casos de uso reciben el almacenamiento de get_object_storage())
 from config import settings  # si usas un archivo de settings como en pasos anteriores
 
 
-router = APIRouter(prefix="/images", tags=["Images"])
+router = APIRouter(prefix="/images", tags=["Images"], route_class=ProfiledRoute)
 
 # Carpeta local para pruebas
 # UPLOAD_DIR = "uploads"
@@ -66,13 +89,19 @@ def upload_image(
     dto = ImageCreateDTO(
         file_name=new_file_name,
         url="", # El caso de uso generará la URL final
-        user_id=current_user.id
+        user_id=current_user.id,
+        size_bytes=file.size or 0,  # tamaño en bytes, para los contadores de almacenamiento y la cuota
+        content_type=file.content_type,  # el caso de uso lo sustituye por el detectado en el archivo
+        original_name=os.path.basename(file.filename or "")[:255] or None  # nombre original, para la búsqueda
     )
 
     # 3. Llamar al caso de uso
     image_repository: ImageRepository = ImageRepositoryImpl(db)
-    use_case = UploadImageUseCase(image_repository)
+    use_case = UploadImageUseCase(
+        image_repository, get_object_storage(), placeholder_scheduler=schedule_placeholder_generation
+    )
     image_entity = use_case.execute(dto, file.file)  # Pasar el archivo como file_obj
+    publish_event(current_user.id, "image.uploaded", {"id": str(image_entity.id), "file_name": image_entity.file_name})
 
     # 4. Transformar a DTO de respuesta y devolver
     return ImageMapper.to_response_dto(image_entity)
@@ -80,31 +109,203 @@ def upload_image(
 # Listar imágenes del usuario autenticado(En caso de que la imagen esté en un bucket público. Imagen no firmada)
 @router.get("/me", response_model=List[ImageResponseDTO])
 def list_my_images(
+    stream: Optional[StreamFormat] = None,  # ?stream=ndjson | ?stream=json → respuesta en streaming (exportaciones grandes)
+    if_none_match: Optional[str] = Header(None),
     current_user = Depends(get_current_user),
+):
+    # El usuario ya viene cargado por get_current_user (búsqueda por PK), así que si el cliente
+    # tiene la versión actual respondemos 304 sin tocar la tabla images
+    etag = collection_etag(current_user.id, current_user.images_version, "images")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    # Sin get_db: su sesión no se liberaría hasta terminar de enviar la respuesta. El streaming lee con
+    # su propia sesión (iter_with_session) y el listado normal con una sesión corta
+    if stream:
+        return stream_rows(
+            iter_with_session(lambda s: ListUserImagesUseCase(ImageRepositoryImpl(s)).execute_stream(current_user.id)),
+            stream,
+            headers=cache_headers(etag),
+        )
+
+    with short_session() as db:
+        rows = ListUserImagesUseCase(ImageRepositoryImpl(db)).execute_rows(current_user.id)
+    # Devolvemos directamente un ORJSONResponse: FastAPI no vuelve a validar con response_model
+    # (que se mantiene sólo para la documentación de Swagger) y orjson serializa UUID/datetime de forma nativa
+    return ORJSONResponse(rows, headers=cache_headers(etag))
+
+
+# Busca una imagen y comprueba que pertenece al usuario autenticado (404 si no, para no revelar que existe)
+def _get_owned_image(db: Session, image_id: UUID, user_id: UUID):
+    image = ImageRepositoryImpl(db).get_by_id(image_id)
+    if not image or image.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Imagen no encontrada")
+    return image
+
+
+# Búsqueda en las imágenes del usuario por nombre original, caption y hashtags (tolera erratas).
+# Paginación por cursor: la respuesta trae next_cursor mientras haya más resultados
+@router.get("/search", response_model=ImageSearchResponseDTO)
+def search_images(
+    q: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    current_user=Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    repo = ImageRepositoryImpl(db)
-    use_case = ListUserImagesUseCase(repo)
-    images = use_case.execute(current_user.id)
-    return [ImageMapper.to_response_dto(image) for image in images]
+    after = None
+    if cursor:
+        try:
+            rank, last_id = decode_cursor(cursor)
+            after = (float(rank), UUID(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Cursor no válido")
+
+    use_case = SearchImagesUseCase(ImageRepositoryImpl(db))
+    rows = use_case.execute_rows(current_user.id, q, limit, after)
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor([rows[-1]["rank"], str(rows[-1]["id"])])
+    return ORJSONResponse({"items": rows, "next_cursor": next_cursor})
+
+
+# Descargar todas las imágenes del usuario en un ZIP que se genera sobre la marcha (sin ficheros temporales).
+# Sin Content-Length: el tamaño final no se conoce hasta terminar, se envía con chunked encoding.
+# No usa iter_with_session: cada lectura abre su propia sesión corta para no retener una conexión toda la descarga
+@contextmanager
+def _short_lived_image_repository() -> Iterator[ImageRepositoryImpl]:
+    with short_session() as db:
+        yield ImageRepositoryImpl(db)
+
+
+@router.get("/export.zip")
+def export_images_zip(current_user=Depends(get_current_user)):
+    body = ExportImagesZipUseCase(_short_lived_image_repository, get_object_storage()).execute(current_user.id)
+    return StreamingResponse(
+        body,
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="imagenes.zip"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+
+# Importar un ZIP de imágenes. Sólo se guarda el ZIP y se encola el trabajo (lo procesa worker.py);
+# el avance se consulta en /images/imports/{import_id}
+@router.post("/import", response_model=ImageImportResponseDTO, status_code=202)
+def import_images_zip(
+    file: UploadFile,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    use_case = StartImageImportUseCase(ImageImportRepositoryImpl(db), JobRepositoryImpl(db), get_object_storage())
+    image_import = use_case.execute(current_user.id, file.file, file.size or 0)
+    publish_event(current_user.id, "import.progress", {"import_id": str(image_import.id), "status": image_import.status})
+    return ImageImportResponseDTO.model_validate(image_import, from_attributes=True)
+
+
+@router.get("/imports/{import_id}", response_model=ImageImportResponseDTO)
+def get_image_import(
+    import_id: UUID,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    image_import = GetImageImportUseCase(ImageImportRepositoryImpl(db)).execute(import_id, current_user.id)
+    return ImageImportResponseDTO.model_validate(image_import, from_attributes=True)
+
+
+# Uso de almacenamiento del usuario autenticado (contadores mantenidos, no se recorren las imágenes)
+@router.get("/usage", response_model=StorageUsageResponseDTO)
+def get_storage_usage(
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    use_case = GetStorageUsageUseCase(ImageRepositoryImpl(db))
+    usage = use_case.execute(current_user.id)
+    return StorageUsageResponseDTO(
+        live_images=usage.live_images,
+        live_bytes=usage.live_bytes,
+        trashed_images=usage.trashed_images,
+        trashed_bytes=usage.trashed_bytes,
+        total_bytes=usage.total_bytes,
+        quota_bytes=usage.quota_bytes,
+    )
 
 
 # Devolver una URL firmada para acceder a la imagen (Bucket privado)
 @router.get("/image-url/{image_id}")
-def get_image_url(image_id: str, db: Session = Depends(get_db)):
+def get_image_url(
+    image_id: UUID,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     # Buscar la imagen en la BD
-    image_repository = ImageRepositoryImpl(db)
-    image = image_repository.get_by_id(image_id)
-    if not image:
-        raise HTTPException(status_code=404, detail="Imagen no encontrada")
+    image = _get_owned_image(db, image_id, current_user.id)
 
-    # Generar URL firmada
-    use_case = GetSignedImageUrlUseCase()
-    signed_url = use_case.execute(image.url)  # image.url ahora es el file_name
+    # Generar URL firmada (reutilizando la cacheada si sigue vigente)
+    use_case = GetSignedImageUrlUseCase(get_object_storage())
+    signed_url, _ = use_case.execute_cached(image.url)  # image.url ahora es el file_name
 
     return {"url": signed_url}
 
 
+# Redirección directa a la URL firmada, para clientes que piden la imagen con fetch/XHR (o desde una app)
+# enviando la cabecera Authorization: siguen el 302 y se ahorran pedir el JSON de /image-url y parsearlo.
+# No sirve como src de un <img>: el navegador no envía Authorization ahí; para eso se usa la URL de /image-url
+@router.get("/{image_id}/content", status_code=302)
+def get_image_content(
+    image_id: UUID,
+    current_user=Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    image = _get_owned_image(db, image_id, current_user.id)
+
+    use_case = GetSignedImageUrlUseCase(get_object_storage())
+    signed_url, remaining = use_case.execute_cached(image.url)
+
+    # La redirección se puede cachear mientras la URL firmada siga siendo válida (menos un margen para
+    # que el navegador no siga una URL a punto de caducar). Es privada porque depende del usuario
+    max_age = max(remaining - 60, 0)
+    return RedirectResponse(
+        signed_url,
+        status_code=302,
+        headers={"Cache-Control": f"private, max-age={max_age}", "Vary": "Authorization"},
+    )
+
+
+# Proxy de los bytes de la imagen a través de la API, para clientes que no llegan a MinIO directamente.
+# Soporta Range/If-Range (206) y peticiones condicionales (304) y nunca carga el objeto entero en memoria.
+# La descarga puede durar mucho (vídeos, clientes lentos): la imagen se busca en una sesión corta que se
+# cierra antes de enviar bytes, en vez de con get_db, que no se liberaría hasta el final de la respuesta
+@router.get("/{image_id}/raw")
+def get_image_raw(
+    image_id: UUID,
+    range: Optional[str] = Header(None),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
+    current_user=Depends(get_current_user),
+):
+    with short_session() as db:
+        image = _get_owned_image(db, image_id, current_user.id)
+
+    # Almacenamiento local: FileResponse ya resuelve Range/If-Range y puede enviar el archivo con sendfile
+    path = get_object_storage().local_path(image.url)
+    if path:
+        if not os.path.isfile(path):
+            raise HTTPException(status_code=404, detail="Imagen no encontrada")
+        return FileResponse(path, media_type=image.content_type, headers={"Cache-Control": "private, no-cache"})
+
+    use_case = StreamImageUseCase()
+    result = use_case.execute(image.url, range, if_range, if_none_match, if_modified_since)
+
+    if result.body is None:
+        return Response(status_code=result.status_code, headers=result.headers)
+    return StreamingResponse(result.body, status_code=result.status_code, headers=result.headers)
+
+
 # Eliminar una imagen (soft delete)
 @router.delete("/{image_id}")
 def delete_image(
@@ -116,20 +317,33 @@ def delete_image(
     repo = ImageRepositoryImpl(db)
     use_case = SoftDeleteImageUseCase(repo)
     use_case.execute(image_id)
+    publish_event(current_user.id, "image.deleted", {"id": str(image_id)})
     return {"message": "Imagen eliminada correctamente"}
 
 
 # Listar imágenes eliminadas (soft delete) del usuario autenticado
 @router.get("/trash", response_model=List[ImageResponseDTO])
 def list_deleted_images(
+    stream: Optional[StreamFormat] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user=Depends(get_current_user),
-    db: Session = Depends(get_db)
 ):
     """Devuelve las imágenes eliminadas (soft delete)"""
-    repo = ImageRepositoryImpl(db)
-    use_case = ListDeletedImagesUseCase(repo)
-    images = use_case.execute(current_user.id)
-    return [ImageMapper.to_response_dto(img) for img in images]
+    # Sin get_db, como en /images/me: el streaming lee con su propia sesión y el listado con una corta
+    etag = collection_etag(current_user.id, current_user.images_version, "trash")
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    if stream:
+        return stream_rows(
+            iter_with_session(lambda s: ListDeletedImagesUseCase(ImageRepositoryImpl(s)).execute_stream(current_user.id)),
+            stream,
+            headers=cache_headers(etag),
+        )
+
+    with short_session() as db:
+        rows = ListDeletedImagesUseCase(ImageRepositoryImpl(db)).execute_rows(current_user.id)
+    return ORJSONResponse(rows, headers=cache_headers(etag))
 
 
 # Restaurar una imagen eliminada (soft delete -> activa)
@@ -145,4 +359,5 @@ def restore_image(
     repo = ImageRepositoryImpl(db)
     use_case = RestoreImageUseCase(repo)
     use_case.execute(image_id)
+    publish_event(current_user.id, "image.restored", {"id": str(image_id)})
     return {"message": "Imagen restaurada correctamente"}
@@ -1,13 +1,17 @@
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from infrastructure.db.db_config import SessionLocal
-from infrastructure.db.db_config import get_db
+from infrastructure.db.db_config import get_db, iter_with_session, short_session
 from infrastructure.db.repositories.user_repository_impl import UserRepositoryImpl
 from application.use_cases.create_user_use_case import CreateUserUseCase
 from infrastructure.dto.user_dto import CreateUserDto, UserResponseDto
 from infrastructure.auth.auth_dependencies import get_current_user
 from infrastructure.auth.auth_dependencies import get_current_admin_user
+from infrastructure.http.streaming import StreamFormat, stream_rows
+from infrastructure.mappers.user_mapper import UserMapper
+from application.use_cases.list_users_use_case import ListUsersUseCase
 
 # Importar el caso de uso de login y el DTO y el contexto de encriptación
 from application.use_cases.login_user_use_case import LoginUserUseCase
@@ -25,12 +29,14 @@ from infrastructure.dto.resend_code_dto import ResendCodeDto
 from application.use_cases.verify_pending_user_use_case import VerifyPendingUserUseCase
 from application.use_cases.create_pending_user_use_case import CreatePendingUserUseCase
 from application.use_cases.resend_verification_code_use_case import ResendVerificationCodeUseCase
-from infrastructure.db.repositories.pending_user_repository_impl import PendingUserRepositoryImpl
-from infrastructure.mail.email_service import EmailService
+from infrastructure.pending_users.pending_user_store import build_pending_user_repository
+from infrastructure.mail.queued_email_service import QueuedEmailService
+from infrastructure.db.repositories.job_repository_impl import JobRepositoryImpl
+from infrastructure.observability.profiler import ProfiledRoute
 
 
 # Crear el router para manejar las rutas relacionadas con usuarios
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=ProfiledRoute)
 
 # Dependency para obtener la sesión de DB
 # def get_db():
@@ -56,6 +62,21 @@ def create_user(dto: CreateUserDto, db: Session = Depends(get_db)): #Proteger en
 
     return use_case.execute(dto)
 
+# Listar todos los usuarios (solo admins). Con ?stream=ndjson o ?stream=json la respuesta se envía
+# en streaming leyendo la tabla por lotes, para que exportar muchos usuarios no dispare la memoria
+@router.get("/", response_model=List[UserResponseDto])
+def list_users(
+    stream: Optional[StreamFormat] = None,
+    current_admin=Depends(get_current_admin_user)
+):
+    # Sin get_db: su sesión seguiría prestada hasta terminar el streaming, que ya lee con la suya
+    if stream:
+        return stream_rows(iter_with_session(lambda s: ListUsersUseCase(UserRepositoryImpl(s)).execute_stream()), stream)
+
+    with short_session() as db:
+        users = ListUsersUseCase(UserRepositoryImpl(db)).execute()
+    return [UserMapper.to_response_dto(user) for user in users]
+
 # Endpoint para crear un usuario admin (solo accesible por admins)
 # Aquí se asume que el usuario que llama a este endpoint es un admin, por lo que no se necesita la validación de is_admin en el DTO
 # @router.post("/admin/users", response_model=UserResponseDto)
@@ -86,8 +107,8 @@ def login_user(dto: LoginUserDto, db: Session = Depends(get_db)):
 # Endpoint para registrar un usuario pendiente (para verificación por email - enviar código de verificación)
 @router.post("/register-pending")
 def register_pending_user(dto: CreatePendingUserDto, db: Session = Depends(get_db)):
-    repo = PendingUserRepositoryImpl(db)
-    email_service = EmailService()
+    repo = build_pending_user_repository(db)
+    email_service = QueuedEmailService(JobRepositoryImpl(db))  # el correo lo envía el worker
     use_case = CreatePendingUserUseCase(repo, email_service)
     return use_case.execute(dto)
 
@@ -95,7 +116,7 @@ def register_pending_user(dto: CreatePendingUserDto, db: Session = Depends(get_d
 # Endpoint para verificar un usuario pendiente (confirmación de email - confirmación de código de verificación)
 @router.post("/verify")
 def verify_user(dto: VerifyUserDto, db: Session = Depends(get_db)):
-    pending_repo = PendingUserRepositoryImpl(db)
+    pending_repo = build_pending_user_repository(db)
     user_repo = UserRepositoryImpl(db)
     use_case = VerifyPendingUserUseCase(pending_repo, user_repo)
     return use_case.execute(dto)
@@ -104,7 +125,7 @@ def verify_user(dto: VerifyUserDto, db: Session = Depends(get_db)):
 # Endpoint para volver a enviar el códdigo en caso de que no se haya recibido
 @router.post("/resend-code")
 def resend_code(dto: ResendCodeDto, db: Session = Depends(get_db)):
-    repo = PendingUserRepositoryImpl(db)
-    email_service = EmailService()
+    repo = build_pending_user_repository(db)
+    email_service = QueuedEmailService(JobRepositoryImpl(db))  # el correo lo envía el worker
     use_case = ResendVerificationCodeUseCase(repo, email_service)
     return use_case.execute(dto)
\ No newline at end of file
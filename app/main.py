@@ -4,14 +4,24 @@ from fastapi.middleware.cors import CORSMiddleware # Import CORS middleware
 from infrastructure.db.models.user_model import UserModel # Import the UserModel to ensure it's registered with SQLAlchemy
 from infrastructure.db.models.image_model import ImageModel  # Import the ImageModel to ensure it's registered with SQLAlchemy
 from infrastructure.db.models.pending_user_model import PendingUser  # Import the PendingUser to ensure it's registered with SQLAlchemy
+from infrastructure.db.models.job_model import JobModel  # Cola de trabajos en segundo plano (la consume worker.py)
+from infrastructure.db.models.image_import_model import ImageImportModel  # Importaciones masivas desde ZIP
+from infrastructure.db.models import analytics_models  # Tablas de resumen de las estadísticas de admin
 from interfaces import user_router  # importa el router
 from interfaces import image_router  # importa el router de imágenes
+from interfaces import hashtag_router  # importa el router del generador de hashtags
+from interfaces import admin_router  # importa el router de estadísticas de admin
+from interfaces import events_router  # importa el router de eventos en tiempo real (SSE)
+from interfaces import files_router  # importa el router de descargas del almacenamiento local
+from interfaces import health_router  # importa el router de comprobaciones de salud
 from fastapi.staticfiles import StaticFiles
+from config import settings
 
 # Registrar el cron
 # from apscheduler.schedulers.background import BackgroundScheduler
 # from infrastructure.scheduler.delete_old_images import delete_old_images
 from infrastructure.scheduler.scheduler import start_scheduler, stop_scheduler # Importa el scheduler centralizado
+from infrastructure.events.pg_listener import start_event_listener, stop_event_listener
 
 # AHORA ESTO SE HACE DESDE scheduler.py 
 # Configurar el cron para eliminar imágenes antiguas (Antes de crear la instancia de FastAPI, esto asegura que el cron se inicie junto al arrancar la aplicación)
@@ -24,24 +34,60 @@ app = FastAPI(title="Hashtag Generator API")
 
 @app.on_event("startup")
 def startup():
-    print("🔌 Connecting to the database...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database ready.")
+    if settings.db_create_all:
+        print("🔌 Connecting to the database...")
+        Base.metadata.create_all(bind=engine)
+        print("✅ Database ready.")
 
     # Iniciar scheduler (con todos los cron jobs) aquí evita duplicados en desarrollo con --reload
     start_scheduler()
 
+    # Un LISTEN por proceso: reparte a los clientes SSE de este worker los eventos publicados en cualquier proceso
+    if engine.dialect.name == "postgresql":
+        start_event_listener()
+
 # Apagar scheduler al cerrar la aplicación
 @app.on_event("shutdown")
 def shutdown_event():
     stop_scheduler()
+    stop_event_listener()
 
 # Montar la carpeta estática para servir imágenes (Ya no es necesario, ya que las imágenes se sirven desde MinIO/S3)
 #app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Con STORAGE_BACKEND=local los archivos se sirven desde /files con URL firmada (ver files_router)
 
 # Registrar los routers
 app.include_router(user_router.router)  # registra el router
 app.include_router(image_router.router)  # registra el router de imágenes
+app.include_router(hashtag_router.router)  # registra el router de hashtags
+app.include_router(admin_router.router)  # registra el router de estadísticas de admin
+app.include_router(events_router.router)  # registra el router de eventos (SSE)
+app.include_router(health_router.router)  # registra /health y /health/deep
+if settings.storage_backend == "local":
+    app.include_router(files_router.router)  # descargas del almacenamiento local
+
+
+# Rate limiting de login/registro/reenvío de código (se añade antes que CORS para que los 429 lleven cabeceras CORS)
+from infrastructure.rate_limit.middleware import RateLimitMiddleware
+from infrastructure.rate_limit.rules import AUTH_RATE_LIMITS, build_token_bucket_store
+
+app.add_middleware(
+    RateLimitMiddleware,
+    routes=AUTH_RATE_LIMITS,
+    store=build_token_bucket_store(),
+    trust_forwarded=settings.rate_limit_trust_forwarded,
+)
+
+
+# Recuento de consultas SQL por petición: avisa de los N+1 y de las consultas duplicadas
+from infrastructure.observability.middleware import QueryStatsMiddleware
+
+app.add_middleware(QueryStatsMiddleware, server_timing=settings.db_server_timing)
+
+# Perfilado con pyinstrument: bajo demanda (admin con X-Profile) y por muestreo a disco
+from infrastructure.observability.middleware import ProfilingMiddleware
+
+app.add_middleware(ProfilingMiddleware, sample_rate=settings.profile_sample_rate, sample_format=settings.profile_format)
 
 
 # CORS settings
@@ -0,0 +1,95 @@
+"""
+Perfil de arranque de la API: cuánto tarda cada módulo en importarse y cuánto cuesta
+inicializar los adaptadores (cliente S3, conexión a la BD).
+
+Uso (desde la carpeta app/):
+    python profile_startup.py                # imports + cliente S3
+    python profile_startup.py --top 40       # más filas en el ranking
+    python profile_startup.py --with-db      # incluye conectar a Postgres y create_all
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Paquetes propios de la app (se muestran aparte del resto de dependencias)
+APP_PACKAGES = {"main", "config", "domain", "application", "infrastructure", "interfaces"}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(target: str):
+    """Importa `target` en un proceso limpio con -X importtime y devuelve [(módulo, self_us, cumulative_us, nivel)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-2000:])
+        sys.exit(result.returncode)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def print_import_report(rows, top: int):
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+    print(f"\n📦 Importar main: {total_us / 1000:.1f} ms ({len(rows)} módulos)\n")
+
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        by_package[module.split(".")[0]] += self_us
+    print(f"{'paquete':<30}{'ms':>10}{'%':>8}")
+    for package, self_us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]:
+        marker = " *" if package in APP_PACKAGES else ""
+        print(f"{package + marker:<30}{self_us / 1000:>10.1f}{100 * self_us / total_us:>8.1f}")
+
+    print(f"\n{'módulo de la app (acumulado)':<60}{'ms':>10}")
+    app_rows = [row for row in rows if row[0].split(".")[0] in APP_PACKAGES]
+    for module, _, cumulative_us, _ in sorted(app_rows, key=lambda row: row[2], reverse=True)[:top]:
+        print(f"{module:<60}{cumulative_us / 1000:>10.1f}")
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    fn()
+    print(f"{label:<60}{(time.perf_counter() - start) * 1000:>10.1f}")
+
+
+def profile_initialization(with_db: bool):
+    print(f"\n{'inicialización':<60}{'ms':>10}")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    timed("import main", lambda: __import__("main"))
+
+    from infrastructure.s3.s3_client import get_s3_client
+    timed("cliente S3 (primer uso)", get_s3_client)
+
+    if with_db:
+        from infrastructure.db.db_config import Base, engine
+
+        def connect():
+            with engine.connect():
+                pass
+
+        timed("primera conexión a Postgres", connect)
+        timed("Base.metadata.create_all", lambda: Base.metadata.create_all(bind=engine))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Perfil de tiempos de import/arranque de la API")
+    parser.add_argument("--top", type=int, default=20, help="número de filas en cada ranking")
+    parser.add_argument("--with-db", action="store_true", help="medir también la conexión a la BD y create_all")
+    args = parser.parse_args()
+
+    print_import_report(profile_imports("main"), args.top)
+    profile_initialization(args.with_db)
@@ -0,0 +1,142 @@
+"""
+Arranque de producción: gunicorn como gestor de procesos + workers de uvicorn.
+
+- Número de workers calculado a partir de las CPUs disponibles y del presupuesto de conexiones a Postgres.
+- Reciclado de workers tras N peticiones o si su memoria (RSS) supera un umbral.
+- Parada ordenada: cada worker deja de aceptar conexiones y termina las peticiones en curso.
+- El scheduler (cron jobs) sólo corre en un proceso gracias al lock de infrastructure/scheduler/scheduler.py.
+- Las migraciones de Alembic pendientes se aplican una vez, en el master, antes de arrancar los workers.
+
+Uso (desde la carpeta app/):
+    python serve.py
+En desarrollo se sigue usando `uvicorn main:app --reload`.
+"""
+import math
+import os
+import signal
+import threading
+
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+
+from config import settings
+
+# Cada cuántos segundos revisa el watchdog la memoria del worker
+MEMORY_CHECK_SECONDS = 10
+
+
+class AppUvicornWorker(UvicornWorker):
+    """Worker de uvicorn con el mismo plazo de parada ordenada que gunicorn"""
+    CONFIG_KWARGS = {
+        "loop": "auto",
+        "http": "auto",
+        "timeout_graceful_shutdown": settings.web_graceful_timeout,
+    }
+
+
+def available_cpus() -> int:
+    """CPUs que puede usar el contenedor (afinidad y cuota de cgroups v2), no las de la máquina"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def compute_workers() -> int:
+    if settings.web_workers > 0:
+        return settings.web_workers
+    by_cpu = 2 * available_cpus() + 1
+    # Cada worker puede abrir hasta pool_size + max_overflow conexiones; el scheduler comparte las de su worker
+    per_worker = settings.db_pool_size + settings.db_max_overflow
+    by_db = max(1, settings.db_connection_budget // per_worker)
+    return max(1, min(by_cpu, by_db))
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def _memory_watchdog(worker, limit_mb: int):
+    while worker.alive:
+        threading.Event().wait(MEMORY_CHECK_SECONDS)
+        try:
+            rss = _rss_mb()
+        except OSError:
+            return  # sin /proc (no Linux): no se puede vigilar
+        if rss > limit_mb:
+            worker.log.warning("Worker %s usa %.0f MB (> %s MB): reciclando", worker.pid, rss, limit_mb)
+            # SIGTERM = parada ordenada de uvicorn; gunicorn arranca otro worker en su lugar
+            os.kill(worker.pid, signal.SIGTERM)
+            return
+
+
+def post_fork(server, worker):
+    # Con preload la app se importó en el master: que cada worker abra sus propias conexiones
+    from infrastructure.db.db_config import engine
+    engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    if settings.web_worker_max_memory_mb > 0:
+        threading.Thread(
+            target=_memory_watchdog,
+            args=(worker, settings.web_worker_max_memory_mb),
+            name="memory-watchdog",
+            daemon=True,
+        ).start()
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, app_uri: str, options: dict):
+        self.app_uri = app_uri
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from main import app
+        return app
+
+
+def run_migrations() -> None:
+    """alembic upgrade head (create_all no añade columnas a las tablas que ya existen)"""
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")), "head")
+
+
+def build_options() -> dict:
+    return {
+        "bind": os.getenv("BIND", "0.0.0.0:8000"),
+        "workers": compute_workers(),
+        "worker_class": "serve.AppUvicornWorker",
+        "max_requests": settings.web_max_requests,
+        "max_requests_jitter": settings.web_max_requests_jitter,
+        "graceful_timeout": settings.web_graceful_timeout,
+        "timeout": 60,
+        "keepalive": 5,
+        "preload_app": settings.web_preload,
+        "post_fork": post_fork,
+        "post_worker_init": post_worker_init,
+        "accesslog": "-",
+    }
+
+
+if __name__ == "__main__":
+    if settings.db_migrate_on_start:
+        print("🔌 Applying database migrations...")
+        run_migrations()
+    options = build_options()
+    print(f"🚀 Starting {options['workers']} workers on {options['bind']} (CPUs: {available_cpus()})")
+    ProductionServer("main:app", options).run()
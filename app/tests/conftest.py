@@ -0,0 +1,11 @@
+import os
+import sys
+
+# config.Settings exige las variables de MinIO; en las pruebas no se conecta a nada, basta con que existan
+os.environ.setdefault("MINIO_ENDPOINT", "http://localhost:9000")
+os.environ.setdefault("MINIO_BUCKET", "test")
+os.environ.setdefault("MINIO_ACCESS_KEY", "test")
+os.environ.setdefault("MINIO_SECRET_KEY", "test")
+
+# Los módulos se importan como en la app (desde app/), aunque pytest se lance desde la raíz del repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,40 @@
+"""Índice invertido del generador de hashtags: actualizaciones al guardar los hashtags de una imagen"""
+from infrastructure.hashtags.engine import HashtagEngine
+
+
+def _index_sources(engine, caption):
+    return {s.tag: s.source for s in engine.suggest(caption, limit=50)}
+
+
+def test_saving_the_same_hashtags_twice_counts_them_once():
+    engine = HashtagEngine()
+    engine.replace_document((None, None), ("atardecer en la playa", "#sunsetlovers"))
+    once = (dict(engine._index), engine._tag_popularity.copy())
+
+    engine.replace_document(("atardecer en la playa", "#sunsetlovers"), ("atardecer en la playa", "#sunsetlovers"))
+
+    assert (dict(engine._index), engine._tag_popularity) == once
+    assert engine._tag_popularity["#sunsetlovers"] == 1
+
+
+def test_replaced_hashtags_leave_the_index():
+    engine = HashtagEngine()
+    engine.index_documents([("atardecer en la playa", "#sunsetlovers")])
+    assert _index_sources(engine, "atardecer").get("#sunsetlovers") == "index"
+
+    engine.replace_document(("atardecer en la playa", "#sunsetlovers"), ("atardecer en la playa", "#goldenhour"))
+
+    sources = _index_sources(engine, "atardecer")
+    assert "#sunsetlovers" not in sources
+    assert sources.get("#goldenhour") == "index"
+    assert "#sunsetlovers" not in engine._tag_popularity
+
+
+def test_rebuild_replaces_the_whole_index():
+    engine = HashtagEngine()
+    engine.index_documents([("atardecer en la playa", "#sunsetlovers")])
+
+    assert engine.rebuild([("montaña nevada", "#snowpeaks")]) == 1
+
+    assert "#sunsetlovers" not in _index_sources(engine, "atardecer")
+    assert _index_sources(engine, "montaña nevada").get("#snowpeaks") == "index"
@@ -0,0 +1,62 @@
+"""
+query_budget sobre el camino de restaurar una imagen, con SQLite en memoria (sin Postgres).
+"""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from application.use_cases.image_use_cases.restore_image_use_case import RestoreImageUseCase
+from infrastructure.db.db_config import Base
+from infrastructure.db.models.image_model import ImageModel
+from infrastructure.db.models.user_model import UserModel
+from infrastructure.db.repositories.image_repository_impl import ImageRepositoryImpl
+from infrastructure.observability.query_stats import install_query_stats, query_budget
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    install_query_stats(engine)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _image(db, deleted: bool) -> uuid.UUID:
+    user = UserModel(id=uuid.uuid4(), username="ana", email="ana@example.com", password="x")
+    image = ImageModel(id=uuid.uuid4(), user_id=user.id, file_name="a.jpg", url="a.jpg", size_bytes=10, is_deleted=deleted)
+    db.add_all([user, image])
+    db.commit()
+    return image.id
+
+
+def test_restore_stays_within_budget(db):
+    image_id = _image(db, deleted=True)
+
+    # UPDATE condicional de la imagen + contadores del usuario, sin leer la fila antes
+    with query_budget(2) as stats:
+        RestoreImageUseCase(ImageRepositoryImpl(db)).execute(image_id)
+
+    assert stats.duplicates() == []
+
+
+def test_query_budget_reports_duplicate_read_on_restore(db):
+    image_id = _image(db, deleted=False)
+    repo = ImageRepositoryImpl(db)
+
+    # Lo que hacía restore antes de la UPDATE condicional: leer la fila para validarla y volver a
+    # leerla con los mismos parámetros. query_budget tiene que señalarlo aunque quepa en el máximo
+    with pytest.raises(AssertionError, match="duplicada 2 veces"):
+        with query_budget(10):
+            repo.get_by_id(image_id)
+            with pytest.raises(HTTPException) as error:
+                RestoreImageUseCase(repo).execute(image_id)  # ya activa: vuelve a leerla para dar el 400
+            assert error.value.status_code == 400
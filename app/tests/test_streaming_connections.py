@@ -0,0 +1,125 @@
+"""
+Las respuestas en streaming (/images/export.zip, /images/{id}/raw, /images/me?stream=) no deben retener conexiones del pool
+mientras se envía el cuerpo (SQLite en un fichero, con el QueuePool normal para poder contar las conexiones prestadas).
+"""
+import contextlib
+import io
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import create_engine
+
+import main
+import interfaces.image_router as image_router
+from application.use_cases.image_use_cases.stream_image_use_case import StreamedObject
+from config import settings
+from infrastructure.db.db_config import Base, SessionLocal
+from infrastructure.db.models.image_model import ImageModel
+from infrastructure.db.models.user_model import UserModel
+
+
+class _RecordingStorage:
+    """Almacenamiento falso que anota las conexiones prestadas cada vez que se lee un objeto"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.checked_out = []
+
+    def open(self, key):
+        self.checked_out.append(self.engine.pool.checkedout())
+        return contextlib.closing(io.BytesIO(key.encode()))
+
+    def local_path(self, key):
+        return None
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    previous = SessionLocal.kw["bind"]
+    SessionLocal.configure(bind=engine)
+    try:
+        yield engine
+    finally:
+        SessionLocal.configure(bind=previous)
+        engine.dispose()
+
+
+def _user_with_images(count: int):
+    """Crea un usuario con `count` imágenes; devuelve la cabecera Authorization y los ids de las imágenes"""
+    user_id = uuid.uuid4()
+    image_ids = [uuid.uuid4() for _ in range(count)]
+    with SessionLocal() as db:
+        db.add(UserModel(id=user_id, username="ana", email="ana@example.com", password="x"))
+        db.add_all([
+            ImageModel(id=image_id, user_id=user_id, file_name=f"{i}.png", url=f"k{i}", size_bytes=2, format="PNG")
+            for i, image_id in enumerate(image_ids)
+        ])
+        db.commit()
+    token = jwt.encode(
+        {"sub": str(user_id), "exp": datetime.utcnow() + timedelta(minutes=5)},
+        settings.secret_key,
+        algorithm=settings.algorithm,
+    )
+    return {"Authorization": f"Bearer {token}"}, image_ids
+
+
+def test_export_zip_holds_no_connection_while_streaming(engine, monkeypatch):
+    headers, _ = _user_with_images(3)
+    storage = _RecordingStorage(engine)
+    monkeypatch.setattr(image_router, "get_object_storage", lambda: storage)
+
+    response = TestClient(main.app).get("/images/export.zip", headers=headers)
+
+    assert response.status_code == 200
+    assert sorted(zipfile.ZipFile(io.BytesIO(response.content)).namelist()) == ["0.png", "1.png", "2.png"]
+    assert storage.checked_out == [0, 0, 0]
+    assert engine.pool.checkedout() == 0
+
+
+def test_raw_proxy_holds_no_connection_while_streaming(engine, monkeypatch):
+    headers, (image_id,) = _user_with_images(1)
+    checked_out = []
+
+    class _StreamImage:
+        def execute(self, file_name, *conditions):
+            def body():
+                checked_out.append(engine.pool.checkedout())
+                yield file_name.encode()
+
+            return StreamedObject(status_code=200, headers={"Content-Type": "image/png"}, body=body())
+
+    monkeypatch.setattr(image_router, "get_object_storage", lambda: _RecordingStorage(engine))
+    monkeypatch.setattr(image_router, "StreamImageUseCase", _StreamImage)
+
+    response = TestClient(main.app).get(f"/images/{image_id}/raw", headers=headers)
+
+    assert response.status_code == 200
+    assert response.content == b"k0"
+    assert checked_out == [0]
+
+
+def test_streamed_listing_holds_only_its_own_connection(engine, monkeypatch):
+    headers, _ = _user_with_images(2)
+    checked_out = []
+
+    class _ListUserImages:
+        def __init__(self, image_repository):
+            self.image_repository = image_repository
+
+        def execute_stream(self, user_id):
+            checked_out.append(engine.pool.checkedout())  # antes de que la sesión del stream consulte nada
+            yield from self.image_repository.iter_rows_by_user_id(user_id)
+
+    monkeypatch.setattr(image_router, "ListUserImagesUseCase", _ListUserImages)
+
+    response = TestClient(main.app).get("/images/me?stream=ndjson", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 2
+    assert checked_out == [0]
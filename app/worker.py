@@ -0,0 +1,30 @@
+"""
+Worker de la cola de trabajos en segundo plano (tabla jobs en Postgres).
+
+Se ejecuta como proceso aparte de la API; se pueden levantar tantos como se quiera, en una o varias
+máquinas: reservan trabajos con FOR UPDATE SKIP LOCKED y respetan el límite de concurrencia de cada tipo.
+
+Uso (desde la carpeta app/):
+    python worker.py                      # todos los tipos de trabajo
+    python worker.py generate_placeholder # sólo los tipos indicados
+"""
+import sys
+
+from infrastructure.db.models.user_model import UserModel  # registra los modelos en SQLAlchemy
+from infrastructure.db.models.image_model import ImageModel
+from infrastructure.db.models.job_model import JobModel
+from infrastructure.db.models.image_import_model import ImageImportModel
+from infrastructure.jobs.handlers import HANDLERS
+from infrastructure.jobs.worker import JobWorker
+
+
+def main(argv):
+    job_types = argv or list(HANDLERS)
+    unknown = [name for name in job_types if name not in HANDLERS]
+    if unknown:
+        sys.exit(f"Tipos de trabajo desconocidos: {', '.join(unknown)} (disponibles: {', '.join(HANDLERS)})")
+    JobWorker({name: HANDLERS[name] for name in job_types}).run()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -10,6 +10,7 @@ export interface ImageResponse {
   user_id: string;
   created_at: string;
   is_deleted: boolean;
+  placeholder?: string | null; // vista previa diminuta (data URI) para mostrar mientras carga la imagen
 }
 
 export const uploadImage = async (file: File, token: string): Promise<ImageResponse> => {
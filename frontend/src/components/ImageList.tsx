@@ -21,6 +21,11 @@ export const ImageList: React.FC = () => {
             <img src={img.signedUrl} 
             alt={`Imagen ${img.file_name}`}
             className="rounded shadow" />
+          ) : img.placeholder ? (
+            // Vista previa difuminada que ya viene en /images/me (sin peticiones extra)
+            <img src={img.placeholder}
+            alt={`Imagen ${img.file_name}`}
+            className="rounded shadow h-32 w-full object-cover blur-sm" />
           ) : (
             <div className="bg-gray-100 h-32 w-full animate-pulse rounded"></div>
           )}
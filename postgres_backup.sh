@@ -1,5 +1,8 @@
 #!/bin/bash
 
+# ⚠️ Sólo copia la base de datos (en SQL plano y en un único proceso) y no las imágenes de MinIO.
+# Para copias completas usar app/backup.py:  docker compose exec web python backup.py backup
+
 # Configuración
 CONTAINER_NAME="fastapi-content-generator-db-1"
 DB_NAME="hashtagdb"